@@ -1,4 +1,29 @@
 from django.contrib import admin
-from .models import Profile
+from .models import ApiToken, Profile
 
 admin.site.register(Profile)
+
+
+@admin.register(ApiToken)
+class ApiTokenAdmin(admin.ModelAdmin):
+    """Tokens are created with ``create_api_token``; the admin lists and revokes them."""
+
+    list_display = ('name', 'user', 'key_prefix', 'scopes', 'expires_at', 'last_used_at', 'revoked')
+    list_filter = ('revoked', 'scopes')
+    search_fields = ('name', 'key_prefix', 'user__username')
+    list_select_related = ('user',)
+    readonly_fields = ('user', 'key_prefix', 'scopes', 'created_at', 'last_used_at')
+    fields = ('name', 'user', 'key_prefix', 'scopes', 'created_at', 'expires_at', 'last_used_at', 'revoked')
+    actions = ['revoke']
+
+    def has_add_permission(self, request):
+        return False
+
+    @admin.action(description='Revocar los tokens seleccionados')
+    def revoke(self, request, queryset):
+        updated = 0
+        for token in queryset.filter(revoked=False):
+            token.revoked = True
+            token.save(update_fields=['revoked'])
+            updated += 1
+        self.message_user(request, f'{updated} token(s) revocados.')
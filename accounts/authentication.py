@@ -0,0 +1,194 @@
+"""
+Token authentication for the API.
+
+Integration clients send ``Authorization: Token <key>`` (``Bearer`` is also
+accepted). Keys are random 256-bit values, so a single SHA-256 is enough to
+store them safely: validating a token costs one indexed lookup instead of
+the PBKDF2 check that Basic authentication runs on every request.
+Validated tokens are kept in a small in-process LRU for
+``API_TOKEN_CACHE_SECONDS``; after that (or when one of the user's tokens,
+the user or their role changes in this process) they are read again from
+the database.
+"""
+import hashlib
+import secrets
+import threading
+import time
+from collections import OrderedDict, defaultdict, namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+from drf_spectacular.extensions import OpenApiAuthenticationExtension
+from rest_framework import exceptions
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.permissions import SAFE_METHODS
+
+from .models import ApiToken
+from .roles import effective_role
+
+KEY_PREFIX = 'pt_'
+KEYWORDS = (b'token', b'bearer')
+
+# Value of request.auth for token-authenticated requests.
+TokenInfo = namedtuple('TokenInfo', ['id', 'name', 'scopes', 'expires_at'])
+
+
+def hash_key(key):
+    return hashlib.sha256(key.encode()).hexdigest()
+
+
+def create_token(user, name, scopes=('read',), days=None):
+    """
+    Create a token for ``user`` and return ``(token, key)``.
+
+    The key is not stored anywhere; it must be handed to the client now.
+
+    Raises:
+        ValueError: If a scope is unknown or not allowed for the user's role.
+    """
+    scopes = set(scopes)
+    allowed = allowed_scopes(user)
+    invalid = scopes - allowed
+    if invalid or not scopes:
+        raise ValueError(
+            f"Permisos no permitidos para el rol del usuario: {', '.join(sorted(invalid)) or '(ninguno)'}. "
+            f"Permitidos: {', '.join(sorted(allowed)) or '(ninguno)'}."
+        )
+    days = settings.API_TOKEN_TTL_DAYS if days is None else days
+    key = KEY_PREFIX + secrets.token_urlsafe(32)
+    token = ApiToken.objects.create(
+        user=user,
+        name=name,
+        key_prefix=key[len(KEY_PREFIX):len(KEY_PREFIX) + ApiToken.KEY_PREFIX_LENGTH],
+        key_hash=hash_key(key),
+        scopes=','.join(sorted(scopes)),
+        expires_at=timezone.now() + timedelta(days=days) if days else None,
+    )
+    return token, key
+
+
+def allowed_scopes(user):
+    """Scopes a token may carry given the user's current role."""
+    return ApiToken.ROLE_SCOPES.get(effective_role(user), set())
+
+
+class _LRUCache:
+    """Thread-safe LRU with a per-entry time to live, indexed by user id."""
+
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._keys_by_user = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, user_id, value = entry
+            if time.monotonic() - stored_at > settings.API_TOKEN_CACHE_SECONDS:
+                self._pop(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, user_id):
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = (time.monotonic(), user_id, value)
+            self._keys_by_user[user_id].add(key)
+            while len(self._entries) > settings.API_TOKEN_CACHE_SIZE:
+                self._pop(next(iter(self._entries)))
+
+    def discard(self, key):
+        with self._lock:
+            self._pop(key)
+
+    def discard_user(self, user_id):
+        """Drop every entry of ``user_id``."""
+        with self._lock:
+            for key in self._keys_by_user.pop(user_id, ()):
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _pop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            keys = self._keys_by_user[entry[1]]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry[1]]
+
+
+token_cache = _LRUCache()
+
+
+class TokenAuthentication(BaseAuthentication):
+    """
+    Authenticate ``Authorization: Token <key>`` against ApiToken.
+
+    Safe methods need the ``read`` scope and the rest need ``write``; a
+    token without the required scope gets 403.
+    """
+    keyword = 'Token'
+
+    def authenticate(self, request):
+        auth = get_authorization_header(request).split()
+        if not auth or auth[0].lower() not in KEYWORDS:
+            return None
+        if len(auth) != 2:
+            raise exceptions.AuthenticationFailed('Cabecera de token inválida.')
+        try:
+            key = auth[1].decode()
+        except UnicodeError:
+            raise exceptions.AuthenticationFailed('Cabecera de token inválida.')
+
+        digest = hash_key(key)
+        cached = token_cache.get(digest)
+        if cached is None:
+            cached = self._load(digest)
+            token_cache.set(digest, cached, cached[0].pk)
+        user, info = cached
+        if info.expires_at is not None and info.expires_at <= timezone.now():
+            token_cache.discard(digest)
+            raise exceptions.AuthenticationFailed('El token expiró.')
+
+        required = 'read' if request.method in SAFE_METHODS else 'write'
+        if required not in info.scopes:
+            raise exceptions.PermissionDenied(f'El token no tiene el permiso «{required}».')
+        return user, info
+
+    def _load(self, digest):
+        token = (
+            ApiToken.objects.select_related('user__profile')
+            .filter(key_hash=digest, revoked=False)
+            .first()
+        )
+        if token is None or not token.user.is_active:
+            raise exceptions.AuthenticationFailed('Token inválido.')
+        now = timezone.now()
+        if token.last_used_at is None or now - token.last_used_at > timedelta(seconds=settings.API_TOKEN_TOUCH_SECONDS):
+            ApiToken.objects.filter(pk=token.pk).update(last_used_at=now)
+        scopes = frozenset(token.scope_set & allowed_scopes(token.user))
+        return token.user, TokenInfo(token.pk, token.name, scopes, token.expires_at)
+
+    def authenticate_header(self, request):
+        return self.keyword
+
+
+class TokenAuthenticationScheme(OpenApiAuthenticationExtension):
+    target_class = 'accounts.authentication.TokenAuthentication'
+    name = 'tokenAuth'
+
+    def get_security_definition(self, auto_schema):
+        return {
+            'type': 'apiKey',
+            'in': 'header',
+            'name': 'Authorization',
+            'description': 'Token de API con el formato `Token <clave>`.',
+        }
@@ -0,0 +1,8 @@
+from django.utils.functional import SimpleLazyObject
+
+from .roles import effective_role
+
+
+def role(request):
+    """Expose ``user_role``, resolved only when a template reads it."""
+    return {'user_role': SimpleLazyObject(lambda: effective_role(getattr(request, 'user', None)))}
@@ -0,0 +1,30 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from accounts.authentication import create_token
+from accounts.models import ApiToken
+
+
+class Command(BaseCommand):
+    help = 'Crea un token de API para un usuario y muestra la clave (solo esta vez)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('username', help='Usuario dueño del token.')
+        parser.add_argument('--name', required=True, help='Nombre de la integración que usará el token.')
+        parser.add_argument('--scope', action='append', dest='scopes',
+                            choices=[value for value, _ in ApiToken.SCOPE_CHOICES],
+                            help='Permiso del token; se puede repetir (por defecto read).')
+        parser.add_argument('--days', type=int, default=None,
+                            help='Días de vigencia (por defecto API_TOKEN_TTL_DAYS; 0 = sin vencimiento).')
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.select_related('profile').get(username=options['username'])
+        except User.DoesNotExist:
+            raise CommandError(f"No existe el usuario {options['username']}.")
+        try:
+            token, key = create_token(user, options['name'], options['scopes'] or ['read'], options['days'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        expires = token.expires_at.strftime('%Y-%m-%d') if token.expires_at else 'sin vencimiento'
+        self.stdout.write(self.style.SUCCESS(f'Token "{token.name}" creado ({token.scopes}, vence: {expires}).'))
+        self.stdout.write(key)
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:39
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApiToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, verbose_name='Nombre')),
+                ('key_prefix', models.CharField(max_length=8, verbose_name='Prefijo')),
+                ('key_hash', models.CharField(editable=False, max_length=64, unique=True)),
+                ('scopes', models.CharField(default='read', max_length=50, verbose_name='Permisos')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')),
+                ('expires_at', models.DateTimeField(blank=True, null=True, verbose_name='Vence')),
+                ('last_used_at', models.DateTimeField(blank=True, null=True, verbose_name='Último Uso')),
+                ('revoked', models.BooleanField(default=False, verbose_name='Revocado')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='api_tokens', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Token de API',
+                'verbose_name_plural': 'Tokens de API',
+            },
+        ),
+    ]
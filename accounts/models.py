@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth.models import User
 
+from personal_tech.signals import rows_written
+
 class Profile(models.Model):
     ROLE_CHOICES = [
         ('admin', 'Administrador'),
@@ -14,3 +16,59 @@ class Profile(models.Model):
 
     def __str__(self):
         return f'{self.user.username} - {self.get_role_display()}'
+
+
+class ApiTokenQuerySet(models.QuerySet):
+    """Sends ``rows_written`` after ``update()`` so bulk revocations reach the token cache."""
+
+    def update(self, **kwargs):
+        pks = list(self.values_list('pk', flat=True)) if rows_written.has_listeners(self.model) else []
+        rows = super().update(**kwargs)
+        if rows and pks:
+            rows_written.send(sender=self.model, pks=pks, state={})
+        return rows
+
+    update.alters_data = True
+
+
+class ApiToken(models.Model):
+    """
+    API token for integration clients.
+
+    Only the SHA-256 of the key is stored; the key is shown once when the
+    token is created. Scopes are limited by the owner's role (ROLE_SCOPES)
+    and re-checked on every authentication.
+    """
+    SCOPE_CHOICES = [
+        ('read', 'Lectura'),
+        ('write', 'Escritura'),
+    ]
+    ROLE_SCOPES = {
+        'admin': {'read', 'write'},
+        'technician': {'read', 'write'},
+        'client': {'read'},
+    }
+    KEY_PREFIX_LENGTH = 8
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='api_tokens')
+    name = models.CharField(max_length=100, verbose_name="Nombre")
+    key_prefix = models.CharField(max_length=KEY_PREFIX_LENGTH, verbose_name="Prefijo")
+    key_hash = models.CharField(max_length=64, unique=True, editable=False)
+    scopes = models.CharField(max_length=50, default='read', verbose_name="Permisos")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
+    expires_at = models.DateTimeField(null=True, blank=True, verbose_name="Vence")
+    last_used_at = models.DateTimeField(null=True, blank=True, verbose_name="Último Uso")
+    revoked = models.BooleanField(default=False, verbose_name="Revocado")
+
+    objects = ApiTokenQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Token de API"
+        verbose_name_plural = "Tokens de API"
+
+    def __str__(self):
+        return f'{self.name} ({self.key_prefix}…) - {self.user.username}'
+
+    @property
+    def scope_set(self):
+        return set(filter(None, self.scopes.split(',')))
@@ -0,0 +1,99 @@
+"""
+Role resolution for permission checks and role-aware views.
+
+``get_role`` returns ``Profile.role`` without querying the profile table
+when it can: from a profile already loaded with the user
+(``select_related('profile')``), from a memo on the user object for the rest
+of the request, or from the Django cache. The cache entry is deleted when a
+profile's role changes or the profile is deleted (see ``signals``), and
+expires after ``ROLE_CACHE_SECONDS`` as a safety net.
+"""
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework import permissions
+
+from .models import Profile
+
+_UNSET = object()
+_MEMO = '_accounts_role'
+
+
+def _cache_key(user_id):
+    return f'accounts-role:{user_id}'
+
+
+def get_role(user):
+    """
+    ``Profile.role`` of ``user``.
+
+    Returns:
+        str: ``admin``, ``technician`` or ``client``; None for anonymous
+        users and users without a profile.
+    """
+    if user is None or not user.is_authenticated:
+        return None
+    role = getattr(user, _MEMO, _UNSET)
+    if role is not _UNSET:
+        return role
+    related = User.profile.related
+    if related.is_cached(user):
+        profile = related.get_cached_value(user)
+        role = profile.role if profile is not None else None
+    else:
+        key = _cache_key(user.pk)
+        role = cache.get(key)
+        if role is None:
+            # '' marks "no profile" so it is cached too.
+            role = Profile.objects.filter(user_id=user.pk).values_list('role', flat=True).first() or ''
+            cache.set(key, role, settings.ROLE_CACHE_SECONDS)
+        role = role or None
+    setattr(user, _MEMO, role)
+    return role
+
+
+def effective_role(user):
+    """Like ``get_role`` but superusers count as ``admin`` (dashboards, API scopes, cache keys)."""
+    if user is not None and user.is_authenticated and user.is_superuser:
+        return 'admin'
+    return get_role(user)
+
+
+def has_role(user, *roles):
+    return get_role(user) in roles
+
+
+def set_role(user, role):
+    """Set ``user``'s role, creating the profile if needed."""
+    # Update the instance cached on the user: save_user_profile saves it
+    # again whenever the user is saved (e.g. last_login).
+    try:
+        profile = user.profile
+    except Profile.DoesNotExist:
+        profile = Profile(user=user)
+    profile.role = role
+    profile.save()
+    setattr(user, _MEMO, role)
+    return profile
+
+
+def invalidate(user_id):
+    cache.delete(_cache_key(user_id))
+
+
+class RolePermission(permissions.BasePermission):
+    """Allow authenticated users whose role is in ``allowed_roles``."""
+    allowed_roles = ()
+
+    def has_permission(self, request, view):
+        return has_role(request.user, *self.allowed_roles)
+
+
+class IsAdmin(RolePermission):
+    """Only allow users with Profile.role == 'admin'."""
+    allowed_roles = ('admin',)
+
+
+class IsTechnician(RolePermission):
+    """Only allow users with Profile.role == 'technician'."""
+    allowed_roles = ('technician',)
@@ -2,6 +2,7 @@ from rest_framework import serializers
 from django.contrib.auth.models import User
 from drf_spectacular.utils import extend_schema_field
 from .models import Profile
+from .roles import get_role
 
 
 class ProfileSerializer(serializers.ModelSerializer):
@@ -19,10 +20,7 @@ class UserSerializer(serializers.ModelSerializer):
 
     @extend_schema_field(serializers.CharField)
     def get_role(self, obj):
-        try:
-            return obj.profile.role
-        except Profile.DoesNotExist:
-            return None
+        return get_role(obj)
 
 
 class UserRoleUpdateSerializer(serializers.Serializer):
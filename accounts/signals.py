@@ -1,7 +1,10 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_init, post_save
 from django.dispatch import receiver
 from django.contrib.auth.models import User
-from .models import Profile
+from personal_tech.signals import rows_written
+from .authentication import token_cache
+from .models import ApiToken, Profile
+from . import roles
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -10,4 +13,46 @@ def create_user_profile(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=User)
 def save_user_profile(sender, instance, **kwargs):
-    instance.profile.save()
\ No newline at end of file
+    instance.profile.save()
+
+# Revocations and role changes take effect at once in this process and
+# within API_TOKEN_CACHE_SECONDS in the others. Only the affected user's
+# tokens are dropped.
+
+@receiver(post_save, sender=ApiToken)
+@receiver(post_delete, sender=ApiToken)
+def forget_user_tokens(sender, instance, **kwargs):
+    token_cache.discard_user(instance.user_id)
+
+@receiver(rows_written, sender=ApiToken)
+def forget_tokens_written_in_bulk(sender, pks, **kwargs):
+    # QuerySet.update() (e.g. revoking in bulk) does not send post_save.
+    for user_id in set(ApiToken.objects.filter(pk__in=pks).values_list('user_id', flat=True)):
+        token_cache.discard_user(user_id)
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_tokens_of_user(sender, instance, update_fields=None, **kwargs):
+    # Logins only save last_login; is_active or is_superuser changes do matter.
+    if update_fields is None or set(update_fields) != {'last_login'}:
+        token_cache.discard_user(instance.pk)
+
+@receiver(post_init, sender=Profile)
+def remember_role(sender, instance, **kwargs):
+    if 'role' not in instance.get_deferred_fields():
+        instance._saved_role = instance.role
+
+@receiver(post_save, sender=Profile)
+def invalidate_changed_role(sender, instance, created, update_fields=None, **kwargs):
+    # save_user_profile saves the profile on every login; skip those saves.
+    if update_fields is not None and 'role' not in update_fields:
+        return
+    if created or getattr(instance, '_saved_role', None) != instance.role:
+        roles.invalidate(instance.user_id)
+        token_cache.discard_user(instance.user_id)
+    instance._saved_role = instance.role
+
+@receiver(post_delete, sender=Profile)
+def invalidate_deleted_role(sender, instance, **kwargs):
+    roles.invalidate(instance.user_id)
+    token_cache.discard_user(instance.user_id)
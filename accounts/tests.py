@@ -1,3 +1,106 @@
+from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .authentication import create_token, hash_key, token_cache
+from .models import ApiToken
+from .roles import _cache_key, get_role, set_role
+
+
+class TokenCacheTests(TestCase):
+    """Only the affected user's cached tokens are dropped."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='clave')
+        cls.technician = User.objects.create_user('tecnico', password='clave')
+        set_role(cls.admin, 'admin')
+        set_role(cls.technician, 'technician')
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        self.addCleanup(cache.clear)
+        self.admin_key = create_token(self.admin, 'admin', ['read', 'write'])[1]
+        self.technician_key = create_token(self.technician, 'tecnico', ['read', 'write'])[1]
+        for key in (self.admin_key, self.technician_key):
+            self.get_services(key)
+
+    def get_services(self, key):
+        return self.client.get(reverse('api-service-list'), HTTP_AUTHORIZATION=f'Token {key}')
+
+    def cached(self, key):
+        return token_cache.get(hash_key(key)) is not None
+
+    def test_login_keeps_tokens_and_role_cache(self):
+        get_role(User.objects.get(pk=self.technician.pk))
+        self.client.login(username='tecnico', password='clave')
+        self.assertTrue(self.cached(self.admin_key))
+        self.assertTrue(self.cached(self.technician_key))
+        self.assertEqual(cache.get(_cache_key(self.technician.pk)), 'technician')
+
+    def test_role_change_drops_only_that_user(self):
+        set_role(User.objects.get(pk=self.technician.pk), 'client')
+        self.assertTrue(self.cached(self.admin_key))
+        self.assertFalse(self.cached(self.technician_key))
+        self.assertIsNone(cache.get(_cache_key(self.technician.pk)))
+        # Clients only keep the read scope.
+        response = self.client.post(
+            reverse('api-service-list'), {}, HTTP_AUTHORIZATION=f'Token {self.technician_key}',
+        )
+        self.assertEqual(response.status_code, 403)
+
+    def test_saving_profile_without_role_change_keeps_tokens(self):
+        profile = User.objects.get(pk=self.technician.pk).profile
+        profile.phone = '3000000000'
+        profile.save()
+        self.assertTrue(self.cached(self.technician_key))
+
+    def test_revoking_a_token_drops_only_that_user(self):
+        self.technician.api_tokens.update(revoked=True)
+        token = self.technician.api_tokens.get()
+        token.save()
+        self.assertTrue(self.cached(self.admin_key))
+        self.assertFalse(self.cached(self.technician_key))
+        self.assertEqual(self.get_services(self.technician_key).status_code, 401)
+
+    def test_revoking_in_bulk_drops_only_those_users(self):
+        ApiToken.objects.filter(user=self.technician).update(revoked=True)
+        self.assertTrue(self.cached(self.admin_key))
+        self.assertFalse(self.cached(self.technician_key))
+        self.assertEqual(self.get_services(self.technician_key).status_code, 401)
+        self.assertEqual(self.get_services(self.admin_key).status_code, 200)
+
+    def test_deactivating_a_user_drops_their_tokens(self):
+        self.technician.is_active = False
+        self.technician.save()
+        self.assertTrue(self.cached(self.admin_key))
+        self.assertEqual(self.get_services(self.technician_key).status_code, 401)
+
+
+class UserListQueryTests(TestCase):
+    """The user list reads each user's role with the user itself."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_user('admin', password='clave')
+        set_role(cls.admin, 'admin')
+        for i, role in enumerate(['technician', 'client', 'technician', 'client', 'admin']):
+            set_role(User.objects.create_user(f'user{i}', email=f'user{i}@example.com'), role)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.addCleanup(cache.clear)
+        cache.clear()
+
+    def test_query_count_does_not_grow_with_users(self):
+        # Session, user, the admin's role and the page.
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('accounts:api-user-list'))
+        self.assertEqual(response.status_code, 200)
+        roles = {row['username']: row['role'] for row in response.json()['results']}
+        self.assertEqual(roles['user0'], 'technician')
+        self.assertEqual(roles['user1'], 'client')
+        self.assertEqual(roles['user4'], 'admin')
+        self.assertEqual(len(roles), 6)
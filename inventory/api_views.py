@@ -1,15 +1,19 @@
 from rest_framework import generics, permissions
 from .models import Equipment
+from .filters import EquipmentFilter
 from .serializers import EquipmentSerializer
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, OpenApiParameter
+from personal_tech.bulk import BulkAPIView, bulk_schema
+from personal_tech.fastread import FastListMixin
+from personal_tech.response_cache import CachedResponseMixin
+from personal_tech.exports import EXPORT_PARAMETERS, EXPORT_RESPONSES, StreamingExportAPIView
 
 @extend_schema(
     tags=['Inventario'],
     summary='Listar y crear equipos',
     description='Obtiene una lista de todos los equipos en el inventario o registra uno nuevo.',
-    responses={200: EquipmentSerializer(many=True), 201: EquipmentSerializer}
 )
-class EquipmentListCreateAPIView(generics.ListCreateAPIView):
+class EquipmentListCreateAPIView(CachedResponseMixin, FastListMixin, generics.ListCreateAPIView):
     """
     Vista de API para listar y crear equipos.
     
@@ -22,6 +26,9 @@ class EquipmentListCreateAPIView(generics.ListCreateAPIView):
     queryset = Equipment.objects.all()
     serializer_class = EquipmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering = '-pk'
+    filterset_class = EquipmentFilter
+    ordering_fields = ['id']
 
 @extend_schema(
     tags=['Inventario'],
@@ -29,7 +36,7 @@ class EquipmentListCreateAPIView(generics.ListCreateAPIView):
     description='Operaciones CRUD sobre un equipo específico del inventario.',
     responses={200: EquipmentSerializer, 204: None}
 )
-class EquipmentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class EquipmentRetrieveUpdateDestroyAPIView(CachedResponseMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vista de API para gestionar un equipo específico.
     
@@ -48,3 +55,46 @@ class EquipmentRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIVie
     queryset = Equipment.objects.all()
     serializer_class = EquipmentSerializer
     permission_classes = [permissions.IsAuthenticated]
+
+@extend_schema(
+    tags=['Inventario'],
+    summary='Exportar equipos (CSV/NDJSON)',
+    description='Descarga en streaming todos los equipos que cumplen los filtros; '
+                '``since``/``until`` se aplican a la fecha de compra.',
+    parameters=EXPORT_PARAMETERS + [
+        OpenApiParameter('status', str, enum=[value for value, _ in Equipment.STATUS_CHOICES]),
+        OpenApiParameter('location', str),
+    ],
+    responses=EXPORT_RESPONSES,
+)
+class EquipmentExportAPIView(StreamingExportAPIView):
+    """
+    Exporta el inventario de equipos en CSV o NDJSON.
+    
+    get:
+    Transmite una fila por equipo; admite ``columns``, ``status``, ``location``, ``since`` y ``until``.
+    """
+    queryset = Equipment.objects.all()
+    export_fields = {
+        'id': 'id',
+        'model': 'model',
+        'serial_number': 'serial_number',
+        'description': 'description',
+        'status': 'status',
+        'location': 'location',
+        'purchase_date': 'purchase_date',
+    }
+    filter_fields = {'status': 'status', 'location': 'location'}
+    date_field = 'purchase_date'
+    filename = 'equipos'
+
+@bulk_schema(EquipmentSerializer, 'Inventario', 'equipos')
+class EquipmentBulkAPIView(BulkAPIView):
+    """
+    Registra, actualiza o elimina equipos del inventario en bloque.
+    
+    Los números de serie se validan como únicos dentro del lote y contra
+    la base de datos con una sola consulta.
+    """
+    queryset = Equipment.objects.all()
+    serializer_class = EquipmentSerializer
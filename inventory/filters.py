@@ -0,0 +1,15 @@
+import django_filters
+from .models import Equipment
+
+
+class EquipmentFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de equipos de la API.
+
+    ``purchase_date_after``/``purchase_date_before`` filtran por fecha de compra.
+    """
+    purchase_date = django_filters.DateFromToRangeFilter(label='Fecha de compra')
+
+    class Meta:
+        model = Equipment
+        fields = ['status', 'location']
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('inventory', '0002_alter_equipment_options_alter_equipment_description_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['status', 'id'], name='equipment_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['location', 'id'], name='equipment_location_idx'),
+        ),
+    ]
@@ -1,4 +1,5 @@
 from django.db import models
+from personal_tech.response_cache import VersionedManager
 
 class Equipment(models.Model):
     """
@@ -20,9 +21,16 @@ class Equipment(models.Model):
     location = models.CharField(max_length=100, blank=True, verbose_name="Ubicación")
     purchase_date = models.DateField(null=True, blank=True, verbose_name="Fecha de Compra")
 
+    # Invalida la caché de respuestas de la API (personal_tech.response_cache).
+    objects = VersionedManager()
+
     class Meta:
         verbose_name = "Equipo"
         verbose_name_plural = "Equipos"
+        indexes = [
+            models.Index(fields=['status', 'id'], name='equipment_status_idx'),
+            models.Index(fields=['location', 'id'], name='equipment_location_idx'),
+        ]
 
     def __str__(self):
         """Devuelve una representación legible del equipo."""
@@ -3,5 +3,7 @@ from . import api_views
 
 urlpatterns = [
     path('api/equipment/', api_views.EquipmentListCreateAPIView.as_view(), name='api-equipment-list'),
+    path('api/equipment/export/', api_views.EquipmentExportAPIView.as_view(), name='api-equipment-export'),
+    path('api/equipment/bulk/', api_views.EquipmentBulkAPIView.as_view(), name='api-equipment-bulk'),
     path('api/equipment/<int:pk>/', api_views.EquipmentRetrieveUpdateDestroyAPIView.as_view(), name='api-equipment-detail'),
 ]
@@ -0,0 +1,359 @@
+"""
+Altas, cambios y bajas masivas para la API.
+
+``BulkAPIView`` recibe listas de objetos y las valida en una sola pasada:
+
+* un solo serializador para todos los elementos, sin los ``UniqueValidator``
+  (que harían una consulta por campo y por fila);
+* las claves foráneas de todo el lote se buscan con una consulta por campo;
+* los campos únicos se comprueban contra el propio lote y contra la base de
+  datos con una única consulta.
+
+Lo válido se escribe con ``bulk_create``/``bulk_update`` en una transacción.
+``?mode=atomic`` (por defecto) no escribe nada si algún elemento falla;
+``?mode=partial`` escribe los válidos y devuelve los errores de los demás.
+
+``bulk_create`` y ``bulk_update`` no emiten ``post_save``: al terminar se
+envía ``bulk_saved`` para que los receptores (caché de PDF) se pongan al
+día. Los contadores del dashboard siguen ``rows_written``, que el manager
+del modelo envía en cualquier escritura masiva.
+"""
+import copy
+import logging
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema, extend_schema_view
+from rest_framework import generics, permissions, serializers, status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.validators import UniqueValidator
+
+from .signals import bulk_saved
+
+logger = logging.getLogger(__name__)
+
+
+MODES = ('atomic', 'partial')
+
+BULK_PARAMETERS = [
+    OpenApiParameter('mode', OpenApiTypes.STR, enum=list(MODES),
+                     description='atomic: si un elemento falla no se guarda nada (por defecto). '
+                                 'partial: se guardan los válidos y se informan los errores.'),
+]
+
+BULK_RESPONSES = {
+    200: OpenApiTypes.OBJECT,
+    201: OpenApiTypes.OBJECT,
+    207: OpenApiTypes.OBJECT,
+    400: OpenApiTypes.OBJECT,
+}
+
+
+class _PrefetchedRelatedField(serializers.PrimaryKeyRelatedField):
+    """``PrimaryKeyRelatedField`` que resuelve contra objetos ya cargados."""
+
+    def __init__(self, objects=None, **kwargs):
+        self.objects = objects or {}
+        super().__init__(**kwargs)
+
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            pk = self.get_queryset().model._meta.pk.to_python(data)
+        except Exception:
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in self.objects:
+            self.fail('does_not_exist', pk_value=data)
+        return self.objects[pk]
+
+
+def bulk_schema(serializer_class, tag, name):
+    """
+    Documentación OpenAPI de una ``BulkAPIView``.
+
+    Args:
+        serializer_class: Serializador de los elementos.
+        tag (str): Etiqueta de la sección en la documentación.
+        name (str): Nombre en plural de los objetos (p. ej. ``'clientes'``).
+    """
+    return extend_schema_view(
+        post=extend_schema(
+            tags=[tag], summary=f'Crear {name} en bloque', parameters=BULK_PARAMETERS,
+            request=serializer_class(many=True), responses=BULK_RESPONSES,
+        ),
+        patch=extend_schema(
+            tags=[tag], summary=f'Actualizar {name} en bloque',
+            description='Cada elemento debe incluir su ``id``; solo se cambian los campos enviados.',
+            parameters=BULK_PARAMETERS, request=serializer_class(many=True), responses=BULK_RESPONSES,
+        ),
+        delete=extend_schema(
+            tags=[tag], summary=f'Eliminar {name} en bloque',
+            description='El cuerpo es la lista de IDs a eliminar.',
+            parameters=BULK_PARAMETERS, request={'application/json': {'type': 'array', 'items': {'type': 'integer'}}},
+            responses=BULK_RESPONSES,
+        ),
+    )
+
+
+class BulkAPIView(generics.GenericAPIView):
+    """
+    Vista base de las operaciones masivas.
+
+    ``POST`` crea la lista recibida, ``PATCH`` actualiza parcialmente cada
+    elemento (identificado por ``id``) y ``DELETE`` elimina la lista de IDs
+    del cuerpo. La respuesta incluye los objetos guardados (o los IDs
+    eliminados) y un error por cada elemento rechazado, con su posición en
+    la lista. Códigos: 201/200 si todo se guardó, 207 en modo parcial con
+    errores, 400 si no se guardó nada.
+
+    Los serializadores no deben tener campos muchos-a-muchos: ``bulk_create``
+    no los guarda.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+    filter_backends = []
+
+    def get_mode(self):
+        mode = self.request.query_params.get('mode', 'atomic')
+        if mode not in MODES:
+            raise ValidationError({'mode': [f"Modo no válido: {mode}. Use {' o '.join(MODES)}."]})
+        return mode
+
+    def get_items(self):
+        """Lista del cuerpo de la petición, validada en forma y tamaño."""
+        items = self.request.data
+        if not isinstance(items, list):
+            raise ValidationError({'non_field_errors': ['Se esperaba una lista.']})
+        if not items:
+            raise ValidationError({'non_field_errors': ['La lista está vacía.']})
+        if len(items) > settings.API_BULK_MAX_ITEMS:
+            raise ValidationError({'non_field_errors': [
+                f'Se admiten como máximo {settings.API_BULK_MAX_ITEMS} elementos por petición.'
+            ]})
+        return items
+
+    def post(self, request, *args, **kwargs):
+        mode = self.get_mode()
+        items = self.get_items()
+        errors = {}
+        child = self._item_serializer(items)
+        valid = {}
+        for index, item in enumerate(items):
+            data = self._validate(child, item, index, errors)
+            if data is not None:
+                valid[index] = data
+        self._check_unique(valid, {}, errors)
+        if errors and (mode == 'atomic' or not valid):
+            return self._response(errors=errors)
+
+        model = self.get_queryset().model
+        objs = [model(**valid[index]) for index in valid if index not in errors]
+        try:
+            with transaction.atomic():
+                model._default_manager.bulk_create(objs, batch_size=settings.API_BULK_BATCH_SIZE)
+                bulk_saved.send(sender=model, created=objs, updated=[])
+        except IntegrityError as exc:
+            return self._conflict(exc)
+        return self._response(saved=objs, errors=errors, success=status.HTTP_201_CREATED)
+
+    def patch(self, request, *args, **kwargs):
+        mode = self.get_mode()
+        items = self.get_items()
+        errors = {}
+        ids = {}
+        for index, item in enumerate(items):
+            pk = item.get('id') if isinstance(item, dict) else None
+            if pk is None:
+                errors[index] = {'id': ['Este campo es requerido.']}
+            else:
+                ids[index] = pk
+        model = self.get_queryset().model
+        instances = self.get_queryset().in_bulk(self._clean_pks(ids.values()))
+        child = self._item_serializer(items, partial=True)
+        valid = {}
+        targets = {}
+        for index, pk in ids.items():
+            instance = instances.get(model._meta.pk.to_python(pk)) if self._is_pk(pk) else None
+            if instance is None:
+                errors[index] = {'id': [f'No existe un objeto con id {pk}.']}
+                continue
+            child.instance = instance
+            data = self._validate(child, items[index], index, errors)
+            if data is not None:
+                valid[index] = data
+                targets[index] = instance
+        self._check_unique(valid, targets, errors)
+        if errors and (mode == 'atomic' or not valid):
+            return self._response(errors=errors)
+
+        changed = set()
+        pairs = []
+        now = timezone.now()
+        auto_now = [field.name for field in model._meta.concrete_fields if getattr(field, 'auto_now', False)]
+        for index, data in valid.items():
+            if index in errors:
+                continue
+            instance = targets[index]
+            before = copy.copy(instance)
+            for attr, value in data.items():
+                setattr(instance, attr, value)
+            # bulk_update no ejecuta pre_save: auto_now se asigna aquí.
+            for name in auto_now:
+                setattr(instance, name, now)
+            changed.update(data)
+            pairs.append((before, instance))
+        objs = [instance for _, instance in pairs]
+        try:
+            with transaction.atomic():
+                fields = sorted(changed.union(auto_now))
+                if fields:
+                    model._default_manager.bulk_update(objs, fields, batch_size=settings.API_BULK_BATCH_SIZE)
+                bulk_saved.send(sender=model, created=[], updated=pairs)
+        except IntegrityError as exc:
+            return self._conflict(exc)
+        return self._response(saved=objs, errors=errors, success=status.HTTP_200_OK)
+
+    def delete(self, request, *args, **kwargs):
+        mode = self.get_mode()
+        items = self.get_items()
+        errors = {}
+        wanted = {}
+        for index, pk in enumerate(items):
+            if not self._is_pk(pk):
+                errors[index] = {'id': [f'ID no válido: {pk}.']}
+            else:
+                wanted[index] = self.get_queryset().model._meta.pk.to_python(pk)
+        existing = set(
+            self.get_queryset().filter(pk__in=set(wanted.values())).values_list('pk', flat=True)
+        )
+        for index, pk in wanted.items():
+            if pk not in existing:
+                errors[index] = {'id': [f'No existe un objeto con id {pk}.']}
+        if errors and (mode == 'atomic' or not existing):
+            return self._response(errors=errors)
+        try:
+            with transaction.atomic():
+                # QuerySet.delete envía post_delete por objeto si hay receptores.
+                self.get_queryset().filter(pk__in=existing).delete()
+        except IntegrityError as exc:
+            return self._conflict(exc)
+        deleted = sorted(existing)
+        status_code = status.HTTP_207_MULTI_STATUS if errors else status.HTTP_200_OK
+        return Response({'deleted': deleted, 'errors': self._error_list(errors)}, status=status_code)
+
+    def _item_serializer(self, items, partial=False):
+        """
+        Serializador compartido por todos los elementos del lote.
+
+        Se quitan los ``UniqueValidator`` (la unicidad se comprueba en
+        ``_check_unique``) y las claves foráneas se resuelven contra los
+        objetos del lote, cargados con una consulta por campo.
+        """
+        child = self.get_serializer(partial=partial)
+        for name, field in list(child.fields.items()):
+            field.validators = [validator for validator in field.validators
+                                if not isinstance(validator, UniqueValidator)]
+            if type(field) is serializers.PrimaryKeyRelatedField and not field.read_only:
+                values = {item.get(name) for item in items if isinstance(item, dict)}
+                objects = field.get_queryset().in_bulk(self._clean_pks(values, field.get_queryset().model))
+                child.fields[name] = _PrefetchedRelatedField(objects=objects, **field._kwargs)
+        return child
+
+    def _validate(self, child, item, index, errors):
+        if not isinstance(item, dict):
+            errors[index] = {'non_field_errors': ['Se esperaba un objeto.']}
+            return None
+        data = {key: value for key, value in item.items() if key != 'id'}
+        try:
+            return child.run_validation(data)
+        except ValidationError as exc:
+            errors[index] = exc.detail
+            return None
+
+    def _unique_fields(self):
+        model = self.get_queryset().model
+        return [field.name for field in model._meta.concrete_fields if field.unique and not field.primary_key]
+
+    def _check_unique(self, valid, targets, errors):
+        """
+        Comprueba los campos únicos del lote con una sola consulta.
+
+        Args:
+            valid (dict): Posición → datos validados.
+            targets (dict): Posición → instancia que se actualiza (vacío al crear).
+            errors (dict): Posición → errores; se completa aquí.
+        """
+        fields = [name for name in self._unique_fields() if any(name in data for data in valid.values())]
+        if not fields:
+            return
+        # Valor final de cada campo único en el lote: el primero gana.
+        claimed = {name: {} for name in fields}
+        for index, data in valid.items():
+            for name in fields:
+                if name not in data or data[name] in (None, ''):
+                    continue
+                owner = claimed[name].setdefault(data[name], index)
+                if owner != index:
+                    errors.setdefault(index, {}).setdefault(name, []).append(
+                        f'Valor repetido en el lote (elemento {owner}).'
+                    )
+
+        query = Q()
+        for name in fields:
+            if claimed[name]:
+                query |= Q(**{f'{name}__in': list(claimed[name])})
+        if not query:
+            return
+        model = self.get_queryset().model
+        for row in model._default_manager.filter(query).values('pk', *fields):
+            for name in fields:
+                index = claimed[name].get(row[name])
+                if index is None or (index in targets and targets[index].pk == row['pk']):
+                    continue
+                # Aunque la fila dueña del valor lo cambie en el mismo lote, la
+                # restricción única se comprueba fila a fila en el UPDATE.
+                label = model._meta.get_field(name).verbose_name
+                errors.setdefault(index, {}).setdefault(name, []).append(
+                    f'Ya existe un registro con este {label}.'
+                )
+
+    @staticmethod
+    def _is_pk(value):
+        if isinstance(value, bool):
+            return False
+        return isinstance(value, int) or (isinstance(value, str) and value.isdigit())
+
+    def _clean_pks(self, values, model=None):
+        model = model or self.get_queryset().model
+        cleaned = set()
+        for value in values:
+            if value is None or isinstance(value, (bool, dict, list)):
+                continue
+            try:
+                cleaned.add(model._meta.pk.to_python(value))
+            except Exception:
+                continue
+        return cleaned
+
+    @staticmethod
+    def _error_list(errors):
+        return [{'index': index, 'errors': errors[index]} for index in sorted(errors)]
+
+    def _response(self, saved=None, errors=None, success=status.HTTP_200_OK):
+        if saved is None:
+            return Response({'results': [], 'errors': self._error_list(errors)}, status=status.HTTP_400_BAD_REQUEST)
+        data = {'results': self.get_serializer(saved, many=True).data, 'errors': self._error_list(errors)}
+        return Response(data, status=status.HTTP_207_MULTI_STATUS if errors else success)
+
+    def _conflict(self, exc):
+        # Otra petición escribió un valor único entre la validación y el guardado.
+        logger.warning('Conflicto en operación masiva sobre %s: %s', self.get_queryset().model._meta.label, exc)
+        return Response(
+            {'results': [], 'errors': [], 'detail': 'No se guardó ningún cambio por un conflicto con otra operación. Intente de nuevo.'},
+            status=status.HTTP_409_CONFLICT,
+        )
@@ -0,0 +1,165 @@
+"""
+GET condicional (``ETag`` / ``Last-Modified``) para la API y las descargas.
+
+Los validadores se calculan a partir de ``updated_at`` sin serializar la
+respuesta: en el detalle basta con leer esa columna de la fila (y la de las
+relaciones expandidas); en los listados se pide a la paginación la misma
+página pero solo con la clave primaria y ``updated_at``. Si el cliente envía
+``If-None-Match`` o ``If-Modified-Since`` y nada cambió se responde 304 sin
+tocar el serializador.
+
+Los listados solo llevan ``ETag``: una página también cambia cuando se borra
+una fila, y eso no aumenta ningún ``updated_at``, así que una fecha no
+sirve para validarla. El ``ETag`` sí lo detecta porque incluye las claves de
+la página.
+"""
+import hashlib
+
+from django.db.models import F
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from .fieldsets import _relation
+
+
+def make_etag(*parts):
+    """ETag fuerte (entre comillas) a partir de las partes que identifican una representación."""
+    digest = hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest[:40]}"'
+
+
+def validator_headers(response, etag, last_modified=None):
+    """
+    Añade los validadores a una respuesta.
+
+    ``Cache-Control: private, no-cache`` obliga a revalidar en cada uso; sin
+    él los navegadores podrían reutilizar la respuesta durante un tiempo
+    calculado a partir de ``Last-Modified``.
+
+    Args:
+        response: Respuesta a completar.
+        etag (str): Valor de ``ETag``.
+        last_modified (datetime): Fecha de la última modificación, o None.
+
+    Returns:
+        La misma respuesta.
+    """
+    response['ETag'] = etag
+    if last_modified is not None:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    patch_cache_control(response, private=True, no_cache=True)
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+def not_modified(request, etag, last_modified=None):
+    """
+    Evalúa las cabeceras condicionales de la petición.
+
+    Returns:
+        HttpResponse: 304 (o 412 con ``If-Match``) con los validadores, o
+        None si hay que generar la respuesta completa.
+    """
+    headers = validator_headers(HttpResponse(), etag, last_modified)
+    response = get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()) if last_modified is not None else None,
+        response=headers,
+    )
+    # Si las condiciones se cumplen, Django devuelve la respuesta recibida.
+    return None if response is headers else response
+
+
+class ConditionalGetMixin:
+    """
+    Mixin para vistas genéricas de DRF cuyo modelo tiene ``updated_at``.
+    El modelo debe usar ``VersionedManager``: un ``QuerySet.update()``
+    normal no cambia ``updated_at`` y se responderían 304 obsoletos.
+
+    Cubre ``retrieve`` y ``list``. La representación depende también de los
+    parámetros de la URL (``fields``, ``expand``, filtros, cursor) y del
+    formato negociado, así que forman parte del ``ETag``. Con ``?expand=`` se
+    tienen en cuenta los ``updated_at`` de las relaciones expandidas; si
+    alguna no tiene ese campo (p. ej. el técnico) la respuesta se genera
+    siempre, sin validadores. Tampoco se validan las páginas de la API
+    navegable, que incluyen datos de la sesión (token CSRF, usuario).
+    """
+    version_field = 'updated_at'
+
+    def get_version_paths(self):
+        """Rutas de los campos de versión que afectan a la respuesta, o None."""
+        if isinstance(self.request.accepted_renderer, BrowsableAPIRenderer):
+            return None
+        model = self.queryset.model
+        paths = [self.version_field]
+        if not hasattr(self, 'get_requested_shape'):
+            return paths
+        expandable = getattr(self.get_serializer_class(), 'expandable_fields', {})
+        for name in self.get_requested_shape()[1]:
+            source = expandable[name][1].replace('.', '__')
+            related = _relation(model, source).related_model
+            if not any(field.name == self.version_field for field in related._meta.concrete_fields):
+                return None
+            paths.append(f'{source}__{self.version_field}')
+        return paths
+
+    def _variant(self):
+        params = sorted(self.request.query_params.lists())
+        return [self.queryset.model._meta.label, self.request.accepted_renderer.media_type, params]
+
+    def retrieve(self, request, *args, **kwargs):
+        paths = self.get_version_paths()
+        if paths is None:
+            return super().retrieve(request, *args, **kwargs)
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        versions = (
+            self.filter_queryset(self.get_queryset())
+            .filter(**{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+            .values_list(*paths)
+            .first()
+        )
+        if versions is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag = make_etag(*self._variant(), self.kwargs[lookup_url_kwarg], *versions)
+        last_modified = max((value for value in versions if value is not None), default=None)
+        response = not_modified(request, etag, last_modified)
+        if response is None:
+            response = validator_headers(super().retrieve(request, *args, **kwargs), etag, last_modified)
+        return response
+
+    def list(self, request, *args, **kwargs):
+        paths = self.get_version_paths()
+        if paths is None:
+            return super().list(request, *args, **kwargs)
+        etag = make_etag(*self._variant(), *self._list_versions(paths))
+        response = not_modified(request, etag)
+        if response is None:
+            response = validator_headers(super().list(request, *args, **kwargs), etag)
+        return response
+
+    def _list_versions(self, paths):
+        """
+        Claves y versiones de las filas de la página pedida.
+
+        Se pagina el mismo queryset reducido a la clave primaria, los campos
+        del orden y las versiones, de modo que la página es exactamente la
+        que se serializaría después.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        versions = {f'_version_{index}': F(path) for index, path in enumerate(paths)}
+        probe = queryset.select_related(None).prefetch_related(None)
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            ordering = self.paginator.get_ordering(self.request, queryset, self)
+            probe = probe.only('pk', *(field.lstrip('-') for field in ordering))
+        else:
+            probe = probe.only('pk')
+        probe = probe.annotate(**versions)
+        page = self.paginate_queryset(probe)
+        rows = probe if page is None else page
+        parts = [(row.pk, *(getattr(row, name) for name in versions)) for row in rows]
+        if page is not None:
+            parts += [self.paginator.get_next_link(), self.paginator.get_previous_link()]
+        return parts
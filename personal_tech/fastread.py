@@ -0,0 +1,128 @@
+"""
+Lectura rápida de listados sin instanciar modelos ni recorrer el serializador.
+
+Con miles de filas, la mayor parte del tiempo de un listado se va en crear
+las instancias del modelo y en pasar cada una por ``to_representation``
+campo a campo. ``compile_rows`` prepara una vez por petición, a partir del
+serializador, la lista de columnas y un conversor por campo, y construye las
+filas directamente desde ``values()``. La salida es la misma que la del
+serializador: fechas con hora en la zona horaria actual y en ISO 8601,
+decimales como texto, claves foráneas como su ID.
+
+Los serializadores con campos que no son columnas del modelo (métodos,
+relaciones anidadas, ``source`` con puntos) no son compatibles y siguen el
+camino normal.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import ISO_8601, fields as drf_fields, relations
+from rest_framework.response import Response
+
+# Campos cuya representación coincide con el valor que devuelve la base de
+# datos (str, int, bool o la clave primaria de la relación).
+_IDENTITY = (
+    drf_fields.CharField.to_representation,
+    drf_fields.IntegerField.to_representation,
+    drf_fields.BooleanField.to_representation,
+    drf_fields.ChoiceField.to_representation,
+    drf_fields.ReadOnlyField.to_representation,
+)
+
+
+def _identity(value):
+    return value
+
+
+def _date_iso(value):
+    return value.isoformat()
+
+
+def _datetime_iso(tz):
+    def convert(value):
+        value = value.astimezone(tz).isoformat()
+        return value[:-6] + 'Z' if value.endswith('+00:00') else value
+    return convert
+
+
+def _converter(field):
+    """Función que convierte el valor de la base de datos como lo haría ``field``."""
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        return _identity if field.pk_field is None else field.pk_field.to_representation
+    method = type(field).to_representation
+    if method in _IDENTITY:
+        return _identity
+    if isinstance(field, drf_fields.DateTimeField) and method is drf_fields.DateTimeField.to_representation:
+        output_format = getattr(field, 'format', None) or drf_fields.api_settings.DATETIME_FORMAT
+        tz = getattr(field, 'timezone', None) or field.default_timezone()
+        if output_format.lower() == ISO_8601 and tz is not None:
+            return _datetime_iso(tz)
+    if isinstance(field, drf_fields.DateField) and method is drf_fields.DateField.to_representation:
+        output_format = getattr(field, 'format', None) or drf_fields.api_settings.DATE_FORMAT
+        if output_format.lower() == ISO_8601:
+            return _date_iso
+    return field.to_representation
+
+
+def compile_rows(serializer, model):
+    """
+    Prepara la lectura rápida para un serializador.
+
+    Args:
+        serializer: Instancia del serializador (ya recortada con ``?fields=``).
+        model: Modelo del queryset.
+
+    Returns:
+        tuple: (columnas para ``values()``, función que convierte una lista
+        de diccionarios de ``values()`` en la salida del serializador), o
+        None si algún campo no se puede leer de una columna.
+    """
+    plan = []
+    for field in serializer._readable_fields:
+        if isinstance(field, (drf_fields.SerializerMethodField, relations.ManyRelatedField)):
+            return None
+        if getattr(field, 'many', False) or hasattr(field, 'fields') or field.source == '*' or '.' in field.source:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not model_field.concrete or model_field.many_to_many:
+            return None
+        plan.append((field.field_name, model_field.name, _converter(field)))
+    columns = [column for _, column, _ in plan]
+
+    def build(rows):
+        return [
+            {
+                name: None if row[column] is None else convert(row[column])
+                for name, column, convert in plan
+            }
+            for row in rows
+        ]
+    return columns, build
+
+
+class FastListMixin:
+    """
+    Mixin para vistas de listado: responde los GET con ``compile_rows``.
+
+    El resto de métodos (y los listados cuyo serializador no es compatible,
+    p. ej. con ``?expand=``) usan el serializador como siempre. Las filas se
+    paginan como diccionarios; la paginación por cursor lee de ellos los
+    campos del orden, que se añaden a las columnas.
+    """
+
+    def list(self, request, *args, **kwargs):
+        model = self.get_queryset().model
+        compiled = compile_rows(self.get_serializer(), model)
+        if compiled is None:
+            return super().list(request, *args, **kwargs)
+        columns, build = compiled
+        queryset = self.filter_queryset(self.get_queryset())
+        extra = ['pk']
+        if self.paginator is not None and hasattr(self.paginator, 'get_ordering'):
+            extra += [field.lstrip('-') for field in self.paginator.get_ordering(request, queryset, self)]
+        rows = queryset.values(*dict.fromkeys([*columns, *extra]))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(build(page))
+        return Response(build(rows))
@@ -0,0 +1,186 @@
+"""
+Campos parciales (``?fields=``) y expansión de relaciones (``?expand=``).
+
+``DynamicFieldsSerializerMixin`` recorta los campos del serializador y
+reemplaza las relaciones pedidas en ``expand`` por un serializador anidado
+de solo lectura. ``DynamicFieldsViewMixin`` lee los parámetros, los valida y
+ajusta el queryset a lo pedido: ``only()`` con las columnas necesarias,
+``select_related`` para las relaciones a uno y ``prefetch_related`` para las
+relaciones a muchos. Así el tamaño de la respuesta y el número de consultas
+dependen de lo que el cliente pide.
+
+Ejemplo: ``/services/api/services/?fields=id,title,client&expand=client``.
+"""
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+
+
+class DynamicFieldsSerializerMixin:
+    """
+    Mixin para ``ModelSerializer`` con campos parciales y relaciones expandibles.
+
+    ``expandable_fields`` asocia el nombre de cada expansión con el
+    serializador anidado y el atributo de origen (con puntos para cruzar
+    relaciones), p. ej. ``{'client': (ClientSummarySerializer, 'service.client')}``.
+    Los campos y expansiones pedidos llegan en el contexto (``fields`` y
+    ``expand``); sin ellos el serializador se comporta como siempre.
+    """
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        expand = self.context.get('expand') or ()
+        for name in expand:
+            serializer_class, source = self.expandable_fields[name]
+            kwargs = {'source': source} if source != name else {}
+            self.fields[name] = serializer_class(read_only=True, **kwargs)
+        requested = self.context.get('fields')
+        if requested:
+            for name in set(self.fields) - set(requested) - set(expand):
+                self.fields.pop(name)
+
+
+def _split(value):
+    return [item.strip() for item in value.split(',') if item.strip()] if value else []
+
+
+class DynamicFieldsViewMixin:
+    """
+    Mixin para vistas genéricas de DRF cuyo serializador usa
+    ``DynamicFieldsSerializerMixin``.
+
+    Los parámetros solo se aplican a las lecturas; las escrituras siguen
+    usando el serializador completo.
+    """
+
+    def get_requested_shape(self):
+        """
+        Devuelve los campos y expansiones pedidos, validados.
+
+        Returns:
+            tuple: (lista de campos o None, lista de expansiones).
+
+        Raises:
+            ValidationError: Si se pide un campo o expansión inexistente.
+        """
+        if hasattr(self, '_requested_shape'):
+            return self._requested_shape
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            self._requested_shape = (None, [])
+            return self._requested_shape
+
+        serializer_class = self.get_serializer_class()
+        fields = _split(self.request.query_params.get('fields'))
+        expand = _split(self.request.query_params.get('expand'))
+        errors = {}
+        unknown = [name for name in expand if name not in serializer_class.expandable_fields]
+        if unknown:
+            errors['expand'] = [
+                f"Relaciones no válidas: {', '.join(unknown)}. "
+                f"Disponibles: {', '.join(serializer_class.expandable_fields)}."
+            ]
+        available = list(dict.fromkeys([*serializer_class().fields, *serializer_class.expandable_fields]))
+        unknown = [name for name in fields if name not in available]
+        if unknown:
+            errors['fields'] = [f"Campos no válidos: {', '.join(unknown)}. Disponibles: {', '.join(available)}."]
+        if errors:
+            raise ValidationError(errors)
+        self._requested_shape = (fields or None, expand)
+        return self._requested_shape
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['expand'] = self.get_requested_shape()
+        return context
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request is None or self.request.method not in SAFE_METHODS:
+            return queryset
+        fields, expand = self.get_requested_shape()
+        serializer = self.get_serializer_class()(context={'fields': fields, 'expand': expand})
+        extra = [field.lstrip('-') for field in self._ordering_candidates()]
+        return shape_queryset(queryset, serializer, extra)
+
+    def _ordering_candidates(self):
+        ordering = getattr(self, 'ordering', None) or ()
+        ordering = [ordering] if isinstance(ordering, str) else list(ordering)
+        return ordering + list(getattr(self, 'ordering_fields', None) or [])
+
+
+def shape_queryset(queryset, serializer, extra_fields=()):
+    """
+    Ajusta un queryset a los campos que va a leer un serializador.
+
+    Args:
+        queryset: Queryset base.
+        serializer: Serializador ya recortado (instancia).
+        extra_fields: Campos del modelo que se necesitan aunque no se
+            serialicen (p. ej. los del orden de la paginación).
+
+    Returns:
+        QuerySet: Con ``only``/``select_related``/``prefetch_related``. Si
+        algún campo no corresponde a una columna conocida (``source='*'``,
+        métodos) no se aplica ``only``.
+    """
+    model = queryset.model
+    only = {'pk', *extra_fields}
+    select = []
+    use_only = True
+    for field in serializer.fields.values():
+        if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+            use_only = False
+            continue
+        path = field.source.replace('.', '__')
+        nested = getattr(field, 'child', field)
+        if isinstance(nested, serializers.BaseSerializer):
+            relation = _relation(model, path)
+            if relation is None:
+                use_only = False
+                continue
+            related_fields = [
+                sub.source.replace('.', '__') for sub in nested.fields.values()
+                if sub.source != '*' and not isinstance(sub, serializers.SerializerMethodField)
+            ]
+            if relation.many_to_many or relation.one_to_many:
+                related = relation.related_model.objects.only(*related_fields)
+                queryset = queryset.prefetch_related(Prefetch(path, queryset=related))
+                continue
+            select.append(path)
+            parts = path.split('__')
+            only.update('__'.join(parts[:i]) for i in range(1, len(parts) + 1))
+            only.update(f'{path}__{name}' for name in related_fields)
+        else:
+            only.add(path)
+    if select:
+        queryset = queryset.select_related(*select)
+    if use_only:
+        queryset = queryset.only(*only)
+    return queryset
+
+
+def _relation(model, path):
+    """Devuelve el campo de relación al final de ``path`` o None si no existe."""
+    field = None
+    for name in path.split('__'):
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.is_relation:
+            return None
+        model = field.related_model
+    return field
+
+
+DYNAMIC_FIELDS_PARAMETERS = [
+    OpenApiParameter('fields', OpenApiTypes.STR,
+                     description='Campos a incluir, separados por comas (por defecto todos).'),
+    OpenApiParameter('expand', OpenApiTypes.STR,
+                     description='Relaciones a incluir como objetos anidados, separadas por comas.'),
+]
@@ -0,0 +1,32 @@
+"""
+Backends de filtrado comunes de la API.
+
+Los filtros por campo se declaran en el ``filters.py`` de cada app con
+django-filter (``filterset_class`` en la vista). El orden se restringe a los
+``ordering_fields`` de cada vista, que deben estar indexados.
+"""
+from rest_framework.filters import OrderingFilter
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    ``OrderingFilter`` seguro para la paginación por cursor.
+
+    Solo permite los campos declarados en ``ordering_fields`` (ninguno si la
+    vista no los declara) y agrega la clave primaria como desempate, en el
+    mismo sentido que el primer campo, para que el orden sea estable.
+    """
+
+    def get_valid_fields(self, queryset, view, context={}):
+        if getattr(view, 'ordering_fields', None) is None:
+            return []
+        return super().get_valid_fields(queryset, view, context)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        ordering = [ordering] if isinstance(ordering, str) else list(ordering)
+        if not any(field.lstrip('-') in ('pk', 'id') for field in ordering):
+            ordering.append('-pk' if ordering[0].startswith('-') else 'pk')
+        return tuple(ordering)
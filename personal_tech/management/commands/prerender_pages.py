@@ -0,0 +1,39 @@
+import os
+import tempfile
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+from personal_tech import pagecache
+
+
+def _write(path, data):
+    """Escribe ``data`` en ``path`` de forma atómica (los workers pueden estar leyendo)."""
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    with os.fdopen(fd, 'wb') as tmp:
+        tmp.write(data)
+    os.replace(tmp_path, path)
+
+
+class Command(BaseCommand):
+    help = 'Prerenderiza las páginas informativas (HTML, gzip y brotli) para la caché de página completa'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', help='Carpeta de salida (por defecto PAGE_PRERENDER_DIR).')
+
+    def handle(self, *args, **options):
+        output = Path(options['output']) if options['output'] else pagecache.prerender_dir()
+        output.mkdir(parents=True, exist_ok=True)
+        for name in pagecache.PAGES:
+            shell = pagecache.Shell(pagecache.render_shell(name))
+            path = output / f'{name}.html'
+            _write(path, shell.html)
+            _write(path.with_suffix('.html.gz'), shell.gz)
+            if shell.br is not None:
+                _write(path.with_suffix('.html.br'), shell.br)
+            sizes = f'{len(shell.html) / 1024:.1f} KiB → gzip {len(shell.gz) / 1024:.1f} KiB'
+            if shell.br is not None:
+                sizes += f', brotli {len(shell.br) / 1024:.1f} KiB'
+            self.stdout.write(f'{name}: {sizes}')
+        pagecache.clear()
+        self.stdout.write(self.style.SUCCESS(f'{len(pagecache.PAGES)} páginas prerenderizadas en {output}.'))
@@ -0,0 +1,214 @@
+"""
+Caché de página completa para las páginas informativas (inicio, empresa y
+servicios).
+
+Estas páginas solo cambian con el usuario en la barra de navegación. Se
+renderizan una vez por proceso como visitante anónimo (la "carcasa") y se
+guardan en memoria ya comprimidas; a un visitante anónimo se le envía la
+carcasa tal cual, sin pasar por el motor de plantillas ni la base de datos.
+Con un usuario autenticado solo se renderizan los fragmentos de
+``templates/partials/auth_*.html`` y se insertan entre los marcadores
+``<!--auth-...-->`` de ``base.html``.
+
+El comando ``prerender_pages`` escribe las carcasas en
+``PAGE_PRERENDER_DIR`` (HTML, ``.gz`` y ``.br``) al desplegar; cada proceso
+las lee de ahí la primera vez en lugar de renderizarlas. Los archivos más
+antiguos que alguna plantilla se ignoran. Con ``PAGE_CACHE`` desactivado
+(perfil dev) las páginas se renderizan en cada petición.
+"""
+import gzip
+import hashlib
+import os
+import re
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpRequest, HttpResponse
+from django.template.loader import render_to_string
+from django.urls import reverse
+from django.utils.cache import patch_vary_headers
+
+from .conditional import not_modified
+
+try:
+    import brotli
+except ImportError:  # Brotli es opcional: sin él solo se sirve gzip.
+    brotli = None
+
+# Nombre de la URL -> plantilla.
+PAGES = {
+    'home': 'home.html',
+    'about': 'company/about.html',
+    'history': 'company/history.html',
+    'team': 'company/team.html',
+    'service_support': 'services_pages/support.html',
+    'service_development': 'services_pages/development.html',
+    'service_networks': 'services_pages/networks.html',
+    'service_cloud': 'services_pages/cloud.html',
+    'service_security': 'services_pages/security.html',
+    'service_consulting': 'services_pages/consulting.html',
+}
+
+# Marcador de base.html -> fragmento por usuario.
+FRAGMENTS = {
+    'auth-menu': 'partials/auth_menu.html',
+    'auth-user': 'partials/auth_user.html',
+}
+FRAGMENT_RE = re.compile(r'<!--(%s)-->.*?<!--/\1-->' % '|'.join(FRAGMENTS), re.DOTALL)
+
+_ACCEPTS_BR = re.compile(r'\bbr\b')
+_ACCEPTS_GZIP = re.compile(r'\bgzip\b')
+
+_shells = {}
+_templates_mtime = None
+_lock = threading.Lock()
+
+
+class Shell:
+    """
+    Documento ya renderizado y sus versiones comprimidas.
+
+    Se usa para las carcasas de las páginas y para los sitemaps
+    (``personal_tech.sitemaps``).
+    """
+
+    def __init__(self, html, gz=None, br=None):
+        self.html = html
+        self.gz = gz if gz is not None else gzip.compress(html, compresslevel=9, mtime=0)
+        if br is None and brotli is not None:
+            br = brotli.compress(html)
+        self.br = br
+        self.digest = hashlib.sha256(html).hexdigest()[:40]
+
+    def variant(self, accept_encoding):
+        """Devuelve (cuerpo, Content-Encoding, ETag) según ``Accept-Encoding``."""
+        if self.br is not None and _ACCEPTS_BR.search(accept_encoding):
+            return self.br, 'br', f'"{self.digest}-br"'
+        if _ACCEPTS_GZIP.search(accept_encoding):
+            return self.gz, 'gzip', f'"{self.digest}-gz"'
+        return self.html, None, f'"{self.digest}"'
+
+
+def render_shell(name):
+    """
+    Renderiza la página ``name`` como visitante anónimo.
+
+    Returns:
+        bytes: El HTML en UTF-8.
+    """
+    request = HttpRequest()
+    request.method = 'GET'
+    request.path = request.path_info = reverse(name)
+    request.user = AnonymousUser()
+    return render_to_string(PAGES[name], request=request).encode()
+
+
+def prerender_dir():
+    return Path(settings.PAGE_PRERENDER_DIR)
+
+
+def templates_mtime():
+    """Fecha de modificación más reciente de las plantillas del proyecto (``TEMPLATES['DIRS']``)."""
+    latest = 0.0
+    for directory in settings.TEMPLATES[0]['DIRS']:
+        for root, _, files in os.walk(directory):
+            for filename in files:
+                latest = max(latest, os.stat(os.path.join(root, filename)).st_mtime)
+    return latest
+
+
+def _read_prerendered(name, not_before):
+    path = prerender_dir() / f'{name}.html'
+    try:
+        if path.stat().st_mtime < not_before:
+            return None
+        html = path.read_bytes()
+        gz = path.with_suffix('.html.gz').read_bytes()
+    except OSError:
+        return None
+    try:
+        br = path.with_suffix('.html.br').read_bytes()
+    except OSError:
+        br = None
+    return Shell(html, gz, br)
+
+
+def get_shell(name):
+    """Carcasa de ``name``: de memoria, del archivo prerenderizado o renderizada ahora."""
+    global _templates_mtime
+    shell = _shells.get(name)
+    if shell is None:
+        with _lock:
+            shell = _shells.get(name)
+            if shell is None:
+                if _templates_mtime is None:
+                    _templates_mtime = templates_mtime()
+                shell = _read_prerendered(name, _templates_mtime) or Shell(render_shell(name))
+                _shells[name] = shell
+    return shell
+
+
+def clear():
+    """Olvida las carcasas en memoria (pruebas y ``prerender_pages``)."""
+    global _templates_mtime
+    with _lock:
+        _shells.clear()
+        _templates_mtime = None
+
+
+def serve(request, name):
+    """
+    Responde la página informativa ``name``.
+
+    Returns:
+        HttpResponse: La carcasa (anónimos), la carcasa con los fragmentos
+        del usuario (autenticados) o, sin ``PAGE_CACHE``, la página
+        renderizada como siempre.
+    """
+    if not settings.PAGE_CACHE:
+        return HttpResponse(render_to_string(PAGES[name], request=request))
+    shell = get_shell(name)
+    if request.user.is_authenticated:
+        response = HttpResponse(_punch(shell.html.decode(), request))
+        patch_vary_headers(response, ('Cookie',))
+        return response
+
+    response = shell_response(request, shell, settings.PAGE_CACHE_MAX_AGE)
+    patch_vary_headers(response, ('Cookie',))
+    return response
+
+
+def shell_response(request, shell, max_age, content_type=None, last_modified=None):
+    """
+    Respuesta pública con la versión de ``shell`` que acepta el cliente.
+
+    Returns:
+        HttpResponse: El documento (comprimido si se acepta) o 304 si el
+        ``ETag`` coincide.
+    """
+    body, encoding, etag = shell.variant(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    response = not_modified(request, etag)
+    if response is None:
+        response = HttpResponse(body, content_type=content_type)
+        if encoding:
+            response['Content-Encoding'] = encoding
+        if last_modified:
+            response['Last-Modified'] = last_modified
+    response['ETag'] = etag
+    response['Cache-Control'] = f'public, max-age={max_age}'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    return response
+
+
+def _punch(html, request):
+    """Reemplaza los fragmentos anónimos de la carcasa por los del usuario."""
+    fragments = {}
+
+    def replace(match):
+        marker = match.group(1)
+        if marker not in fragments:
+            fragments[marker] = render_to_string(FRAGMENTS[marker], request=request)
+        return f'<!--{marker}-->{fragments[marker]}<!--/{marker}-->'
+    return FRAGMENT_RE.sub(replace, html)
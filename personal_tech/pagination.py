@@ -0,0 +1,43 @@
+"""
+Paginación por cursor para todos los listados de la API.
+
+``CursorPagination`` no ejecuta ``COUNT(*)`` y pide cada página a partir de
+la posición del cursor, de modo que el costo no crece con la página y las
+inserciones concurrentes no duplican ni saltan filas. Cada vista indica su
+orden por defecto en el atributo ``ordering``, sobre columnas indexadas que
+no cambian (``created_at``, ``date``) y terminando en la clave primaria para
+que el orden sea estable.
+
+``StableOrderingFilter`` permite además ordenar por los ``ordering_fields``
+de la vista, y algunos se pueden editar o repetir (p. ej. ``name``). El
+cursor guarda solo el valor del primer campo y un desplazamiento entre las
+filas con ese mismo valor, así que con esos órdenes:
+
+* una fila que cambia de valor entre dos páginas puede aparecer dos veces o
+  ninguna;
+* con valores repetidos, recorrer hacia adelante con ``next`` no repite ni
+  salta filas, pero al volver con ``previous`` los cortes de página pueden
+  cambiar y saltarse filas del grupo repetido.
+"""
+from django.conf import settings
+from rest_framework.pagination import CursorPagination
+
+
+class StandardCursorPagination(CursorPagination):
+    """
+    Paginación por defecto de la API (``DEFAULT_PAGINATION_CLASS``).
+
+    El tamaño de página se puede pedir con ``?page_size=`` hasta
+    ``API_MAX_PAGE_SIZE``. Sin ``ordering`` en la vista se ordena por ``-pk``.
+    """
+    ordering = '-pk'
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        # Con un OrderingFilter en la vista, DRF ya toma de él el orden
+        # (incluido el ``ordering`` por defecto de la vista).
+        if any(hasattr(backend, 'get_ordering') for backend in getattr(view, 'filter_backends', ())):
+            return super().get_ordering(request, queryset, view)
+        ordering = getattr(view, 'ordering', None) or self.ordering
+        return (ordering,) if isinstance(ordering, str) else tuple(ordering)
@@ -0,0 +1,69 @@
+"""
+Presupuesto de consultas SQL por vista.
+
+Cada vista de listado declara cuántas consultas puede ejecutar como máximo
+(incluyendo el renderizado de la plantilla). Si una vista excede su
+presupuesto se registra una advertencia en el logger ``query_budget``; si
+``QUERY_BUDGET_STRICT`` está activo (desarrollo y pruebas) se lanza
+``QueryBudgetExceeded`` para que el problema N+1 falle de inmediato.
+"""
+import functools
+import logging
+
+from django.conf import settings
+from django.db import connection
+
+logger = logging.getLogger('query_budget')
+
+
+class QueryBudgetExceeded(AssertionError):
+    """La vista ejecutó más consultas de las declaradas en su presupuesto."""
+
+
+class _QueryCounter:
+    """Wrapper de ejecución que cuenta las consultas y guarda su SQL."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+def query_budget(max_queries):
+    """
+    Decorador que limita el número de consultas SQL de una vista.
+
+    Args:
+        max_queries (int): Número máximo de consultas permitidas, contando
+            la sesión y el usuario autenticado que carga ``base.html``.
+
+    Returns:
+        function: La vista decorada.
+    """
+    def decorator(view_func):
+        @functools.wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            counter = _QueryCounter()
+            with connection.execute_wrapper(counter):
+                response = view_func(request, *args, **kwargs)
+                # Las respuestas diferidas (TemplateResponse) se renderizan aquí
+                # para que sus consultas también cuenten.
+                if hasattr(response, 'render') and not getattr(response, 'is_rendered', True):
+                    response.render()
+
+            executed = len(counter.queries)
+            if executed > max_queries:
+                message = (
+                    f'{view_func.__module__}.{view_func.__name__} ejecutó {executed} '
+                    f'consultas (presupuesto: {max_queries}).'
+                )
+                if getattr(settings, 'QUERY_BUDGET_STRICT', settings.DEBUG):
+                    raise QueryBudgetExceeded(message + '\n' + '\n'.join(counter.queries))
+                logger.warning(message)
+            return response
+
+        wrapper.query_budget = max_queries
+        return wrapper
+    return decorator
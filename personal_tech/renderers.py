@@ -0,0 +1,31 @@
+"""
+Renderer JSON rápido para la API.
+
+``FastJSONRenderer`` produce la misma salida que ``JSONRenderer`` con la
+configuración por defecto de DRF (compacto, UTF-8 sin escapar) pero usa
+``orjson`` cuando está instalado. Si no lo está, o si el cliente pide
+sangría (``Accept: application/json; indent=4``), delega en DRF.
+"""
+from rest_framework import renderers
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # Dependencia opcional: se usa el codificador de DRF.
+    orjson = None
+
+_default = encoders.JSONEncoder().default
+
+
+class FastJSONRenderer(renderers.JSONRenderer):
+    """``JSONRenderer`` con ``orjson``; los tipos que no conoce pasan por el codificador de DRF."""
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        # Las fechas pasan por el codificador de DRF para conservar su formato.
+        ret = orjson.dumps(data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+        # Igual que DRF: U+2028 y U+2029 se escapan para poder incrustar el JSON en JavaScript.
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
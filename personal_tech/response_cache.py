@@ -0,0 +1,235 @@
+"""
+Caché de respuestas de la API invalidada por generaciones.
+
+Cada modelo cacheado tiene un contador de generación en la caché. La clave
+de una respuesta incluye la generación actual de los modelos de los que
+depende, además de la URL, los parámetros, el formato y el rol del usuario.
+Cuando cambia una fila se asigna una generación nueva al modelo: las
+respuestas anteriores dejan de ser alcanzables y expiran solas, sin recorrer
+ni borrar claves (invalidación O(1)).
+
+La generación cambia:
+
+* con ``post_save`` / ``post_delete`` del modelo;
+* con ``update()``, ``bulk_create()`` y ``bulk_update()`` hechos a través de
+  ``VersionedManager`` (el manager de los modelos cacheados), que además
+  actualizan los campos ``auto_now`` como ``save()``;
+* con la señal ``bulk_saved`` de las operaciones masivas de la API.
+
+El cambio se aplica al confirmar la transacción, para que ninguna petición
+lea la generación nueva antes de poder ver los datos nuevos. Cada
+generación es un valor nuevo (no un incremento), así que funciona igual con
+``LocMemCache`` que con ``FileBasedCache``, donde ``incr`` no es atómico.
+"""
+import hashlib
+import itertools
+import os
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import models, transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils import timezone
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.renderers import BrowsableAPIRenderer
+
+from accounts.roles import effective_role
+
+from .signals import bulk_saved, rows_writing, rows_written
+
+# Cabeceras que se guardan con el cuerpo de la respuesta.
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Cache-Control', 'Vary', 'Content-Disposition')
+
+_sequence = itertools.count()
+
+
+def _cache():
+    return caches[settings.API_CACHE_ALIAS]
+
+
+def _generation_key(model):
+    return f'api-gen:{model._meta.label_lower}'
+
+
+def _new_generation():
+    # Único entre procesos y reinicios: nunca repite una generación anterior,
+    # aunque la caché haya perdido el contador.
+    return f'{time.time_ns():x}.{os.getpid():x}.{next(_sequence):x}'
+
+
+def generations(models_):
+    """
+    Generación actual de cada modelo, en una sola lectura de la caché.
+
+    Returns:
+        list: Generaciones en el orden de ``models_``.
+    """
+    cache = _cache()
+    keys = [_generation_key(model) for model in models_]
+    current = cache.get_many(keys)
+    for key in keys:
+        if key not in current:
+            cache.add(key, _new_generation(), timeout=None)
+            current[key] = cache.get(key)
+    return [current[key] for key in keys]
+
+
+def bump(model):
+    """Asigna una generación nueva a ``model`` cuando se confirme la transacción."""
+    key = _generation_key(model)
+    transaction.on_commit(lambda: _cache().set(key, _new_generation(), timeout=None))
+
+
+def _bump_on_signal(sender, **kwargs):
+    bump(sender)
+
+
+class VersionedQuerySet(models.QuerySet):
+    """
+    QuerySet que cambia la generación del modelo en las escrituras masivas
+    y envía ``rows_writing``/``rows_written`` con las filas escritas.
+    """
+
+    def _listened(self):
+        """Indica si alguien escucha las escrituras masivas del modelo."""
+        return rows_writing.has_listeners(self.model) or rows_written.has_listeners(self.model)
+
+    def _auto_now(self):
+        """Valores actuales de los campos ``auto_now`` (p. ej. ``updated_at``)."""
+        now = timezone.now()
+        return {
+            field: now if isinstance(field, models.DateTimeField) else timezone.localdate(now)
+            for field in self.model._meta.concrete_fields
+            if getattr(field, 'auto_now', False)
+        }
+
+    def update(self, **kwargs):
+        # update() no aplica auto_now: sin esto updated_at (ETag de la API,
+        # clave de la caché de PDF) seguiría igual aunque la fila cambió.
+        for field, value in self._auto_now().items():
+            kwargs.setdefault(field.name, value)
+        # Las claves solo se leen si alguien escucha (p. ej. el índice de búsqueda).
+        pks = list(self.values_list('pk', flat=True)) if self._listened() else []
+        state = {}
+        if pks:
+            rows_writing.send(sender=self.model, pks=pks, state=state)
+        rows = super().update(**kwargs)
+        if rows:
+            bump(self.model)
+            if pks:
+                rows_written.send(sender=self.model, pks=pks, state=state)
+        return rows
+
+    update.alters_data = True
+
+    def bulk_create(self, objs, *args, **kwargs):
+        created = super().bulk_create(objs, *args, **kwargs)
+        if created:
+            bump(self.model)
+            rows_written.send(sender=self.model, pks=[obj.pk for obj in created if obj.pk is not None], state={})
+        return created
+
+    bulk_create.alters_data = True
+
+    def bulk_update(self, objs, fields, *args, **kwargs):
+        objs = list(objs)
+        auto_now = self._auto_now()
+        for obj in objs:
+            for field, value in auto_now.items():
+                setattr(obj, field.attname, value)
+        fields = [*fields, *(field.name for field in auto_now if field.name not in fields)]
+        # Django escribe cada lote con ``update``, que ya cambia la generación
+        # y envía las señales.
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    bulk_update.alters_data = True
+
+
+class VersionedManager(models.Manager.from_queryset(VersionedQuerySet)):
+    """
+    Manager de los modelos cacheados (``objects = VersionedManager()``).
+
+    Al instalarse en el modelo conecta ``post_save``, ``post_delete`` y
+    ``bulk_saved`` para cambiar su generación.
+    """
+
+    def contribute_to_class(self, cls, name):
+        super().contribute_to_class(cls, name)
+        if not cls._meta.abstract:
+            uid = f'response-cache:{cls._meta.label_lower}'
+            post_save.connect(_bump_on_signal, sender=cls, weak=False, dispatch_uid=uid)
+            post_delete.connect(_bump_on_signal, sender=cls, weak=False, dispatch_uid=uid)
+            bulk_saved.connect(_bump_on_signal, sender=cls, weak=False, dispatch_uid=uid)
+
+
+def user_role(user):
+    """Rol con el que se cachea la respuesta: ``admin``, ``technician``, ``client`` o ``anonymous``."""
+    if not user.is_authenticated:
+        return 'anonymous'
+    return effective_role(user) or 'none'
+
+
+class CachedResponseMixin:
+    """
+    Mixin para vistas genéricas de DRF: cachea las respuestas 200 de los GET.
+
+    ``cache_models`` lista los modelos de los que depende la respuesta (por
+    defecto, el del queryset). En un acierto se responde sin consultar la
+    base de datos ni serializar; si el ``ETag`` guardado coincide con
+    ``If-None-Match`` se responde 304. La API navegable no se cachea porque
+    incluye datos de la sesión.
+    """
+    cache_models = None
+
+    def get_cache_models(self):
+        return self.cache_models or [self.queryset.model]
+
+    def get_response_cache_key(self, request):
+        if isinstance(request.accepted_renderer, BrowsableAPIRenderer):
+            return None
+        parts = [
+            *generations(self.get_cache_models()),
+            user_role(request.user),
+            request.accepted_renderer.media_type,
+            # Con el host: los enlaces de paginación son absolutos.
+            request.build_absolute_uri(request.path),
+            sorted(request.query_params.lists()),
+        ]
+        digest = hashlib.sha256(repr(parts).encode()).hexdigest()
+        return f'api-response:{digest}'
+
+    def list(self, request, *args, **kwargs):
+        return self._cached(request, super().list, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._cached(request, super().retrieve, *args, **kwargs)
+
+    def _cached(self, request, handler, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        if key is None:
+            return handler(request, *args, **kwargs)
+        cached = _cache().get(key)
+        if cached is not None:
+            return self._from_cache(request, *cached)
+        response = handler(request, *args, **kwargs)
+        if response.status_code == 200 and hasattr(response, 'add_post_render_callback'):
+            response.add_post_render_callback(lambda rendered: self._store(key, rendered))
+        return response
+
+    def _store(self, key, response):
+        headers = {name: response[name] for name in CACHED_HEADERS if response.has_header(name)}
+        _cache().set(key, (response.content, response['Content-Type'], headers), settings.API_CACHE_TIMEOUT)
+
+    def _from_cache(self, request, content, content_type, headers):
+        response = HttpResponse(content, content_type=content_type)
+        for name, value in headers.items():
+            response[name] = value
+        if 'ETag' in headers:
+            last_modified = parse_http_date_safe(headers.get('Last-Modified', ''))
+            response = get_conditional_response(
+                request, etag=headers['ETag'], last_modified=last_modified, response=response,
+            )
+        return response
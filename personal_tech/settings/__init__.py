@@ -0,0 +1,26 @@
+"""
+Configuración de Django por perfiles.
+
+``DJANGO_ENV`` (variable de entorno o ``.env``) elige el perfil:
+
+* ``dev`` (por defecto): ``DEBUG`` activo y PDF generados en la petición.
+* ``test``: SQLite y hash de contraseñas rápido, para la suite de pruebas.
+* ``prod``: ``DEBUG`` apagado, conexiones persistentes a PostgreSQL,
+  plantillas en caché y caché compartida entre procesos.
+
+Todos parten de ``base``. También se puede apuntar
+``DJANGO_SETTINGS_MODULE`` directamente a ``personal_tech.settings.<perfil>``.
+"""
+from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+
+DJANGO_ENV = config('DJANGO_ENV', default='dev')
+
+if DJANGO_ENV == 'prod':
+    from .prod import *  # noqa: F401,F403
+elif DJANGO_ENV == 'test':
+    from .test import *  # noqa: F401,F403
+elif DJANGO_ENV == 'dev':
+    from .dev import *  # noqa: F401,F403
+else:
+    raise ImproperlyConfigured(f"DJANGO_ENV debe ser 'dev', 'test' o 'prod', no {DJANGO_ENV!r}.")
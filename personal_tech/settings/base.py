@@ -0,0 +1,305 @@
+"""
+Django settings for personal_tech project: configuración común a todos los
+perfiles (dev, test, prod). Ver ``personal_tech/settings/__init__.py``.
+
+Generated by 'django-admin startproject' using Django 5.2.8.
+
+For more information on this file, see
+https://docs.djangoproject.com/en/5.2/topics/settings/
+
+For the full list of settings and their values, see
+https://docs.djangoproject.com/en/5.2/ref/settings/
+"""
+
+from pathlib import Path
+import os
+from decouple import config
+
+# Build paths inside the project like this: BASE_DIR / 'subdir'.
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+
+
+# Quick-start development settings - unsuitable for production
+# See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
+
+# SECURITY WARNING: keep the secret key used in production secret!
+# El perfil prod exige SECRET_KEY en el entorno.
+SECRET_KEY = config('SECRET_KEY', default='django-insecure-=wc56o84h1or+wo_iguexqja1a7a(92#+%oap(d#nug(7#w3s)')
+
+# SECURITY WARNING: don't run with debug turned on in production!
+# Solo el perfil dev lo activa.
+DEBUG = False
+
+ALLOWED_HOSTS = []
+
+
+# Application definition
+
+INSTALLED_APPS = [
+    'django.contrib.admin',
+    'django.contrib.auth',
+    'django.contrib.contenttypes',
+    'django.contrib.sessions',
+    'django.contrib.messages',
+    # runserver tampoco sirve los estáticos: los sirve WhiteNoise, como en producción.
+    'whitenoise.runserver_nostatic',
+    'django.contrib.staticfiles',
+    'django.contrib.sites',
+    'django.contrib.sitemaps',
+    'rest_framework',
+    'django_filters',
+    'accounts',
+    'services',
+    'inventory',
+    'quotes',
+    'reports',
+    'search',
+    'crispy_forms',
+    'crispy_bootstrap5',
+    'drf_spectacular',
+    # Comandos del proyecto (prerender_pages). Va al final: el populate_data
+    # de services sigue teniendo prioridad sobre el de personal_tech.
+    'personal_tech',
+]
+
+CRISPY_ALLOWED_TEMPLATE_PACKS = "bootstrap5"
+CRISPY_TEMPLATE_PACK = "bootstrap5"
+
+SITE_ID = 1
+
+MIDDLEWARE = [
+    'django.middleware.security.SecurityMiddleware',
+    # Archivos estáticos servidos por la aplicación (ver STORAGES en prod).
+    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'django.contrib.sessions.middleware.SessionMiddleware',
+    'django.middleware.common.CommonMiddleware',
+    'django.middleware.csrf.CsrfViewMiddleware',
+    'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'django.contrib.messages.middleware.MessageMiddleware',
+    'django.middleware.clickjacking.XFrameOptionsMiddleware',
+]
+
+ROOT_URLCONF = 'personal_tech.urls'
+
+TEMPLATES = [
+    {
+        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        'DIRS': [BASE_DIR / 'templates'],
+        'APP_DIRS': True,
+        'OPTIONS': {
+            'context_processors': [
+                'django.template.context_processors.request',
+                'django.contrib.auth.context_processors.auth',
+                'accounts.context_processors.role',
+                'django.contrib.messages.context_processors.messages',
+            ],
+        },
+    },
+]
+
+WSGI_APPLICATION = 'personal_tech.wsgi.application'
+
+
+# Database
+# https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+
+# PostgreSQL Configuration
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.postgresql',
+        'NAME': config('DB_NAME', default='personal_tech'),
+        'USER': config('DB_USER', default='postgres'),
+        'PASSWORD': config('DB_PASSWORD', default=''),
+        'HOST': config('DB_HOST', default='localhost'),
+        'PORT': config('DB_PORT', default='5432'),
+    }
+}
+
+# Los índices de los listados usan columnas INCLUDE (index-only scans en
+# PostgreSQL); otras bases de datos, como SQLite en pruebas, las ignoran.
+SILENCED_SYSTEM_CHECKS = ['models.W040']
+
+
+# Password validation
+# https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
+
+AUTH_PASSWORD_VALIDATORS = [
+    {
+        'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.MinimumLengthValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.CommonPasswordValidator',
+    },
+    {
+        'NAME': 'django.contrib.auth.password_validation.NumericPasswordValidator',
+    },
+]
+
+
+# Internationalization
+# https://docs.djangoproject.com/en/5.2/topics/i18n/
+
+LANGUAGE_CODE = 'es'
+
+TIME_ZONE = 'America/Bogota'
+
+USE_I18N = True
+
+USE_TZ = True
+
+
+# Static files (CSS, JavaScript, Images)
+# https://docs.djangoproject.com/en/5.2/howto/static-files/
+
+STATIC_URL = '/static/'
+STATICFILES_DIRS = [BASE_DIR / 'static']
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+STORAGES = {
+    'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+    'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+}
+
+MEDIA_URL = '/media/'
+MEDIA_ROOT = BASE_DIR / 'media'
+
+# Caché en disco de los PDF de reportes técnicos (services.pdf).
+# Fuera de MEDIA_ROOT para que no quede expuesta públicamente.
+REPORT_PDF_CACHE_DIR = config('REPORT_PDF_CACHE_DIR', default=str(BASE_DIR / 'var' / 'pdf_cache'))
+
+# Generación de PDF fuera de la petición (services.pdf_jobs / run_pdf_workers).
+# Con PDF_RENDER_INLINE la vista genera el PDF directamente, útil en desarrollo
+# cuando no hay un proceso run_pdf_workers en ejecución.
+PDF_RENDER_INLINE = config('PDF_RENDER_INLINE', default=DEBUG, cast=bool)
+PDF_WORKER_PROCESSES = config('PDF_WORKER_PROCESSES', default=2, cast=int)
+PDF_JOB_TIMEOUT = config('PDF_JOB_TIMEOUT', default=60, cast=int)
+PDF_JOB_MEMORY_LIMIT_MB = config('PDF_JOB_MEMORY_LIMIT_MB', default=512, cast=int)
+# Lado mayor (px) de las imágenes incrustadas en los PDF; el logo ocupa ~60px
+# en la plantilla, así que 300px alcanza para imprimir a 300 DPI.
+PDF_IMAGE_MAX_PX = config('PDF_IMAGE_MAX_PX', default=300, cast=int)
+# Máximo de reportes por descarga ZIP desde la web (services.pdf_export); el
+# comando export_reports no tiene límite.
+REPORT_EXPORT_MAX_REPORTS = config('REPORT_EXPORT_MAX_REPORTS', default=1000, cast=int)
+
+# Django REST Framework - ajustes para desarrollo
+REST_FRAMEWORK = {
+    'DEFAULT_AUTHENTICATION_CLASSES': (
+        'rest_framework.authentication.BasicAuthentication',
+        # Integraciones: ``Authorization: Token <clave>`` (accounts.authentication).
+        'accounts.authentication.TokenAuthentication',
+        'rest_framework.authentication.SessionAuthentication',
+    ),
+    'DEFAULT_RENDERER_CLASSES': (
+        # Misma salida que JSONRenderer, codificada con orjson.
+        'personal_tech.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_SCHEMA_CLASS': 'drf_spectacular.openapi.AutoSchema',
+    # Todos los listados se paginan por cursor (personal_tech.pagination).
+    'DEFAULT_PAGINATION_CLASS': 'personal_tech.pagination.StandardCursorPagination',
+    # Filtros declarados por vista (filterset_class) y orden sobre campos indexados.
+    'DEFAULT_FILTER_BACKENDS': (
+        'django_filters.rest_framework.DjangoFilterBackend',
+        'personal_tech.filters.StableOrderingFilter',
+    ),
+    'PAGE_SIZE': config('API_PAGE_SIZE', default=50, cast=int),
+}
+API_MAX_PAGE_SIZE = config('API_MAX_PAGE_SIZE', default=200, cast=int)
+
+# Filas que trae cada viaje del cursor del servidor en las exportaciones
+# CSV/NDJSON de la API (personal_tech.exports).
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', default=2000, cast=int)
+
+# Caché de Django. LocMemCache es local a cada proceso: con varios workers
+# use una caché compartida (p. ej. CACHE_BACKEND=django.core.cache.backends.
+# filebased.FileBasedCache y CACHE_LOCATION=/var/tmp/personal_tech_cache) para
+# que la invalidación de la caché de la API llegue a todos. El perfil prod ya
+# usa una caché en disco por defecto.
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='personal-tech'),
+        'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=5000, cast=int)},
+    }
+}
+
+# Caché de página completa de las páginas informativas (personal_tech.pagecache)
+# y carpeta donde prerender_pages deja las versiones renderizadas.
+PAGE_CACHE = config('PAGE_CACHE', default=True, cast=bool)
+PAGE_CACHE_MAX_AGE = config('PAGE_CACHE_MAX_AGE', default=300, cast=int)
+PAGE_PRERENDER_DIR = config('PAGE_PRERENDER_DIR', default=str(BASE_DIR / 'var' / 'pages'))
+
+# Caché de respuestas de la API (personal_tech.response_cache).
+API_CACHE_ALIAS = 'default'
+API_CACHE_TIMEOUT = config('API_CACHE_TIMEOUT', default=300, cast=int)
+
+# Tokens de API (accounts.authentication): vigencia por defecto, tamaño y
+# duración de la caché en memoria de tokens validados, y cada cuánto se
+# actualiza la fecha de último uso.
+API_TOKEN_TTL_DAYS = config('API_TOKEN_TTL_DAYS', default=90, cast=int)
+API_TOKEN_CACHE_SIZE = config('API_TOKEN_CACHE_SIZE', default=1024, cast=int)
+API_TOKEN_CACHE_SECONDS = config('API_TOKEN_CACHE_SECONDS', default=60, cast=int)
+API_TOKEN_TOUCH_SECONDS = 300
+
+# Segundos que se guarda en caché el rol de cada usuario (accounts.roles); se
+# borra antes al guardar el perfil.
+ROLE_CACHE_SECONDS = config('ROLE_CACHE_SECONDS', default=300, cast=int)
+
+# Operaciones masivas de la API (personal_tech.bulk): elementos por petición
+# y filas por sentencia INSERT/UPDATE.
+API_BULK_MAX_ITEMS = config('API_BULK_MAX_ITEMS', default=1000, cast=int)
+API_BULK_BATCH_SIZE = config('API_BULK_BATCH_SIZE', default=500, cast=int)
+
+SPECTACULAR_SETTINGS = {
+    'TITLE': 'Personal Tech API',
+    'DESCRIPTION': 'API documentation for Personal Tech application',
+    'VERSION': '1.0.0',
+    'SERVE_INCLUDE_SCHEMA': False,
+}
+
+# Presupuesto de consultas por vista (personal_tech.query_budget).
+# En modo estricto una vista que excede su presupuesto lanza una excepción;
+# en producción solo se registra una advertencia.
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=DEBUG, cast=bool)
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'query_budget': {'handlers': ['console'], 'level': 'WARNING'},
+    },
+}
+
+# Default primary key field type
+# https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
+
+DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+# Authentication settings
+LOGIN_REDIRECT_URL = 'home'
+LOGOUT_REDIRECT_URL = 'home'
+LOGIN_URL = 'login'
+
+# Email Configuration
+# Email Configuration
+# EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend' # For development
+EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
+EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
+EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
+DEFAULT_FROM_EMAIL = 'Personal Technology <noreply@personaltech.com>'
+
+# Bandeja de salida (services.mailing / send_queued_emails)
+EMAIL_OUTBOX_BATCH_SIZE = config('EMAIL_OUTBOX_BATCH_SIZE', default=50, cast=int)
+EMAIL_OUTBOX_MAX_ATTEMPTS = config('EMAIL_OUTBOX_MAX_ATTEMPTS', default=5, cast=int)
+EMAIL_OUTBOX_RETRY_BASE_SECONDS = config('EMAIL_OUTBOX_RETRY_BASE_SECONDS', default=60, cast=int)
+# Correos por segundo en los envíos masivos (send_report_emails)
+EMAIL_BULK_RATE = config('EMAIL_BULK_RATE', default=2.0, cast=float)
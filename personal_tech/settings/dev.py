@@ -0,0 +1,14 @@
+"""
+Perfil de desarrollo: ``DEBUG`` activo, PDF en la petición, presupuesto de
+consultas estricto y páginas informativas sin caché (se ven los cambios de
+las plantillas al instante).
+"""
+from decouple import config
+
+from .base import *  # noqa: F401,F403
+
+DEBUG = True
+
+PDF_RENDER_INLINE = config('PDF_RENDER_INLINE', default=True, cast=bool)
+QUERY_BUDGET_STRICT = config('QUERY_BUDGET_STRICT', default=True, cast=bool)
+PAGE_CACHE = config('PAGE_CACHE', default=False, cast=bool)
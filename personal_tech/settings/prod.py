@@ -0,0 +1,73 @@
+"""
+Perfil de producción.
+
+Exige ``SECRET_KEY``, ``ALLOWED_HOSTS`` y ``DB_PASSWORD`` en el entorno.
+Frente a ``base``:
+
+* Conexiones persistentes a PostgreSQL (``DB_CONN_MAX_AGE`` segundos) con
+  verificación antes de reutilizarlas, en lugar de una conexión nueva por
+  petición.
+* Cargador de plantillas en caché: cada plantilla se compila una vez por
+  proceso.
+* Archivos estáticos con hash en el nombre y versiones gzip/brotli
+  generadas en ``collectstatic``. WhiteNoise los sirve con
+  ``Cache-Control: immutable`` y, sin ``WHITENOISE_AUTOREFRESH``, indexa
+  ``STATIC_ROOT`` al arrancar: no consulta el disco en cada petición.
+* Caché compartida entre procesos (en disco por defecto; ``CACHE_BACKEND`` y
+  ``CACHE_LOCATION`` permiten usar Redis o Memcached), necesaria para que la
+  invalidación de la caché de la API y de los roles llegue a todos los
+  workers.
+"""
+from decouple import Csv, config
+
+from .base import *  # noqa: F401,F403
+from .base import BASE_DIR, DATABASES, STORAGES, TEMPLATES
+
+DEBUG = False
+
+SECRET_KEY = config('SECRET_KEY')
+ALLOWED_HOSTS = config('ALLOWED_HOSTS', cast=Csv())
+
+DATABASES = {
+    'default': {
+        **DATABASES['default'],
+        'PASSWORD': config('DB_PASSWORD'),
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=600, cast=int),
+        'CONN_HEALTH_CHECKS': True,
+    }
+}
+
+TEMPLATES = [
+    {
+        **TEMPLATES[0],
+        'APP_DIRS': False,
+        'OPTIONS': {
+            **TEMPLATES[0]['OPTIONS'],
+            'loaders': [
+                ('django.template.loaders.cached.Loader', [
+                    'django.template.loaders.filesystem.Loader',
+                    'django.template.loaders.app_directories.Loader',
+                ]),
+            ],
+        },
+    },
+]
+
+STORAGES = {
+    **STORAGES,
+    'staticfiles': {'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage'},
+}
+# collectstatic borra las copias sin hash: solo se sirven nombres inmutables.
+WHITENOISE_KEEP_ONLY_HASHED_FILES = True
+
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.filebased.FileBasedCache'),
+        'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'var' / 'cache')),
+        'TIMEOUT': config('CACHE_TIMEOUT', default=300, cast=int),
+        'OPTIONS': {'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=20000, cast=int)},
+    }
+}
+
+SESSION_COOKIE_SECURE = config('SECURE_COOKIES', default=True, cast=bool)
+CSRF_COOKIE_SECURE = SESSION_COOKIE_SECURE
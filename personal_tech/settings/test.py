@@ -0,0 +1,30 @@
+"""
+Perfil de pruebas: SQLite, MD5 para las contraseñas y correo en memoria.
+
+No necesita PostgreSQL ni variables de entorno. ``manage.py test`` crea la
+base de datos en memoria.
+"""
+from .base import *  # noqa: F401,F403
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'var' / 'test.sqlite3',
+    }
+}
+
+# PBKDF2 domina el tiempo de las pruebas que crean usuarios; MD5 solo aquí.
+PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'personal-tech-test',
+    }
+}
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+PDF_RENDER_INLINE = True
+REPORT_PDF_CACHE_DIR = str(BASE_DIR / 'var' / 'test_pdf_cache')
+QUERY_BUDGET_STRICT = True
@@ -0,0 +1,25 @@
+"""
+Señales de las escrituras que no emiten ``post_save`` ni ``post_delete``.
+
+Están en un módulo propio, sin dependencias de DRF, para que los modelos de
+cualquier app puedan importarlas.
+"""
+from django.dispatch import Signal
+
+# Lo envía ``BulkAPIView`` (personal_tech.bulk) después de escribir un lote.
+# Argumentos: ``sender`` (modelo), ``created`` (instancias nuevas) y
+# ``updated`` (pares (antes, después)).
+bulk_saved = Signal()
+
+# Lo envía ``VersionedQuerySet`` (personal_tech.response_cache) antes de
+# ``update`` y ``bulk_update``. Argumentos: ``sender`` (modelo), ``pks``
+# (claves de las filas que se van a escribir) y ``state`` (dict en el que el
+# receptor puede guardar lo que necesite leer antes de la escritura).
+rows_writing = Signal()
+
+# Lo envía ``VersionedQuerySet`` después de ``update``, ``bulk_create`` y
+# ``bulk_update``, que no emiten ``post_save`` (y ``ApiTokenQuerySet`` de
+# accounts.models después de ``update``). Argumentos: ``sender``
+# (modelo), ``pks`` (claves de las filas escritas) y ``state`` (el mismo dict
+# de ``rows_writing``; vacío en ``bulk_create``).
+rows_written = Signal()
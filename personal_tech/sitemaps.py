@@ -1,12 +1,101 @@
+"""
+Sitemaps del sitio público.
+
+``/sitemap.xml`` es un índice de sitemaps que enlaza una sección por
+sitemap (``/sitemap-<sección>.xml``), para poder añadir secciones sin
+superar los límites de un solo archivo. Cada documento se genera una vez
+por proceso (es decir, por despliegue) y se guarda en memoria con sus
+versiones gzip y brotli; los rastreadores reciben siempre el mismo
+documento, con ``ETag`` y ``Last-Modified``. Con ``PAGE_CACHE`` desactivado
+se generan en cada petición.
+"""
+import threading
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
 from django.contrib import sitemaps
+from django.contrib.sitemaps import views as sitemap_views
+from django.http import Http404
+from django.template.loader import get_template
 from django.urls import reverse
 
+from . import pagecache
+
+# Cada cuánto pueden volver los rastreadores y los proxies por el documento.
+SITEMAP_MAX_AGE = 3600
+
+
 class StaticViewSitemap(sitemaps.Sitemap):
-    priority = 0.5
-    changefreq = 'daily'
+    """Páginas informativas: inicio, empresa y servicios (``pagecache.PAGES``)."""
+    changefreq = 'monthly'
 
     def items(self):
-        return ['home']
+        return list(pagecache.PAGES)
 
     def location(self, item):
         return reverse(item)
+
+    def priority(self, item):
+        return 1.0 if item == 'home' else 0.8
+
+    def lastmod(self, item):
+        """Fecha de la plantilla de la página o de ``base.html``, la más reciente."""
+        paths = [get_template(name).origin.name for name in (pagecache.PAGES[item], 'base.html')]
+        return datetime.fromtimestamp(max(Path(path).stat().st_mtime for path in paths), tz=dt_timezone.utc)
+
+
+SITEMAPS = {
+    'static': StaticViewSitemap,
+}
+
+_documents = {}
+_lock = threading.Lock()
+
+
+def sitemap_index(request):
+    """Índice de sitemaps (``/sitemap.xml``)."""
+    return _cached(request, 'index', sitemap_views.index, sitemaps=SITEMAPS, sitemap_url_name='sitemap-section')
+
+
+def sitemap_section(request, section):
+    """Sitemap de una sección (``/sitemap-<sección>.xml``)."""
+    if section not in SITEMAPS:
+        raise Http404(f'No hay un sitemap llamado {section!r}.')
+    return _cached(request, section, sitemap_views.sitemap, sitemaps=SITEMAPS, section=section)
+
+
+def clear():
+    """Olvida los sitemaps en memoria."""
+    with _lock:
+        _documents.clear()
+
+
+def _cached(request, name, view, **kwargs):
+    if not settings.PAGE_CACHE:
+        return view(request, **kwargs)
+    # Las URL del documento llevan el protocolo de la petición; ``p`` es la
+    # página de las secciones con más de 50.000 URL (el índice no la usa).
+    page = '1' if name == 'index' else request.GET.get('p', '1')
+    if not page.isdecimal() or page != str(int(page)):
+        # Solo la forma que enlaza el índice: ``?p=01`` o ``?p=001`` serían
+        # otra entrada en memoria con el mismo documento.
+        raise Http404(f'Página de sitemap no válida: {page!r}.')
+    key = (name, request.scheme, page)
+    document = _documents.get(key)
+    if document is None:
+        response = view(request, **kwargs)
+        response.render()
+        if response.status_code != 200:
+            return response
+        document = (
+            pagecache.Shell(response.content), response['Content-Type'],
+            response.get('Last-Modified'), response.get('X-Robots-Tag'),
+        )
+        with _lock:
+            _documents[key] = document
+    shell, content_type, last_modified, robots = document
+    response = pagecache.shell_response(request, shell, SITEMAP_MAX_AGE, content_type, last_modified)
+    if robots:
+        response['X-Robots-Tag'] = robots
+    return response
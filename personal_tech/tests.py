@@ -0,0 +1,652 @@
+import csv
+import gzip
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
+from django.template import Context, Template
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+
+from accounts.roles import set_role
+from inventory.models import Equipment
+from inventory.serializers import EquipmentSerializer
+from search import backends
+from services.models import Client, Service
+from services.serializers import ClientSerializer, ClientSummarySerializer, ServiceSerializer
+from . import fastread, pagecache, sitemaps
+from .signals import bulk_saved, rows_written
+
+
+class BulkAPITests(TestCase):
+    """Altas, cambios y bajas masivas: modos, unicidad, errores y señales."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        cls.first = Client.objects.create(name='Primero', email='primero@example.com', phone='3000000001')
+        cls.second = Client.objects.create(name='Segundo', email='segundo@example.com', phone='3000000002')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.url = reverse('api-client-bulk')
+        self.signals = []
+        for signal in (bulk_saved, rows_written):
+            signal.connect(self.record, sender=Client)
+            self.addCleanup(signal.disconnect, self.record, sender=Client)
+
+    def record(self, signal, sender, **kwargs):
+        self.signals.append((signal, kwargs))
+
+    def sent(self, signal):
+        return [kwargs for sent, kwargs in self.signals if sent is signal]
+
+    def send(self, method, data, mode=None):
+        url = f'{self.url}?mode={mode}' if mode else self.url
+        return getattr(self.client, method)(url, data, content_type='application/json')
+
+    def new_client(self, i, **values):
+        return {'name': f'Nuevo {i}', 'email': f'nuevo{i}@example.com', 'phone': f'31000000{i:02d}', **values}
+
+    def test_create(self):
+        response = self.send('post', [self.new_client(1), self.new_client(2)])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([item['name'] for item in response.json()['results']], ['Nuevo 1', 'Nuevo 2'])
+        self.assertEqual(response.json()['errors'], [])
+        created = Client.objects.filter(name__startswith='Nuevo')
+        self.assertEqual(created.count(), 2)
+        self.assertEqual(len(self.sent(bulk_saved)[0]['created']), 2)
+        self.assertCountEqual(self.sent(rows_written)[0]['pks'], created.values_list('pk', flat=True))
+        # rows_written mantiene el índice de búsqueda.
+        self.assertEqual(len(backends.search('nuevo', ['client'])), 2)
+
+    def test_atomic_mode_saves_nothing_on_error(self):
+        response = self.send('post', [self.new_client(1), self.new_client(2, email='no-es-correo')])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['results'], [])
+        self.assertEqual([error['index'] for error in response.json()['errors']], [1])
+        self.assertIn('email', response.json()['errors'][0]['errors'])
+        self.assertFalse(Client.objects.filter(name__startswith='Nuevo').exists())
+        self.assertEqual(self.signals, [])
+
+    def test_partial_mode_saves_valid_items(self):
+        response = self.send('post', [self.new_client(1), self.new_client(2, email='no-es-correo')], mode='partial')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual([item['name'] for item in response.json()['results']], ['Nuevo 1'])
+        self.assertEqual(response.json()['errors'][0]['index'], 1)
+        self.assertEqual(list(Client.objects.filter(name__startswith='Nuevo').values_list('name', flat=True)), ['Nuevo 1'])
+
+    def test_partial_mode_without_valid_items(self):
+        response = self.send('post', [self.new_client(1, email='')], mode='partial')
+        self.assertEqual(response.status_code, 400)
+
+    def test_unique_values_are_checked_in_batch_and_database(self):
+        response = self.send('post', [
+            self.new_client(1),
+            self.new_client(2, email='nuevo1@example.com'),
+            self.new_client(3, phone=self.first.phone),
+        ], mode='partial')
+        self.assertEqual(response.status_code, 207)
+        errors = {error['index']: error['errors'] for error in response.json()['errors']}
+        self.assertEqual(errors, {
+            1: {'email': ['Valor repetido en el lote (elemento 0).']},
+            2: {'phone': ['Ya existe un registro con este Teléfono.']},
+        })
+
+    def test_update(self):
+        before = Client.objects.get(pk=self.first.pk).updated_at
+        response = self.send('patch', [{'id': self.first.pk, 'name': 'Cambiado'}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['results'][0]['name'], 'Cambiado')
+        updated = Client.objects.get(pk=self.first.pk)
+        self.assertEqual((updated.name, updated.email), ('Cambiado', 'primero@example.com'))
+        self.assertGreater(updated.updated_at, before)
+        old, new = self.sent(bulk_saved)[0]['updated'][0]
+        self.assertEqual((old.name, new.name), ('Primero', 'Cambiado'))
+        self.assertEqual(list(self.sent(rows_written)[0]['pks']), [self.first.pk])
+
+    def test_update_cannot_take_a_value_released_in_the_same_batch(self):
+        response = self.send('patch', [
+            {'id': self.first.pk, 'phone': self.second.phone},
+            {'id': self.second.pk, 'phone': '3000000009'},
+        ])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], [
+            {'index': 0, 'errors': {'phone': ['Ya existe un registro con este Teléfono.']}},
+        ])
+
+    def test_update_errors(self):
+        response = self.send('patch', [
+            {'name': 'Sin id'},
+            {'id': 999999, 'name': 'No existe'},
+            {'id': self.first.pk, 'email': self.second.email},
+            {'id': self.second.pk, 'name': 'Válido'},
+        ], mode='partial')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json()['errors'], [
+            {'index': 0, 'errors': {'id': ['Este campo es requerido.']}},
+            {'index': 1, 'errors': {'id': ['No existe un objeto con id 999999.']}},
+            {'index': 2, 'errors': {'email': ['Ya existe un registro con este Correo Electrónico.']}},
+        ])
+        self.assertEqual(Client.objects.get(pk=self.second.pk).name, 'Válido')
+
+    def test_delete(self):
+        response = self.send('delete', [self.first.pk, 999999, 'x'])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Client.objects.count(), 2)
+
+        response = self.send('delete', [self.first.pk, 999999, 'x'], mode='partial')
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json()['deleted'], [self.first.pk])
+        self.assertEqual(response.json()['errors'], [
+            {'index': 1, 'errors': {'id': ['No existe un objeto con id 999999.']}},
+            {'index': 2, 'errors': {'id': ['ID no válido: x.']}},
+        ])
+        self.assertEqual(list(Client.objects.values_list('pk', flat=True)), [self.second.pk])
+
+    @override_settings(API_BULK_MAX_ITEMS=2)
+    def test_request_shape_is_validated(self):
+        self.assertEqual(self.send('post', {'name': 'Objeto'}).status_code, 400)
+        self.assertEqual(self.send('post', []).status_code, 400)
+        self.assertEqual(self.send('post', [self.new_client(i) for i in range(3)]).status_code, 400)
+        response = self.send('post', [self.new_client(1)], mode='todo')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('mode', response.json())
+
+    def test_foreign_keys_are_resolved_per_batch(self):
+        items = [{'title': f'Servicio {i}', 'description': 'Descripción', 'client': self.first.pk} for i in range(5)]
+        items.append({'title': 'Sin cliente', 'description': 'Descripción', 'client': 999999})
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                f"{reverse('api-service-bulk')}?mode=partial", items, content_type='application/json',
+            )
+        client_queries = [
+            query for query in queries if query['sql'].startswith('SELECT') and 'FROM "services_client"' in query['sql']
+        ]
+        self.assertEqual(len(client_queries), 1)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json()['errors'][0]['index'], 5)
+        self.assertIn('client', response.json()['errors'][0]['errors'])
+        self.assertEqual(Service.objects.count(), 5)
+
+    def test_dashboard_follows_bulk_writes(self):
+        url = reverse('api-service-bulk')
+        items = [{'title': f'Servicio {i}', 'description': 'Descripción', 'client': self.first.pk} for i in range(3)]
+        created = self.client.post(url, items, content_type='application/json').json()['results']
+        self.client.patch(url, [{'id': created[0]['id'], 'status': 'completed'}], content_type='application/json')
+        self.client.delete(url, [created[1]['id']], content_type='application/json')
+        out = StringIO()
+        call_command('rebuild_dashboard', '--check', stdout=out)
+        self.assertIn('Los contadores coinciden con los datos.', out.getvalue())
+
+
+class RenamedServiceSerializer(serializers.ModelSerializer):
+    """Campos con ``source`` de una columna y formatos propios."""
+    name = serializers.CharField(source='title')
+    owner = serializers.PrimaryKeyRelatedField(source='client', read_only=True)
+    day = serializers.DateField(source='service_date')
+    created = serializers.DateTimeField(source='created_at', format='%d/%m/%Y %H:%M')
+
+    class Meta:
+        model = Service
+        fields = ['id', 'name', 'owner', 'technician', 'status', 'day', 'created', 'updated_at']
+
+
+class FastListTests(TestCase):
+    """La lectura con ``values()`` da la misma salida que el serializador."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        technician = User.objects.create_user('tecnico')
+        for i in range(3):
+            client = Client.objects.create(
+                name=f'Cliente {i}', email=f'cliente{i}@example.com', phone=f'300000000{i}', address='Calle 1',
+            )
+            # Sin técnico ni fecha en el primero: claves foráneas y fechas nulas.
+            Service.objects.create(
+                title=f'Servicio {i}', description='Descripción', client=client,
+                technician=technician if i else None, service_date=date(2026, 1, i + 1) if i else None,
+            )
+            Equipment.objects.create(
+                model=f'Modelo {i}', serial_number=f'SN-{i}', location='Bodega',
+                purchase_date=date(2025, 6, i + 1) if i else None,
+            )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def get(self, name, **params):
+        caches[settings.API_CACHE_ALIAS].clear()
+        response = self.client.get(reverse(name), params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_endpoints_match_serializer(self):
+        for name, params in (
+            ('api-client-list', {}),
+            ('api-client-list', {'fields': 'id,name,created_at'}),
+            ('api-service-list', {}),
+            ('api-service-list', {'ordering': 'created_at'}),
+            ('api-service-list', {'expand': 'client,technician'}),
+            ('api-equipment-list', {}),
+        ):
+            with self.subTest(endpoint=name, **params):
+                fast = self.get(name, **params)
+                with mock.patch.object(fastread, 'compile_rows', return_value=None):
+                    regular = self.get(name, **params)
+                self.assertEqual(fast, regular)
+                self.assertEqual(len(fast['results']), 3)
+
+    def test_list_serializers_use_fast_path(self):
+        for serializer, model in ((ClientSerializer(), Client), (ServiceSerializer(), Service),
+                                  (EquipmentSerializer(), Equipment)):
+            with self.subTest(model=model.__name__):
+                self.assertIsNotNone(fastread.compile_rows(serializer, model))
+
+    def test_compile_rows_matches_serializer(self):
+        queryset = Service.objects.order_by('pk')
+        serializer = RenamedServiceSerializer()
+        columns, build = fastread.compile_rows(serializer, Service)
+        self.assertEqual(
+            build(queryset.values(*columns)), list(RenamedServiceSerializer(queryset, many=True).data),
+        )
+
+    def test_incompatible_fields_use_serializer(self):
+        class MethodSerializer(serializers.ModelSerializer):
+            label = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Service
+                fields = ['id', 'label']
+
+            def get_label(self, service):
+                return service.title
+
+        class NestedSerializer(serializers.ModelSerializer):
+            client = ClientSummarySerializer()
+
+            class Meta:
+                model = Service
+                fields = ['id', 'client']
+
+        class DottedSerializer(serializers.ModelSerializer):
+            client_name = serializers.CharField(source='client.name')
+
+            class Meta:
+                model = Service
+                fields = ['id', 'client_name']
+
+        for serializer_class in (MethodSerializer, NestedSerializer, DottedSerializer):
+            with self.subTest(serializer=serializer_class.__name__):
+                self.assertIsNone(fastread.compile_rows(serializer_class(), Service))
+
+
+class ApiListTests(TestCase):
+    """Paginación por cursor, orden, filtros y campos parciales de los listados de la API."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        cls.technician = User.objects.create_user('tecnico', first_name='Ana', last_name='Pérez')
+        # Nombres repetidos para comprobar el desempate por clave primaria.
+        cls.clients = [
+            Client.objects.create(name=f'Cliente {i % 3}', email=f'cliente{i}@example.com', phone=f'300000000{i}',
+                                  type='contract' if i % 2 else 'punctual')
+            for i in range(8)
+        ]
+        cls.services = [
+            Service.objects.create(title=f'Servicio {i}', description='Revisión.', client=client,
+                                   technician=cls.technician if i % 2 else None,
+                                   status='completed' if i % 2 else 'pending')
+            for i, client in enumerate(cls.clients)
+        ]
+        old = date(2024, 1, 15)
+        Client.objects.filter(pk=cls.clients[0].pk).update(created_at=old)
+        Service.objects.filter(pk=cls.services[0].pk).update(created_at=old)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        caches[settings.API_CACHE_ALIAS].clear()
+
+    def ids(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row['id'] for row in response.json()['results']]
+
+    def walk(self, url, params):
+        pages = []
+        response = self.client.get(url, params).json()
+        while True:
+            pages.append([row['id'] for row in response['results']])
+            self.assertLess(len(pages), 10, 'La paginación no termina')
+            if not response['next']:
+                return pages, response
+            response = self.client.get(response['next']).json()
+
+    def test_next_and_previous_links(self):
+        url = reverse('api-client-list')
+        for ordering in ('', 'name', '-name', 'created_at'):
+            with self.subTest(ordering=ordering):
+                params = {'page_size': 3, **({'ordering': ordering} if ordering else {})}
+                pages, _ = self.walk(url, params)
+                self.assertEqual([len(page) for page in pages], [3, 3, 2])
+                field = ordering.lstrip('-') or 'created_at'
+                descending = ordering.startswith('-') or not ordering
+                prefix = '-' if descending else ''
+                expected = list(Client.objects.order_by(prefix + field, prefix + 'pk').values_list('pk', flat=True))
+                self.assertEqual(sum(pages, []), expected)
+                self.assertIsNone(self.client.get(url, params).json()['previous'])
+
+    def test_previous_links_return_the_same_pages(self):
+        # Con un orden sin valores repetidos (ver personal_tech.pagination).
+        pages, response = self.walk(reverse('api-service-list'), {'page_size': 3})
+        backwards = []
+        while response['previous']:
+            response = self.client.get(response['previous']).json()
+            backwards.insert(0, [row['id'] for row in response['results']])
+        self.assertEqual(backwards, pages[:-1])
+
+    def test_page_size_is_capped(self):
+        with mock.patch('personal_tech.pagination.StandardCursorPagination.max_page_size', 2):
+            self.assertEqual(len(self.ids(reverse('api-client-list'), {'page_size': 100})), 2)
+
+    def test_ordering_restricted_to_ordering_fields(self):
+        default = self.ids(reverse('api-service-list'))
+        self.assertEqual(default, list(Service.objects.order_by('-created_at', '-pk').values_list('pk', flat=True)))
+        # ``title`` no está en ordering_fields de servicios: se ignora.
+        self.assertEqual(self.ids(reverse('api-service-list'), {'ordering': 'title'}), default)
+        self.assertEqual(self.ids(reverse('api-service-list'), {'ordering': 'created_at'}), default[::-1])
+
+    def test_client_filters(self):
+        url = reverse('api-client-list')
+        contract = [client.pk for client in self.clients if client.type == 'contract']
+        self.assertCountEqual(self.ids(url, {'type': 'contract'}), contract)
+        self.assertEqual(self.ids(url, {'created_before': '2024-01-31'}), [self.clients[0].pk])
+        self.assertNotIn(self.clients[0].pk, self.ids(url, {'created_after': '2024-02-01'}))
+
+    def test_service_filters(self):
+        url = reverse('api-service-list')
+        completed = [service.pk for service in self.services if service.status == 'completed']
+        self.assertCountEqual(self.ids(url, {'status': 'completed'}), completed)
+        self.assertCountEqual(self.ids(url, {'technician': self.technician.pk}), completed)
+        self.assertCountEqual(self.ids(url, {'client_type': 'contract'}), completed)
+        self.assertEqual(self.ids(url, {'client': self.clients[2].pk}), [self.services[2].pk])
+        self.assertEqual(self.ids(url, {'created_before': '2024-01-31'}), [self.services[0].pk])
+        response = self.client.get(url, {'status': 'otro'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('status', response.json())
+
+    def test_fields(self):
+        results = self.client.get(reverse('api-service-list'), {'fields': 'id,title'}).json()['results']
+        self.assertEqual(set(results[0]), {'id', 'title'})
+        response = self.client.get(reverse('api-service-list'), {'fields': 'id,nada'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('fields', response.json())
+
+    def test_expand(self):
+        service = self.services[1]
+        response = self.client.get(
+            reverse('api-service-detail', args=[service.pk]), {'fields': 'id,client', 'expand': 'client,technician'},
+        )
+        data = response.json()
+        self.assertEqual(set(data), {'id', 'client', 'technician'})
+        self.assertEqual(data['client'], ClientSummarySerializer(service.client).data)
+        self.assertEqual(data['technician']['id'], self.technician.pk)
+        # Sin expand la relación es la clave primaria.
+        data = self.client.get(reverse('api-service-detail', args=[service.pk]), {'fields': 'client'}).json()
+        self.assertEqual(data, {'client': service.client.pk})
+        response = self.client.get(reverse('api-service-list'), {'expand': 'service'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('expand', response.json())
+
+    def test_writes_ignore_fields(self):
+        response = self.client.patch(
+            reverse('api-service-detail', args=[self.services[0].pk]) + '?fields=id',
+            {'title': 'Nuevo título'}, content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Nuevo título')
+        self.assertIn('description', response.json())
+
+
+class StreamingExportTests(TestCase):
+    """Las exportaciones CSV/NDJSON transmiten todas las filas filtradas, bien escapadas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        cls.tricky = Client.objects.create(
+            name='Pérez, "Ana"', email='ana@example.com', phone='3000000001',
+            address='Calle 1\nPiso 2', type='contract',
+        )
+        cls.plain = Client.objects.create(name='Beto', email='beto@example.com', phone='3000000002')
+        Client.objects.filter(pk=cls.plain.pk).update(created_at=date(2024, 1, 15))
+        cls.service = Service.objects.create(title='Revisión', description='-', client=cls.tricky)
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+        self.url = reverse('api-client-export')
+
+    def export(self, url=None, **params):
+        response = self.client.get(url or self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv(self):
+        response, body = self.export(format='csv')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        stamp = timezone.localtime().strftime('%Y%m%d')
+        self.assertEqual(response['Content-Disposition'], f'attachment; filename="clientes_{stamp}.csv"')
+        rows = list(csv.DictReader(StringIO(body, newline='')))
+        self.assertEqual(list(rows[0]), ['id', 'name', 'email', 'phone', 'company', 'address', 'type',
+                                         'created_at', 'updated_at'])
+        self.assertEqual([int(row['id']) for row in rows], [self.tricky.pk, self.plain.pk])
+        self.assertEqual(rows[0]['name'], 'Pérez, "Ana"')
+        self.assertEqual(rows[0]['address'], 'Calle 1\nPiso 2')
+        self.assertEqual(rows[1]['address'], '')
+        self.tricky.refresh_from_db()
+        self.assertEqual(rows[0]['created_at'], timezone.localtime(self.tricky.created_at).isoformat())
+
+    def test_ndjson(self):
+        for params, headers in (({'format': 'ndjson'}, {}), ({}, {'HTTP_ACCEPT': 'application/x-ndjson'})):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params, **headers)
+                self.assertEqual(response['Content-Type'], 'application/x-ndjson; charset=utf-8')
+                self.assertTrue(response['Content-Disposition'].endswith('.ndjson"'))
+                body = b''.join(response.streaming_content).decode('utf-8')
+                self.assertTrue(body.endswith('\n'))
+                rows = [json.loads(line) for line in body.splitlines()]
+                self.assertEqual(rows[0]['name'], 'Pérez, "Ana"')
+                self.assertEqual(rows[0]['address'], 'Calle 1\nPiso 2')
+                self.assertIn('"Pérez', body)  # ensure_ascii=False
+
+    def test_columns(self):
+        _, body = self.export(format='ndjson', columns='email,id')
+        self.assertEqual(json.loads(body.splitlines()[0]), {'email': 'ana@example.com', 'id': self.tricky.pk})
+        response = self.client.get(self.url, {'format': 'csv', 'columns': 'id,clave'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.content.decode().splitlines()[0], 'campo,error')
+        self.assertIn('clave', response.content.decode())
+
+    def test_filters(self):
+        def ids(url=None, **params):
+            _, body = self.export(url, format='ndjson', columns='id', **params)
+            return [json.loads(line)['id'] for line in body.splitlines()]
+
+        self.assertEqual(ids(type='contract'), [self.tricky.pk])
+        self.assertEqual(ids(until='2024-01-15'), [self.plain.pk])
+        self.assertEqual(ids(since='2024-01-16'), [self.tricky.pk])
+        self.assertEqual(ids(reverse('api-service-export'), client_type='contract'), [self.service.pk])
+        self.assertEqual(ids(reverse('api-service-export'), client=self.plain.pk), [])
+        for params in ({'type': 'otro'}, {'since': '15/01/2024'}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, {'format': 'ndjson', **params})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(params)), json.loads(response.content))
+
+    @override_settings(EXPORT_CHUNK_SIZE=7)
+    def test_many_rows(self):
+        Client.objects.bulk_create([
+            Client(name=f'Cliente {i}', email=f'cliente{i}@example.com', phone=f'31{i:08}') for i in range(450)
+        ])
+        _, body = self.export(format='csv', columns='id')
+        ids = [int(line) for line in body.splitlines()[1:]]
+        self.assertEqual(ids, list(Client.objects.order_by('pk').values_list('pk', flat=True)))
+
+
+class PageCacheTests(TestCase):
+    """Las páginas cacheadas muestran a cada usuario su menú y nunca filtran datos de otro."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.technician = User.objects.create_user('tecnico', first_name='Ana', last_name='Pérez')
+        set_role(cls.technician, 'technician')
+        cls.customer = User.objects.create_user('cliente', first_name='Beto', last_name='Ruiz')
+        set_role(cls.customer, 'client')
+
+    def setUp(self):
+        prerender_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, prerender_dir, ignore_errors=True)
+        override = override_settings(PAGE_CACHE=True, PAGE_PRERENDER_DIR=prerender_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        pagecache.clear()
+        self.addCleanup(pagecache.clear)
+        self.url = reverse('home')
+
+    def get(self, user=None, **headers):
+        if user is None:
+            self.client.logout()
+        else:
+            self.client.force_login(user)
+        response = self.client.get(self.url, **headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Cookie', response['Vary'])
+        return response
+
+    def test_authenticated_users_get_their_own_fragments(self):
+        dashboard_link = f'href="{reverse("dashboard")}"'
+        response = self.get(self.technician)
+        html = response.content.decode()
+        self.assertNotIn('public', response.get('Cache-Control', ''))
+        self.assertIn('Ana Pérez', html)
+        self.assertIn('Cerrar Sesión', html)
+        self.assertIn(dashboard_link, html)
+        self.assertNotIn('Iniciar Sesión', html)
+
+        html = self.get(self.customer).content.decode()
+        self.assertIn('Beto Ruiz', html)
+        self.assertNotIn('Ana Pérez', html)
+        self.assertIn(reverse('service_list'), html)
+        # dashboard_view responde 403 al rol cliente.
+        self.assertNotIn(dashboard_link, html)
+
+    def test_anonymous_page_never_has_user_fragments(self):
+        # La carcasa se crea durante la petición de un usuario autenticado.
+        self.get(self.technician)
+        response = self.get()
+        html = response.content.decode()
+        self.assertEqual(response['Cache-Control'], f'public, max-age={settings.PAGE_CACHE_MAX_AGE}')
+        self.assertIn('Iniciar Sesión', html)
+        for text in ('Ana Pérez', 'Cerrar Sesión', 'Gestión', reverse('dashboard')):
+            self.assertNotIn(text, html)
+
+        response = self.get(HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content).decode(), html)
+        revalidated = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(revalidated.status_code, 304)
+
+
+@override_settings(PAGE_CACHE=True)
+class SitemapTests(TestCase):
+    """Los sitemaps se guardan en memoria una vez por documento."""
+
+    def setUp(self):
+        sitemaps.clear()
+        self.addCleanup(sitemaps.clear)
+
+    def test_non_canonical_pages_are_rejected(self):
+        url = reverse('sitemap-section', args=['static'])
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(self.client.get(url, {'p': '1'}).status_code, 200)
+        for page in ('01', '001', '1.0', '+1', ' 1', 'x'):
+            with self.subTest(p=page):
+                self.assertEqual(self.client.get(url, {'p': page}).status_code, 404)
+        self.assertEqual(self.client.get(url, {'p': '2'}).status_code, 404)
+        self.assertEqual(len(sitemaps._documents), 1)
+
+    def test_index_ignores_page(self):
+        for page in ('1', '01', '2'):
+            self.assertEqual(self.client.get(reverse('sitemap'), {'p': page}).status_code, 200)
+        self.assertEqual(len(sitemaps._documents), 1)
+
+
+class ProdStaticFilesTests(SimpleTestCase):
+    """El perfil prod publica los estáticos con hash y comprimidos, y ``{% static %}`` los resuelve."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        environ = {'SECRET_KEY': 'clave-de-prueba', 'ALLOWED_HOSTS': 'testserver', 'DB_PASSWORD': 'clave'}
+        with mock.patch.dict(os.environ, environ):
+            sys.modules.pop('personal_tech.settings.prod', None)
+            cls.prod = importlib.import_module('personal_tech.settings.prod')
+        sys.modules.pop('personal_tech.settings.prod', None)
+
+        cls.static_root = tempfile.mkdtemp()
+        cls.addClassCleanup(shutil.rmtree, cls.static_root, ignore_errors=True)
+        override = override_settings(
+            STORAGES=cls.prod.STORAGES,
+            WHITENOISE_KEEP_ONLY_HASHED_FILES=cls.prod.WHITENOISE_KEEP_ONLY_HASHED_FILES,
+            STATIC_ROOT=cls.static_root,
+            # Solo los estáticos del proyecto, para que la prueba sea rápida.
+            STATICFILES_FINDERS=['django.contrib.staticfiles.finders.FileSystemFinder'],
+        )
+        override.enable()
+        cls.addClassCleanup(override.disable)
+        call_command('collectstatic', interactive=False, verbosity=0)
+
+    def test_profile(self):
+        self.assertFalse(self.prod.DEBUG)
+        self.assertEqual(self.prod.STORAGES['staticfiles']['BACKEND'],
+                         'whitenoise.storage.CompressedManifestStaticFilesStorage')
+
+    def test_hashed_and_compressed_files(self):
+        with open(os.path.join(self.static_root, 'staticfiles.json')) as manifest:
+            paths = json.load(manifest)['paths']
+        hashed = paths['css/style.css']
+        self.assertRegex(hashed, r'^css/style\.[0-9a-f]{12}\.css$')
+        for suffix in ('', '.gz', '.br'):
+            self.assertTrue(os.path.exists(os.path.join(self.static_root, hashed + suffix)), hashed + suffix)
+        self.assertFalse(os.path.exists(os.path.join(self.static_root, 'css', 'style.css')))
+
+    def test_static_tag_uses_the_manifest(self):
+        html = Template("{% load static %}{% static 'css/style.css' %}").render(Context())
+        self.assertRegex(html, r'^/static/css/style\.[0-9a-f]{12}\.css$')
+        with self.assertRaises(ValueError):
+            Template("{% load static %}{% static 'no-existe.css' %}").render(Context())
+
+    def test_whitenoise_serves_hashed_files(self):
+        url = Template("{% load static %}{% static 'css/style.css' %}").render(Context())
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('immutable', response['Cache-Control'])
+        response.close()
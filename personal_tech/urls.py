@@ -16,16 +16,11 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from django.contrib.sitemaps.views import sitemap
 from django.views.generic.base import TemplateView
 from . import views
-from .sitemaps import StaticViewSitemap
+from .sitemaps import sitemap_index, sitemap_section
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
 
-sitemaps = {
-    'static': StaticViewSitemap,
-}
-
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('accounts/', include('django.contrib.auth.urls')),
@@ -45,7 +40,9 @@ urlpatterns = [
     path('inventory/', include('inventory.urls')),
     path('quotes/', include('quotes.urls')),
     path('reports/', include('reports.urls')),
-    path('sitemap.xml', sitemap, {'sitemaps': sitemaps}, name='django.contrib.sitemaps.views.sitemap'),
+    path('search/', include('search.urls')),
+    path('sitemap.xml', sitemap_index, name='sitemap'),
+    path('sitemap-<section>.xml', sitemap_section, name='sitemap-section'),
     path('robots.txt', TemplateView.as_view(template_name="robots.txt", content_type="text/plain")),
     path('api/schema/', SpectacularAPIView.as_view(), name='schema'),
     path('api/schema/swagger/', SpectacularSwaggerView.as_view(url_name='schema'), name='swagger-ui'),
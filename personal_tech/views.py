@@ -1,32 +1,35 @@
-from django.shortcuts import render
+from . import pagecache
+
+# Páginas informativas: se sirven desde la caché de página completa
+# (personal_tech.pagecache); las plantillas están en pagecache.PAGES.
 
 def home(request):
-    return render(request, 'home.html')
+    return pagecache.serve(request, 'home')
 
 def about(request):
-    return render(request, 'company/about.html')
+    return pagecache.serve(request, 'about')
 
 def history(request):
-    return render(request, 'company/history.html')
+    return pagecache.serve(request, 'history')
 
 def team(request):
-    return render(request, 'company/team.html')
+    return pagecache.serve(request, 'team')
 
 # Service Pages
 def service_support(request):
-    return render(request, 'services_pages/support.html')
+    return pagecache.serve(request, 'service_support')
 
 def service_development(request):
-    return render(request, 'services_pages/development.html')
+    return pagecache.serve(request, 'service_development')
 
 def service_networks(request):
-    return render(request, 'services_pages/networks.html')
+    return pagecache.serve(request, 'service_networks')
 
 def service_cloud(request):
-    return render(request, 'services_pages/cloud.html')
+    return pagecache.serve(request, 'service_cloud')
 
 def service_security(request):
-    return render(request, 'services_pages/security.html')
+    return pagecache.serve(request, 'service_security')
 
 def service_consulting(request):
-    return render(request, 'services_pages/consulting.html')
\ No newline at end of file
+    return pagecache.serve(request, 'service_consulting')
\ No newline at end of file
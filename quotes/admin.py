@@ -1,4 +1,14 @@
 from django.contrib import admin
+from search.admin import IndexedSearchAdminMixin
 from .models import Quote
 
-admin.site.register(Quote)
+@admin.register(Quote)
+class QuoteAdmin(IndexedSearchAdminMixin, admin.ModelAdmin):
+    """
+    Configuración del admin para el modelo Quote.
+    """
+    list_display = ('client_name', 'client_email', 'client_phone', 'estimated_cost', 'status', 'created_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('client_name', 'client_email', 'client_phone', 'description')
+    search_kind = 'quote'
+    ordering = ('-created_at',)
@@ -1,15 +1,19 @@
 from rest_framework import generics, permissions
 from .models import Quote
+from .filters import QuoteFilter
 from .serializers import QuoteSerializer
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter
+from personal_tech.conditional import ConditionalGetMixin
+from personal_tech.fieldsets import DYNAMIC_FIELDS_PARAMETERS, DynamicFieldsViewMixin
+from personal_tech.exports import EXPORT_PARAMETERS, EXPORT_RESPONSES, StreamingExportAPIView
 
+@extend_schema_view(get=extend_schema(parameters=DYNAMIC_FIELDS_PARAMETERS))
 @extend_schema(
     tags=['Cotizaciones'],
     summary='Listar y crear cotizaciones',
     description='Obtiene una lista de todas las cotizaciones o registra una nueva solicitud.',
-    responses={200: QuoteSerializer(many=True), 201: QuoteSerializer}
 )
-class QuoteListCreateAPIView(generics.ListCreateAPIView):
+class QuoteListCreateAPIView(ConditionalGetMixin, DynamicFieldsViewMixin, generics.ListCreateAPIView):
     """
     Vista de API para listar y crear cotizaciones.
     
@@ -22,6 +26,9 @@ class QuoteListCreateAPIView(generics.ListCreateAPIView):
     queryset = Quote.objects.all()
     serializer_class = QuoteSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering = ('-created_at', '-pk')
+    filterset_class = QuoteFilter
+    ordering_fields = ['created_at']
 
 @extend_schema(
     tags=['Cotizaciones'],
@@ -29,7 +36,7 @@ class QuoteListCreateAPIView(generics.ListCreateAPIView):
     description='Operaciones CRUD sobre una cotización específica.',
     responses={200: QuoteSerializer, 204: None}
 )
-class QuoteRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class QuoteRetrieveUpdateDestroyAPIView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vista de API para gestionar una cotización específica.
     
@@ -48,3 +55,35 @@ class QuoteRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     queryset = Quote.objects.all()
     serializer_class = QuoteSerializer
     permission_classes = [permissions.IsAuthenticated]
+
+@extend_schema(
+    tags=['Cotizaciones'],
+    summary='Exportar cotizaciones (CSV/NDJSON)',
+    description='Descarga en streaming todas las cotizaciones que cumplen los filtros, sin paginar.',
+    parameters=EXPORT_PARAMETERS + [
+        OpenApiParameter('status', str, enum=[value for value, _ in Quote.STATUS_CHOICES]),
+    ],
+    responses=EXPORT_RESPONSES,
+)
+class QuoteExportAPIView(StreamingExportAPIView):
+    """
+    Exporta las cotizaciones en CSV o NDJSON.
+    
+    get:
+    Transmite una fila por cotización; admite ``columns``, ``status``, ``since`` y ``until``.
+    """
+    queryset = Quote.objects.all()
+    export_fields = {
+        'id': 'id',
+        'client_name': 'client_name',
+        'client_email': 'client_email',
+        'client_phone': 'client_phone',
+        'description': 'description',
+        'estimated_cost': 'estimated_cost',
+        'status': 'status',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    filter_fields = {'status': 'status'}
+    date_field = 'created_at'
+    filename = 'cotizaciones'
@@ -0,0 +1,15 @@
+import django_filters
+from .models import Quote
+
+
+class QuoteFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de cotizaciones de la API.
+
+    ``created_after``/``created_before`` filtran por fecha de creación.
+    """
+    created = django_filters.DateFromToRangeFilter(field_name='created_at', label='Fecha de creación')
+
+    class Meta:
+        model = Quote
+        fields = ['status']
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0002_alter_quote_options_alter_quote_client_email_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['-created_at', '-id'], name='quote_created_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0003_quote_created_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='quote_status_created_idx'),
+        ),
+    ]
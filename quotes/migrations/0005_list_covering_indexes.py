@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('quotes', '0004_quote_status_created_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='quote',
+            name='quote_created_idx',
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['-created_at', '-id'], include=('client_name', 'client_email', 'client_phone', 'estimated_cost', 'status', 'updated_at'), name='quote_created_idx'),
+        ),
+    ]
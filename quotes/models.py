@@ -1,5 +1,12 @@
 from django.db import models
 from django.utils.translation import gettext_lazy as _
+from personal_tech.response_cache import VersionedManager
+
+# Columnas del listado de la API pedido con ``?fields=``, sin ``description``; el índice del
+# orden por defecto las incluye (INCLUDE) para permitir index-only scans.
+QUOTE_LIST_FIELDS = (
+    'client_name', 'client_email', 'client_phone', 'estimated_cost', 'status', 'created_at', 'updated_at',
+)
 
 class Quote(models.Model):
     """
@@ -23,9 +30,19 @@ class Quote(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
 
+    # Avisa de las escrituras masivas (índice de búsqueda, caché de la API).
+    objects = VersionedManager()
+
     class Meta:
         verbose_name = "Cotización"
         verbose_name_plural = "Cotizaciones"
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'], name='quote_created_idx',
+                include=['client_name', 'client_email', 'client_phone', 'estimated_cost', 'status', 'updated_at'],
+            ),
+            models.Index(fields=['status', '-created_at', '-id'], name='quote_status_created_idx'),
+        ]
 
     def __str__(self):
         """Devuelve una representación legible de la cotización."""
@@ -1,11 +1,13 @@
 from rest_framework import serializers
+from personal_tech.fieldsets import DynamicFieldsSerializerMixin
 from .models import Quote
 
-class QuoteSerializer(serializers.ModelSerializer):
+class QuoteSerializer(DynamicFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Quote.
     
     Maneja la conversión de datos de cotizaciones a JSON y viceversa.
+    En lectura admite ``?fields=``.
     """
     class Meta:
         model = Quote
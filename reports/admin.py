@@ -1,4 +1,11 @@
 from django.contrib import admin
-from .models import Report
+from .models import Report, DashboardCounter
 
 admin.site.register(Report)
+
+
+@admin.register(DashboardCounter)
+class DashboardCounterAdmin(admin.ModelAdmin):
+    list_display = ('metric', 'status', 'period', 'technician_id', 'count', 'amount', 'updated_at')
+    list_filter = ('metric',)
+    readonly_fields = ('metric', 'status', 'period', 'technician_id', 'count', 'amount', 'updated_at')
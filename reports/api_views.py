@@ -1,15 +1,16 @@
 from rest_framework import generics, permissions
 from .models import Report
 from .serializers import ReportSerializer
-from drf_spectacular.utils import extend_schema
+from drf_spectacular.utils import extend_schema, extend_schema_view
+from personal_tech.fieldsets import DYNAMIC_FIELDS_PARAMETERS, DynamicFieldsViewMixin
 
+@extend_schema_view(get=extend_schema(parameters=DYNAMIC_FIELDS_PARAMETERS))
 @extend_schema(
     tags=['Reportes Generales'],
     summary='Listar y crear reportes generales',
     description='Obtiene una lista de todos los reportes generales o crea uno nuevo.',
-    responses={200: ReportSerializer(many=True), 201: ReportSerializer}
 )
-class ReportListCreateAPIView(generics.ListCreateAPIView):
+class ReportListCreateAPIView(DynamicFieldsViewMixin, generics.ListCreateAPIView):
     """
     Vista de API para listar y crear reportes generales.
     
@@ -22,6 +23,7 @@ class ReportListCreateAPIView(generics.ListCreateAPIView):
     queryset = Report.objects.all()
     serializer_class = ReportSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering = '-pk'
 
 @extend_schema(
     tags=['Reportes Generales'],
@@ -0,0 +1,230 @@
+"""
+Agregados de los dashboards mantenidos de forma incremental.
+
+Cada servicio, reporte técnico o cotización aporta una unidad a un conjunto
+de contadores (``contributions``). Al guardarse se compara lo que aportaba
+antes (leído en ``pre_save``) con lo que aporta ahora y solo se aplica la
+diferencia; al borrarse se resta su aporte. Así los dashboards leen unas
+pocas filas de ``DashboardCounter`` en lugar de recorrer las tablas.
+
+Las escrituras masivas (``QuerySet.update``, ``bulk_create`` y
+``bulk_update``, incluidas las de la API en ``personal_tech.bulk``) pasan por
+``VersionedManager``, que avisa con ``rows_writing`` antes de escribir y con
+``rows_written`` después: se leen los valores guardados de esas filas en los
+dos momentos (``stored_rows``) y se aplica la diferencia. Solo esas señales
+actualizan los contadores en las escrituras masivas; ``bulk_saved`` no, para
+no contar dos veces los lotes de la API. Lo que no pasa por el manager
+(``loaddata``, SQL directo) no los actualiza: después se debe ejecutar
+``rebuild_dashboard``, que los recalcula desde cero.
+"""
+import logging
+from collections import defaultdict, namedtuple
+from decimal import Decimal
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, DecimalField, F, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+
+from quotes.models import Quote
+from services.models import Service, TechnicalReport
+from .models import DashboardCounter
+
+logger = logging.getLogger(__name__)
+
+Key = namedtuple('Key', ['metric', 'status', 'period', 'technician_id'], defaults=['', '', 0])
+
+# Campos de cada modelo de los que dependen sus aportes.
+TRACKED_FIELDS = {
+    Service: ['status', 'technician_id', 'created_at'],
+    TechnicalReport: ['status', 'technician_id', 'date'],
+    Quote: ['status', 'estimated_cost'],
+}
+
+ZERO = Decimal('0')
+
+
+def _period(value):
+    return timezone.localtime(value).strftime('%Y-%m') if value else ''
+
+
+def contributions(model, values):
+    """
+    Contadores a los que aporta una fila y el monto que suma en cada uno.
+
+    Args:
+        model: Service, TechnicalReport o Quote.
+        values (dict): Valores de ``TRACKED_FIELDS[model]``.
+
+    Returns:
+        dict: ``Key`` → monto (cada fila suma además 1 a la cantidad).
+    """
+    if model is Service:
+        return {
+            Key('services_by_status', status=values['status']): ZERO,
+            Key('services_by_month', period=_period(values['created_at'])): ZERO,
+            Key('technician_services', status=values['status'], technician_id=values['technician_id'] or 0): ZERO,
+        }
+    if model is TechnicalReport:
+        if values['status'] != 'final':
+            return {}
+        return {
+            Key('reports_final_by_month', period=_period(values['date']),
+                technician_id=values['technician_id'] or 0): ZERO,
+        }
+    if model is Quote:
+        # El monto puede llegar como float (p. ej. ``Quote(estimated_cost=2500.0)``
+        # antes de releerse de la base de datos); se suma como Decimal.
+        amount = Quote._meta.get_field('estimated_cost').to_python(values['estimated_cost'])
+        return {Key('quotes_by_status', status=values['status']): amount or ZERO}
+    return {}
+
+
+def current_values(instance):
+    """Valores de los campos seguidos tal como están en memoria."""
+    return {field: getattr(instance, field) for field in TRACKED_FIELDS[type(instance)]}
+
+
+def stored_values(instance):
+    """Valores de los campos seguidos tal como están en la base de datos (o None)."""
+    if instance.pk is None:
+        return None
+    model = type(instance)
+    return model._default_manager.filter(pk=instance.pk).values(*TRACKED_FIELDS[model]).first()
+
+
+def stored_rows(model, pks):
+    """
+    Valores guardados de los campos seguidos de varias filas, con una consulta.
+
+    Returns:
+        dict: Clave primaria → valores (las filas que no existen no aparecen).
+    """
+    rows = model._default_manager.filter(pk__in=pks).values('pk', *TRACKED_FIELDS[model])
+    return {row.pop('pk'): row for row in rows}
+
+
+def apply_change(model, before, after):
+    """
+    Aplica a los contadores la diferencia entre dos estados de una fila.
+
+    Args:
+        model: Modelo de la fila.
+        before (dict): Valores anteriores, o None si la fila es nueva.
+        after (dict): Valores nuevos, o None si la fila se borró.
+    """
+    apply_changes(model, [(before, after)])
+
+
+def apply_changes(model, changes):
+    """
+    Aplica de una vez los cambios de varias filas (p. ej. de un ``bulk_create``).
+
+    Las diferencias se suman por contador antes de escribir, así que el
+    número de consultas depende de los contadores afectados y no de las filas.
+
+    Args:
+        model: Modelo de las filas.
+        changes: Pares (antes, después) como en ``apply_change``.
+    """
+    deltas = defaultdict(lambda: [0, ZERO])
+    for before, after in changes:
+        for key, amount in contributions(model, before).items() if before else ():
+            deltas[key][0] -= 1
+            deltas[key][1] -= amount
+        for key, amount in contributions(model, after).items() if after else ():
+            deltas[key][0] += 1
+            deltas[key][1] += amount
+    for key, (count, amount) in deltas.items():
+        if count or amount:
+            _increment(key, count, amount)
+
+
+def _increment(key, count, amount):
+    lookup = key._asdict()
+    changes = {'count': F('count') + count, 'amount': F('amount') + amount, 'updated_at': timezone.now()}
+    if DashboardCounter.objects.filter(**lookup).update(**changes):
+        return
+    if count < 0:
+        logger.warning('Contador del dashboard inexistente al restar: %s. Ejecute rebuild_dashboard.', key)
+        return
+    try:
+        with transaction.atomic():
+            DashboardCounter.objects.create(**lookup, count=count, amount=amount)
+    except IntegrityError:
+        # Otro proceso creó la fila entre el UPDATE y el INSERT.
+        DashboardCounter.objects.filter(**lookup).update(**changes)
+
+
+def compute_all():
+    """
+    Calcula todos los contadores con consultas de agregación.
+
+    Returns:
+        dict: ``Key`` → [cantidad, monto].
+    """
+    totals = defaultdict(lambda: [0, ZERO])
+    services = (
+        Service.objects.annotate(month=TruncMonth('created_at'))
+        .values_list('status', 'technician_id', 'month')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    for status, technician_id, month, n in services:
+        for key in contributions(Service, {'status': status, 'technician_id': technician_id, 'created_at': month}):
+            totals[key][0] += n
+
+    reports = (
+        TechnicalReport.objects.filter(status='final')
+        .annotate(month=TruncMonth('date'))
+        .values_list('technician_id', 'month')
+        .annotate(n=Count('id'))
+        .order_by()
+    )
+    for technician_id, month, n in reports:
+        key = Key('reports_final_by_month', period=_period(month), technician_id=technician_id or 0)
+        totals[key][0] += n
+
+    amount = Coalesce(Sum('estimated_cost'), Value(ZERO), output_field=DecimalField(max_digits=14, decimal_places=2))
+    quotes = Quote.objects.values_list('status').annotate(n=Count('id'), total=amount).order_by()
+    for status, n, total in quotes:
+        totals[Key('quotes_by_status', status=status)] = [n, total]
+    return totals
+
+
+def rebuild():
+    """
+    Reemplaza todos los contadores por los calculados con ``compute_all``.
+
+    Returns:
+        int: Número de contadores escritos.
+    """
+    counters = [
+        DashboardCounter(**key._asdict(), count=count, amount=amount)
+        for key, (count, amount) in compute_all().items()
+    ]
+    with transaction.atomic():
+        DashboardCounter.objects.all().delete()
+        DashboardCounter.objects.bulk_create(counters)
+    return len(counters)
+
+
+def read(technician_id=None):
+    """
+    Lee de una vez los contadores que muestran los dashboards.
+
+    Args:
+        technician_id (int): Si se indica, solo las métricas de ese técnico.
+
+    Returns:
+        dict: Métrica → lista de ``DashboardCounter`` con cantidad positiva.
+    """
+    counters = DashboardCounter.objects.filter(count__gt=0)
+    if technician_id is not None:
+        counters = counters.filter(
+            metric__in=['technician_services', 'reports_final_by_month'], technician_id=technician_id,
+        )
+    grouped = defaultdict(list)
+    for counter in counters.order_by('metric', 'period', 'status', 'technician_id'):
+        grouped[counter.metric].append(counter)
+    return grouped
@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from reports import dashboard
+from reports.models import DashboardCounter
+
+
+class Command(BaseCommand):
+    help = 'Recalcula desde cero los contadores de los dashboards (DashboardCounter)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true',
+                            help='Solo comparar los contadores guardados con los recalculados, sin escribir.')
+
+    def handle(self, *args, **options):
+        if not options['check']:
+            written = dashboard.rebuild()
+            self.stdout.write(self.style.SUCCESS(f'Dashboard reconstruido: {written} contadores.'))
+            return
+
+        expected = {key: (count, amount) for key, (count, amount) in dashboard.compute_all().items() if count}
+        stored = {
+            dashboard.Key(counter.metric, counter.status, counter.period, counter.technician_id): (counter.count, counter.amount)
+            for counter in DashboardCounter.objects.filter(count__gt=0)
+        }
+        differences = sorted(key for key in expected.keys() | stored.keys() if expected.get(key) != stored.get(key))
+        for key in differences:
+            self.stdout.write(f'{tuple(key)}: guardado {stored.get(key)}, calculado {expected.get(key)}')
+        if differences:
+            self.stdout.write(self.style.WARNING(f'{len(differences)} contadores desactualizados; ejecute rebuild_dashboard.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('Los contadores coinciden con los datos.'))
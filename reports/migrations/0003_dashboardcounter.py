@@ -0,0 +1,31 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reports', '0002_alter_report_options_alter_report_content_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('metric', models.CharField(choices=[('services_by_status', 'Servicios por estado'), ('services_by_month', 'Servicios creados por mes'), ('technician_services', 'Servicios por técnico y estado'), ('reports_final_by_month', 'Reportes finalizados por mes y técnico'), ('quotes_by_status', 'Cotizaciones por estado')], max_length=40, verbose_name='Métrica')),
+                ('status', models.CharField(blank=True, default='', max_length=20, verbose_name='Estado')),
+                ('period', models.CharField(blank=True, default='', max_length=7, verbose_name='Periodo (AAAA-MM)')),
+                ('technician_id', models.IntegerField(default=0, verbose_name='ID del Técnico')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Cantidad')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Monto')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última Actualización')),
+            ],
+            options={
+                'verbose_name': 'Contador del Dashboard',
+                'verbose_name_plural': 'Contadores del Dashboard',
+                'constraints': [models.UniqueConstraint(fields=('metric', 'status', 'period', 'technician_id'), name='dashboard_counter_key')],
+            },
+        ),
+    ]
@@ -18,3 +18,40 @@ class Report(models.Model):
     def __str__(self):
         """Devuelve el título del reporte."""
         return self.title
+
+
+class DashboardCounter(models.Model):
+    """
+    Agregado precalculado para los dashboards (HU-017/HU-018).
+
+    Cada fila es el contador de una métrica para una combinación de
+    dimensiones; las dimensiones que no aplican a la métrica quedan en ''
+    o 0. ``reports.dashboard`` lo actualiza en cada alta, cambio o baja de
+    servicios, reportes técnicos y cotizaciones, y el comando
+    ``rebuild_dashboard`` lo reconstruye desde cero.
+    """
+    METRIC_CHOICES = [
+        ('services_by_status', 'Servicios por estado'),
+        ('services_by_month', 'Servicios creados por mes'),
+        ('technician_services', 'Servicios por técnico y estado'),
+        ('reports_final_by_month', 'Reportes finalizados por mes y técnico'),
+        ('quotes_by_status', 'Cotizaciones por estado'),
+    ]
+    metric = models.CharField(max_length=40, choices=METRIC_CHOICES, verbose_name="Métrica")
+    status = models.CharField(max_length=20, blank=True, default='', verbose_name="Estado")
+    period = models.CharField(max_length=7, blank=True, default='', verbose_name="Periodo (AAAA-MM)")
+    technician_id = models.IntegerField(default=0, verbose_name="ID del Técnico")
+    count = models.BigIntegerField(default=0, verbose_name="Cantidad")
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name="Monto")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
+
+    class Meta:
+        verbose_name = "Contador del Dashboard"
+        verbose_name_plural = "Contadores del Dashboard"
+        constraints = [
+            models.UniqueConstraint(fields=['metric', 'status', 'period', 'technician_id'], name='dashboard_counter_key'),
+        ]
+
+    def __str__(self):
+        """Devuelve la métrica, sus dimensiones y el valor."""
+        return f'{self.metric} [{self.status}|{self.period}|{self.technician_id}] = {self.count}'
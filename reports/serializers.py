@@ -1,11 +1,13 @@
 from rest_framework import serializers
+from personal_tech.fieldsets import DynamicFieldsSerializerMixin
 from .models import Report
 
-class ReportSerializer(serializers.ModelSerializer):
+class ReportSerializer(DynamicFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Report.
     
     Maneja la conversión de datos de reportes generales a JSON y viceversa.
+    En lectura admite ``?fields=``.
     """
     class Meta:
         model = Report
@@ -0,0 +1,47 @@
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+from personal_tech.signals import rows_writing, rows_written
+from quotes.models import Quote
+from services.models import Service, TechnicalReport
+from . import dashboard
+
+
+@receiver(pre_save, sender=Service)
+@receiver(pre_save, sender=TechnicalReport)
+@receiver(pre_save, sender=Quote)
+def remember_dashboard_values(sender, instance, raw=False, **kwargs):
+    if not raw:
+        instance._dashboard_before = dashboard.stored_values(instance)
+
+
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=TechnicalReport)
+@receiver(post_save, sender=Quote)
+def update_dashboard_on_save(sender, instance, raw=False, **kwargs):
+    if not raw:
+        dashboard.apply_change(sender, getattr(instance, '_dashboard_before', None), dashboard.current_values(instance))
+
+
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=TechnicalReport)
+@receiver(post_delete, sender=Quote)
+def update_dashboard_on_delete(sender, instance, **kwargs):
+    dashboard.apply_change(sender, dashboard.current_values(instance), None)
+
+
+# update(), bulk_create() y bulk_update() (incluida la API masiva) a través
+# de VersionedManager.
+@receiver(rows_writing, sender=Service)
+@receiver(rows_writing, sender=TechnicalReport)
+@receiver(rows_writing, sender=Quote)
+def remember_dashboard_rows(sender, pks, state, **kwargs):
+    state['dashboard'] = dashboard.stored_rows(sender, pks)
+
+
+@receiver(rows_written, sender=Service)
+@receiver(rows_written, sender=TechnicalReport)
+@receiver(rows_written, sender=Quote)
+def update_dashboard_on_rows_written(sender, pks, state, **kwargs):
+    before = state.get('dashboard', {})
+    after = dashboard.stored_rows(sender, pks)
+    dashboard.apply_changes(sender, [(before.get(pk), after.get(pk)) for pk in pks])
@@ -1,3 +1,57 @@
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
 from django.test import TestCase
 
-# Create your tests here.
+from quotes.models import Quote
+from services.models import Client, Service
+from .models import DashboardCounter
+
+
+class DashboardCounterTests(TestCase):
+    """Los contadores incrementales coinciden con los recalculados."""
+
+    def check_output(self):
+        out = StringIO()
+        call_command('rebuild_dashboard', '--check', stdout=out)
+        return out.getvalue()
+
+    def test_float_estimated_cost(self):
+        quote = Quote.objects.create(
+            client_name='Ana López', client_email='ana@example.com', client_phone='3007890123',
+            description='Respaldo en la nube.', estimated_cost=2500000.00, status='sent',
+        )
+        counter = DashboardCounter.objects.get(metric='quotes_by_status', status='sent')
+        self.assertEqual((counter.count, counter.amount), (1, Decimal('2500000.00')))
+
+        quote.estimated_cost = 1500.50
+        quote.status = 'accepted'
+        quote.save()
+        quote.delete()
+        Quote.objects.create(
+            client_name='Roberto Martínez', client_email='roberto@example.com', client_phone='3008901234',
+            description='Red para oficina.', estimated_cost=800000.00, status='pending',
+        )
+        self.assertIn('Los contadores coinciden con los datos.', self.check_output())
+
+    def test_queryset_writes(self):
+        client = Client.objects.create(name='Ana López', email='ana@example.com', phone='3007890123')
+        quotes = Quote.objects.bulk_create([
+            Quote(client_name=client.name, client_email=client.email, client_phone=client.phone,
+                  description=f'Cotización {n}.', estimated_cost=1000 * n, status='pending')
+            for n in range(1, 4)
+        ])
+        Quote.objects.filter(pk__in=[quotes[0].pk, quotes[1].pk]).update(status='accepted')
+        services = [
+            Service.objects.create(title=f'Servicio {n}', description='Revisión.', client=client)
+            for n in range(2)
+        ]
+        for service in services:
+            service.status = 'completed'
+        Service.objects.bulk_update(services, ['status'])
+
+        counter = DashboardCounter.objects.get(metric='quotes_by_status', status='accepted')
+        self.assertEqual((counter.count, counter.amount), (2, Decimal('3000')))
+        self.assertEqual(DashboardCounter.objects.get(metric='services_by_status', status='completed').count, 2)
+        self.assertIn('Los contadores coinciden con los datos.', self.check_output())
@@ -1,7 +1,8 @@
 from django.urls import path
-from . import api_views
+from . import api_views, views
 
 urlpatterns = [
+    path('dashboard/', views.dashboard_view, name='dashboard'),
     path('api/general-reports/', api_views.ReportListCreateAPIView.as_view(), name='api-general-report-list'),
     path('api/general-reports/<int:pk>/', api_views.ReportRetrieveUpdateDestroyAPIView.as_view(), name='api-general-report-detail'),
 ]
@@ -1,3 +1,113 @@
+from collections import defaultdict
+from datetime import date
+
+from accounts.roles import effective_role
+from django.contrib.auth.decorators import login_required
+from django.contrib.auth.models import User
+from django.core.exceptions import PermissionDenied
 from django.shortcuts import render
+from django.utils import timezone
+from personal_tech.query_budget import query_budget
+from quotes.models import Quote
+from services.models import Service
+from . import dashboard
+
+DASHBOARD_MONTHS = 12
+
+
+def _last_months(count):
+    """Periodos 'AAAA-MM' de los últimos ``count`` meses, del más antiguo al actual."""
+    today = timezone.localdate()
+    months = []
+    year, month = today.year, today.month
+    for _ in range(count):
+        months.append(f'{year:04d}-{month:02d}')
+        year, month = (year, month - 1) if month > 1 else (year - 1, 12)
+    return months[::-1]
+
+
+def _by_month(counters):
+    """Suma los contadores por periodo para los últimos ``DASHBOARD_MONTHS`` meses."""
+    totals = defaultdict(int)
+    for counter in counters:
+        totals[counter.period] += counter.count
+    return [
+        {'period': date(int(period[:4]), int(period[5:]), 1), 'count': totals[period]}
+        for period in _last_months(DASHBOARD_MONTHS)
+    ]
+
+
+def _by_status(counters, choices):
+    """Suma los contadores por estado, en el orden de ``choices``."""
+    totals = defaultdict(int)
+    for counter in counters:
+        totals[counter.status] += counter.count
+    return [{'status': value, 'label': label, 'count': totals[value]} for value, label in choices]
+
+
+@login_required
+@query_budget(6)
+def dashboard_view(request):
+    """
+    Dashboard de métricas (HU-017 para administradores, HU-018 para técnicos).
+
+    Todas las cifras salen de ``DashboardCounter``, que se mantiene al día
+    con cada cambio; la página no recorre las tablas de servicios, reportes
+    ni cotizaciones.
+
+    Args:
+        request: Objeto HttpRequest.
+
+    Returns:
+        HttpResponse: El dashboard general o el personal del técnico.
+    """
+    user = request.user
+    role = effective_role(user)
+    if role not in ('admin', 'technician'):
+        raise PermissionDenied
+
+    if role == 'technician':
+        counters = dashboard.read(technician_id=user.pk)
+        context = {
+            'personal': True,
+            'services_by_status': _by_status(counters['technician_services'], Service.STATUS_CHOICES),
+            'reports_by_month': _by_month(counters['reports_final_by_month']),
+        }
+        return render(request, 'reports/dashboard.html', context)
+
+    counters = dashboard.read()
+    workload = defaultdict(dict)
+    for counter in counters['technician_services']:
+        workload[counter.technician_id][counter.status] = counter.count
+    technicians = User.objects.in_bulk([technician_id for technician_id in workload if technician_id])
+    workload_rows = [
+        {
+            'technician': technicians.get(technician_id),
+            'statuses': [statuses.get(value, 0) for value, _ in Service.STATUS_CHOICES],
+            'total': sum(statuses.values()),
+        }
+        for technician_id, statuses in workload.items()
+    ]
+    workload_rows.sort(key=lambda row: -row['total'])
 
-# Create your views here.
+    quotes = {counter.status: counter for counter in counters['quotes_by_status']}
+    quote_rows = [
+        {
+            'status': value,
+            'label': label,
+            'count': quotes[value].count if value in quotes else 0,
+            'amount': quotes[value].amount if value in quotes else 0,
+        }
+        for value, label in Quote.STATUS_CHOICES
+    ]
+    context = {
+        'personal': False,
+        'services_by_status': _by_status(counters['services_by_status'], Service.STATUS_CHOICES),
+        'services_by_month': _by_month(counters['services_by_month']),
+        'reports_by_month': _by_month(counters['reports_final_by_month']),
+        'status_labels': [label for _, label in Service.STATUS_CHOICES],
+        'workload': workload_rows,
+        'quotes': quote_rows,
+        'quote_pipeline': sum(row['amount'] for row in quote_rows if row['status'] in ('pending', 'sent')),
+    }
+    return render(request, 'reports/dashboard.html', context)
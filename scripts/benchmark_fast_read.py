@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""
+Compara el camino normal de DRF con la lectura rápida (personal_tech.fastread).
+
+Crea filas de prueba dentro de una transacción que se revierte al final,
+serializa el mismo queryset por los dos caminos, verifica que el JSON
+resultante es idéntico byte a byte y muestra los tiempos.
+
+Uso:
+    python scripts/benchmark_fast_read.py [--rows 10000] [--repeat 3]
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# Agregar el directorio del proyecto al path
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.append(str(BASE_DIR))
+
+# Configurar Django
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'personal_tech.settings')
+
+import django
+django.setup()
+
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from inventory.models import Equipment
+from inventory.serializers import EquipmentSerializer
+from personal_tech.fastread import compile_rows
+from personal_tech.renderers import FastJSONRenderer
+from services.models import Client, Service
+from services.serializers import ClientSerializer, ServiceSerializer
+
+
+class Rollback(Exception):
+    """Se lanza para revertir los datos de prueba."""
+
+
+def create_rows(count):
+    """Crea ``count`` clientes, servicios y equipos de prueba."""
+    clients = Client.objects.bulk_create([
+        Client(
+            name=f'Cliente {i}', email=f'bench{i}@example.com', phone=f'+57 300{i:07d}',
+            company='Benchmark S.A.S.', address=f'Calle {i} # 10-20', type='contract' if i % 3 else 'punctual',
+        )
+        for i in range(count)
+    ], batch_size=1000)
+    Service.objects.bulk_create([
+        Service(
+            title=f'Servicio {i}', description='Revisión preventiva de equipos y red.',
+            client=clients[i % len(clients)], status='pending', service_date=date.today() - timedelta(days=i % 90),
+        )
+        for i in range(count)
+    ], batch_size=1000)
+    Equipment.objects.bulk_create([
+        Equipment(
+            model='Laptop Dell Latitude', serial_number=f'BENCH-{i:06d}', description='Equipo de prueba',
+            location='Bodega', purchase_date=date.today() - timedelta(days=i % 700),
+        )
+        for i in range(count)
+    ], batch_size=1000)
+
+
+def best_of(repeat, function):
+    """Ejecuta ``function`` ``repeat`` veces y devuelve (mejor tiempo, último resultado)."""
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def compare(label, queryset, serializer_class, repeat):
+    """Mide los dos caminos sobre ``queryset`` y verifica que la salida coincide."""
+    def drf():
+        return JSONRenderer().render(serializer_class(queryset.all(), many=True).data)
+
+    def fast():
+        columns, build = compile_rows(serializer_class(), queryset.model)
+        return FastJSONRenderer().render(build(queryset.values(*columns)))
+
+    drf_time, drf_output = best_of(repeat, drf)
+    fast_time, fast_output = best_of(repeat, fast)
+    same = 'idéntico' if drf_output == fast_output else 'DIFERENTE'
+    print(f'{label:<12} DRF {drf_time * 1000:8.1f} ms | rápido {fast_time * 1000:8.1f} ms | '
+          f'x{drf_time / fast_time:4.1f} | {len(fast_output) / 1024:8.0f} KiB | {same}')
+    return drf_output == fast_output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=10000, help='Filas por modelo (por defecto 10000).')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones; se toma la mejor.')
+    args = parser.parse_args()
+
+    print(f'\n⏱️  Benchmark de lectura rápida con {args.rows} filas por modelo\n')
+    ok = True
+    try:
+        with transaction.atomic():
+            create_rows(args.rows)
+            ok &= compare('Clientes', Client.objects.order_by('-pk')[:args.rows], ClientSerializer, args.repeat)
+            ok &= compare('Servicios', Service.objects.order_by('-pk')[:args.rows], ServiceSerializer, args.repeat)
+            ok &= compare('Equipos', Equipment.objects.order_by('-pk')[:args.rows], EquipmentSerializer, args.repeat)
+            raise Rollback
+    except Rollback:
+        pass
+    print('\n✅ Salidas idénticas' if ok else '\n❌ Las salidas no coinciden')
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,16 @@
+from . import backends
+
+
+class IndexedSearchAdminMixin:
+    """
+    Mixin para ModelAdmin: la caja de búsqueda consulta el índice de
+    búsqueda (``search_kind``) en lugar de hacer ``ILIKE`` sobre
+    ``search_fields``, que solo se mantienen para que el admin la muestre.
+    Cada palabra se busca como prefijo, también en los autocompletados.
+    """
+    search_kind = None
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term.strip():
+            return super().get_search_results(request, queryset, search_term)
+        return queryset.filter(pk__in=backends.matching_ids(self.search_kind, search_term, prefix=True)), False
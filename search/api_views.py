@@ -0,0 +1,52 @@
+from accounts.roles import effective_role
+from drf_spectacular.utils import extend_schema, inline_serializer
+from rest_framework import generics, permissions, serializers
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+from . import backends
+from .indexing import SEARCH_ROLES
+from .serializers import SearchQuerySerializer, SearchResultSerializer
+
+
+class CanSearch(permissions.BasePermission):
+    """Administradores (incluidos los superusuarios) y técnicos."""
+
+    def has_permission(self, request, view):
+        return request.user.is_authenticated and effective_role(request.user) in SEARCH_ROLES
+
+
+@extend_schema(
+    tags=['Búsqueda'],
+    summary='Buscar clientes, servicios, reportes técnicos y cotizaciones',
+    description='Búsqueda de texto completo ordenada por relevancia. El título y el fragmento de cada '
+                'resultado vienen con HTML escapado y los términos encontrados entre `<mark>`.',
+    parameters=[SearchQuerySerializer],
+    responses=inline_serializer('SearchResponse', {
+        'next': serializers.URLField(allow_null=True),
+        'previous': serializers.URLField(allow_null=True),
+        'results': SearchResultSerializer(many=True),
+    }),
+)
+class SearchAPIView(generics.GenericAPIView):
+    """
+    Vista de API de búsqueda.
+
+    get:
+    Retorna los resultados de ``q``, paginados con ``limit``/``offset``.
+    """
+    serializer_class = SearchResultSerializer
+    permission_classes = [CanSearch]
+
+    def get(self, request, *args, **kwargs):
+        params = SearchQuerySerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        q, kinds = params.validated_data['q'], params.validated_data.get('kind')
+        limit, offset = params.validated_data['limit'], params.validated_data['offset']
+        # Un resultado de más indica si hay página siguiente sin contar las coincidencias.
+        results = backends.search(q, kinds, offset, limit + 1)
+        url = request.build_absolute_uri()
+        return Response({
+            'next': replace_query_param(url, 'offset', offset + limit) if len(results) > limit else None,
+            'previous': replace_query_param(url, 'offset', max(offset - limit, 0)) if offset else None,
+            'results': self.get_serializer(results[:limit], many=True).data,
+        })
@@ -0,0 +1,189 @@
+"""
+Consultas al índice de búsqueda.
+
+``backend()`` elige la implementación según la base de datos:
+
+* PostgreSQL: ``websearch_to_tsquery`` sobre ``vector`` (índice GIN),
+  orden por ``ts_rank`` y fragmentos con ``ts_headline``.
+* SQLite: ``MATCH`` sobre la tabla FTS5, orden por ``bm25`` y fragmentos
+  con ``snippet``. Solo busca palabras completas (sin stemming) y acepta
+  comillas para frases; basta para desarrollo y pruebas.
+
+Ambas devuelven ``SearchResult`` con los términos encontrados del título y
+del fragmento resaltados con ``<mark>``.
+"""
+import re
+from collections import namedtuple
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+
+from .indexing import INDEXES, result_url
+from .models import SEARCH_CONFIG, SearchDocument
+
+# Marcadores de los términos encontrados (caracteres Unicode de uso privado,
+# que no aparecen en el texto indexado); se cambian por <mark> al escapar.
+START_SEL, STOP_SEL = '\ue000', '\ue001'
+SNIPPET_WORDS = 30
+FRAGMENT_DELIMITER = ' … '
+
+SearchResult = namedtuple('SearchResult', ['kind', 'label', 'object_id', 'title', 'snippet', 'rank', 'url'])
+
+
+def highlight(text):
+    """Escapa ``text`` y convierte los marcadores de términos en ``<mark>``."""
+    return mark_safe(escape(text or '').replace(START_SEL, '<mark>').replace(STOP_SEL, '</mark>'))
+
+
+def _result(kind, object_id, title, snippet, rank):
+    return SearchResult(
+        kind, INDEXES[kind].label, object_id, highlight(title), highlight(snippet), rank,
+        result_url(kind, object_id),
+    )
+
+
+class PostgresBackend:
+    """Búsqueda con ``tsvector`` e índice GIN (configuración ``spanish``)."""
+
+    def _query(self, text, prefix=False):
+        if prefix:
+            # Todas las palabras, cada una como prefijo ('pala':*). Se separan
+            # por espacios para que el analizador de PostgreSQL reconozca
+            # correos y URL como un solo término, igual que al indexar.
+            words = (word.replace('\\', '\\\\').replace("'", "''") for word in text.split())
+            raw = ' & '.join(f"'{word}':*" for word in words)
+            return SearchQuery(raw, config=SEARCH_CONFIG, search_type='raw')
+        return SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+
+    def _matches(self, text, kinds, prefix=False):
+        documents = SearchDocument.objects.filter(vector=self._query(text, prefix))
+        if kinds:
+            documents = documents.filter(kind__in=kinds)
+        return documents
+
+    def search(self, text, kinds=None, offset=0, limit=20):
+        query = self._query(text)
+        page = list(
+            self._matches(text, kinds)
+            .annotate(rank=SearchRank(F('vector'), query))
+            .order_by('-rank', 'kind', 'object_id')
+            .values_list('pk', 'rank')[offset:offset + limit]
+        )
+        # ts_headline vuelve a analizar el texto completo: se calcula en una
+        # segunda consulta solo para la página, no para cada coincidencia.
+        headlines = SearchDocument.objects.filter(pk__in=[pk for pk, _ in page]).annotate(
+            title_headline=SearchHeadline(
+                'title', query, config=SEARCH_CONFIG, start_sel=START_SEL, stop_sel=STOP_SEL, highlight_all=True,
+            ),
+            body_headline=SearchHeadline(
+                'body', query, config=SEARCH_CONFIG, start_sel=START_SEL, stop_sel=STOP_SEL,
+                max_words=SNIPPET_WORDS, min_words=SNIPPET_WORDS // 2, max_fragments=2,
+                fragment_delimiter=FRAGMENT_DELIMITER,
+            ),
+        ).values_list('pk', 'kind', 'object_id', 'title_headline', 'body_headline')
+        rows = {row[0]: row[1:] for row in headlines}
+        return [_result(*rows[pk], rank) for pk, rank in page if pk in rows]
+
+    def matching_ids(self, kind, text, prefix=False):
+        return self._matches(text, [kind], prefix).values('object_id')
+
+    def rebuild(self):
+        """Nada que hacer: el trigger recalcula ``vector`` al reescribir cada documento."""
+
+
+class SQLiteBackend:
+    """Búsqueda con la tabla FTS5 ``search_searchdocument_fts``."""
+    table = 'search_searchdocument_fts'
+    # Peso de las columnas en bm25 (título, cuerpo), como los pesos A y B de PostgreSQL.
+    weights = (2.5, 1.0)
+
+    def _match(self, text, prefix=False):
+        """Expresión MATCH: todas las palabras (o prefijos) y las frases entre comillas."""
+        phrases = [' '.join(re.findall(r'\w+', phrase)) for phrase in re.findall(r'"([^"]+)"', text)]
+        words = re.findall(r'\w+', re.sub(r'"[^"]*"', ' ', text))
+        star = '*' if prefix else ''
+        return ' '.join([*(f'"{phrase}"' for phrase in phrases if phrase), *(f'"{word}"{star}' for word in words)])
+
+    def _execute(self, select, text, kinds, select_params=(), tail='', tail_params=(), prefix=False):
+        match = self._match(text, prefix)
+        if not match:
+            return []
+        sql = (
+            f'SELECT {select} FROM {self.table} '
+            f'JOIN search_searchdocument AS doc ON doc.id = {self.table}.rowid '
+            f'WHERE {self.table} MATCH %s'
+        )
+        args = [*select_params, match]
+        if kinds:
+            sql += f' AND doc.kind IN ({", ".join(["%s"] * len(kinds))})'
+            args += list(kinds)
+        with connection.cursor() as cursor:
+            cursor.execute(f'{sql} {tail}', [*args, *tail_params])
+            return cursor.fetchall()
+
+    def search(self, text, kinds=None, offset=0, limit=20):
+        bm25 = f'bm25({self.table}, {self.weights[0]}, {self.weights[1]})'
+        rows = self._execute(
+            f"doc.kind, doc.object_id, highlight({self.table}, 0, %s, %s), "
+            f"snippet({self.table}, 1, %s, %s, %s, {SNIPPET_WORDS}), -{bm25}",
+            text, kinds,
+            select_params=[START_SEL, STOP_SEL, START_SEL, STOP_SEL, FRAGMENT_DELIMITER],
+            tail=f'ORDER BY {bm25}, doc.kind, doc.object_id LIMIT %s OFFSET %s',
+            tail_params=[limit, offset],
+        )
+        return [_result(*row) for row in rows]
+
+    def matching_ids(self, kind, text, prefix=False):
+        return [object_id for object_id, in self._execute('doc.object_id', text, [kind], prefix=prefix)]
+
+    def rebuild(self):
+        """Reconstruye la tabla FTS5 a partir de ``search_searchdocument``."""
+        with connection.cursor() as cursor:
+            cursor.execute(f"INSERT INTO {self.table}({self.table}) VALUES ('rebuild')")
+
+
+BACKENDS = {
+    'postgresql': PostgresBackend,
+    'sqlite': SQLiteBackend,
+}
+
+
+def backend():
+    """Implementación de búsqueda de la base de datos en uso."""
+    return BACKENDS[connection.vendor]()
+
+
+def search(text, kinds=None, offset=0, limit=20):
+    """
+    Busca ``text`` en los documentos indexados.
+
+    Args:
+        text: Texto de búsqueda (palabras; frases entre comillas).
+        kinds: Tipos de documento a incluir (``INDEXES``); todos si es vacío.
+        offset: Resultados a saltar.
+        limit: Resultados a devolver.
+
+    Returns:
+        list: ``SearchResult`` ordenados por relevancia.
+    """
+    if not text.strip():
+        return []
+    return backend().search(text, kinds, offset, limit)
+
+
+def matching_ids(kind, text, prefix=False):
+    """
+    IDs de los objetos de tipo ``kind`` que coinciden con ``text``.
+
+    Con ``prefix`` cada palabra se busca como comienzo de palabra ("jua"
+    encuentra "Juan"), como espera la búsqueda del admin.
+
+    Returns:
+        Lista de IDs o subconsulta (PostgreSQL), para filtrar con ``pk__in``.
+    """
+    if not re.search(r'\w', text):
+        return []
+    return backend().matching_ids(kind, text, prefix)
@@ -0,0 +1,8 @@
+from django import forms
+from .models import SearchDocument
+
+
+class SearchForm(forms.Form):
+    """Texto y tipo de documento de la página de búsqueda."""
+    q = forms.CharField(max_length=200, label="Buscar")
+    kind = forms.ChoiceField(choices=[('', 'Todos')] + SearchDocument.KIND_CHOICES, required=False, label="Tipo")
@@ -0,0 +1,140 @@
+"""
+Modelos buscables y escritura de sus documentos de búsqueda.
+
+Cada modelo indexado tiene un ``Index`` que define el título, el cuerpo y la
+URL de sus resultados. El cuerpo incluye texto de objetos relacionados
+(el nombre del cliente en sus servicios, por ejemplo); ``DEPENDENTS``
+indica qué documentos se reescriben cuando cambia uno de esos objetos.
+
+Los documentos se escriben en lotes con un upsert (``bulk_create`` con
+``update_conflicts``); los triggers de la base de datos actualizan el
+``tsvector`` o la tabla FTS5 en la misma sentencia.
+"""
+from collections import namedtuple
+
+from django.urls import reverse
+
+from quotes.models import Quote
+from services.models import Client, Service, TechnicalReport
+from .models import SearchDocument
+
+BATCH_SIZE = 500
+
+# Roles que pueden buscar (la página y la API incluyen clientes y cotizaciones).
+SEARCH_ROLES = ('admin', 'technician')
+
+Index = namedtuple('Index', ['kind', 'label', 'model', 'related', 'title', 'body', 'url_name'])
+
+
+def _join(*parts):
+    return '\n'.join(part for part in parts if part)
+
+
+def _user_text(user):
+    return _join(user.username, user.get_full_name()) if user else ''
+
+
+INDEXES = {index.kind: index for index in (
+    Index(
+        'client', 'Cliente', Client, (),
+        title=lambda client: client.name,
+        body=lambda client: _join(client.company, client.email, client.phone, client.address),
+        url_name='client_update',
+    ),
+    Index(
+        'service', 'Servicio', Service, ('client', 'technician'),
+        title=lambda service: service.title,
+        body=lambda service: _join(service.description, service.client.name, _user_text(service.technician)),
+        url_name='service_update',
+    ),
+    Index(
+        'report', 'Reporte Técnico', TechnicalReport, ('service__client', 'technician'),
+        title=lambda report: str(report),
+        body=lambda report: _join(
+            report.diagnosis, report.interventions, report.parts_used, report.recommendations,
+            report.signature, report.service.client.name, _user_text(report.technician),
+        ),
+        url_name='report_update',
+    ),
+    Index(
+        'quote', 'Cotización', Quote, (),
+        title=lambda quote: quote.client_name,
+        body=lambda quote: _join(quote.description, quote.client_email, quote.client_phone),
+        url_name='admin:quotes_quote_change',
+    ),
+)}
+
+MODEL_INDEXES = {index.model: index for index in INDEXES.values()}
+
+# Modelo -> documentos que incluyen su texto: (tipo, filtro hacia el modelo).
+# Los usuarios no están: se guardan en cada inicio de sesión (``last_login``)
+# y su nombre casi nunca cambia; tras renombrar un técnico basta con
+# ``rebuild_search_index service report``.
+DEPENDENTS = {
+    Client: [('service', 'client'), ('report', 'service__client')],
+    Service: [('report', 'service')],
+}
+
+
+def result_url(kind, object_id):
+    """URL del objeto de un resultado."""
+    return reverse(INDEXES[kind].url_name, args=[object_id])
+
+
+def documents(index, queryset):
+    """Genera los ``SearchDocument`` (sin guardar) de los objetos de ``queryset``."""
+    for obj in queryset.select_related(*index.related).iterator(chunk_size=BATCH_SIZE):
+        yield SearchDocument(
+            kind=index.kind, object_id=obj.pk,
+            title=index.title(obj)[:255], body=index.body(obj),
+        )
+
+
+def save_documents(docs):
+    """Inserta o reescribe ``docs`` (una sentencia por lote)."""
+    SearchDocument.objects.bulk_create(
+        docs, batch_size=BATCH_SIZE, update_conflicts=True,
+        unique_fields=['kind', 'object_id'], update_fields=['title', 'body', 'updated_at'],
+    )
+
+
+def index_objects(model, ids):
+    """Reescribe los documentos de los objetos ``ids`` de ``model`` y los que dependen de ellos."""
+    ids = list(ids)
+    if not ids:
+        return
+    index = MODEL_INDEXES[model]
+    save_documents(list(documents(index, model._default_manager.filter(pk__in=ids))))
+    for kind, lookup in DEPENDENTS.get(model, ()):
+        dependent = INDEXES[kind]
+        queryset = dependent.model._default_manager.filter(**{f'{lookup}__in': ids})
+        save_documents(list(documents(dependent, queryset)))
+
+
+def remove_objects(model, ids):
+    """Borra los documentos de los objetos ``ids`` de ``model``."""
+    SearchDocument.objects.filter(kind=MODEL_INDEXES[model].kind, object_id__in=list(ids)).delete()
+
+
+def rebuild(index):
+    """
+    Reescribe todos los documentos de ``index`` y borra los de objetos que ya no existen.
+
+    Returns:
+        tuple: (documentos escritos, documentos borrados).
+    """
+    written = 0
+    batch = []
+    for doc in documents(index, index.model._default_manager.order_by('pk')):
+        batch.append(doc)
+        if len(batch) == BATCH_SIZE:
+            save_documents(batch)
+            written += len(batch)
+            batch = []
+    save_documents(batch)
+    written += len(batch)
+    orphans = SearchDocument.objects.filter(kind=index.kind).exclude(
+        object_id__in=index.model._default_manager.values('pk'),
+    )
+    deleted, _ = orphans.delete()
+    return written, deleted
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from search import backends, indexing
+
+
+class Command(BaseCommand):
+    help = 'Reescribe el índice de búsqueda (SearchDocument) a partir de los datos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('kinds', nargs='*',
+                            help=f'Tipos de documento a reindexar: {", ".join(indexing.INDEXES)} (por defecto, todos).')
+
+    def handle(self, *args, **options):
+        kinds = options['kinds'] or list(indexing.INDEXES)
+        unknown = sorted(set(kinds) - set(indexing.INDEXES))
+        if unknown:
+            raise CommandError(f'Tipos desconocidos: {", ".join(unknown)}.')
+        with transaction.atomic():
+            for kind in kinds:
+                written, deleted = indexing.rebuild(indexing.INDEXES[kind])
+                self.stdout.write(f'{kind}: {written} documentos, {deleted} borrados.')
+            backends.backend().rebuild()
+        self.stdout.write(self.style.SUCCESS('Índice de búsqueda reconstruido.'))
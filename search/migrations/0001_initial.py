@@ -0,0 +1,111 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:54
+
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+# El índice lo mantiene la base de datos con triggers, así que cualquier
+# escritura de SearchDocument (incluidos los upserts masivos) lo actualiza.
+INDEX_SQL = {
+    'postgresql': (
+        [
+            """
+            CREATE FUNCTION search_document_vector() RETURNS trigger AS $$
+            BEGIN
+                NEW.vector := setweight(to_tsvector('spanish', coalesce(NEW.title, '')), 'A')
+                    || setweight(to_tsvector('spanish', coalesce(NEW.body, '')), 'B');
+                RETURN NEW;
+            END
+            $$ LANGUAGE plpgsql
+            """,
+            """
+            CREATE TRIGGER search_document_vector
+            BEFORE INSERT OR UPDATE OF title, body ON search_searchdocument
+            FOR EACH ROW EXECUTE FUNCTION search_document_vector()
+            """,
+            'CREATE INDEX search_document_vector_idx ON search_searchdocument USING GIN (vector)',
+        ],
+        [
+            'DROP INDEX IF EXISTS search_document_vector_idx',
+            'DROP TRIGGER IF EXISTS search_document_vector ON search_searchdocument',
+            'DROP FUNCTION IF EXISTS search_document_vector()',
+        ],
+    ),
+    # Tabla FTS5 de contenido externo: guarda solo el índice y lee el texto
+    # de search_searchdocument. Al rehacer la tabla (como hace SQLite con
+    # algunos AlterField) se pierden los triggers: hay que volver a crearlos.
+    'sqlite': (
+        [
+            """
+            CREATE VIRTUAL TABLE search_searchdocument_fts USING fts5(
+                title, body, content='search_searchdocument', content_rowid='id',
+                tokenize='unicode61 remove_diacritics 2'
+            )
+            """,
+            """
+            CREATE TRIGGER search_searchdocument_fts_insert AFTER INSERT ON search_searchdocument BEGIN
+                INSERT INTO search_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+            END
+            """,
+            """
+            CREATE TRIGGER search_searchdocument_fts_delete AFTER DELETE ON search_searchdocument BEGIN
+                INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, title, body)
+                VALUES ('delete', old.id, old.title, old.body);
+            END
+            """,
+            """
+            CREATE TRIGGER search_searchdocument_fts_update AFTER UPDATE OF title, body ON search_searchdocument BEGIN
+                INSERT INTO search_searchdocument_fts(search_searchdocument_fts, rowid, title, body)
+                VALUES ('delete', old.id, old.title, old.body);
+                INSERT INTO search_searchdocument_fts(rowid, title, body) VALUES (new.id, new.title, new.body);
+            END
+            """,
+        ],
+        [
+            'DROP TRIGGER IF EXISTS search_searchdocument_fts_update',
+            'DROP TRIGGER IF EXISTS search_searchdocument_fts_delete',
+            'DROP TRIGGER IF EXISTS search_searchdocument_fts_insert',
+            'DROP TABLE IF EXISTS search_searchdocument_fts',
+        ],
+    ),
+}
+
+
+def create_index(apps, schema_editor):
+    forward, _ = INDEX_SQL.get(schema_editor.connection.vendor, ([], []))
+    for sql in forward:
+        schema_editor.execute(sql)
+
+
+def drop_index(apps, schema_editor):
+    _, backward = INDEX_SQL.get(schema_editor.connection.vendor, ([], []))
+    for sql in backward:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('client', 'Cliente'), ('service', 'Servicio'), ('report', 'Reporte Técnico'), ('quote', 'Cotización')], max_length=20, verbose_name='Tipo')),
+                ('object_id', models.BigIntegerField(verbose_name='ID del Objeto')),
+                ('title', models.CharField(max_length=255, verbose_name='Título')),
+                ('body', models.TextField(blank=True, verbose_name='Contenido')),
+                ('vector', django.contrib.postgres.search.SearchVectorField(editable=False, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Última Actualización')),
+            ],
+            options={
+                'verbose_name': 'Documento de Búsqueda',
+                'verbose_name_plural': 'Documentos de Búsqueda',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='search_document_unique')],
+            },
+        ),
+        migrations.RunPython(create_index, drop_index),
+    ]
@@ -0,0 +1,43 @@
+from django.contrib.postgres.search import SearchVectorField
+from django.db import models
+
+# Configuración de búsqueda de texto de PostgreSQL (diccionario y stemming).
+SEARCH_CONFIG = 'spanish'
+
+
+class SearchDocument(models.Model):
+    """
+    Texto buscable de un cliente, servicio, reporte técnico o cotización.
+
+    ``search.indexing`` mantiene un documento por objeto al guardarlo o
+    borrarlo. El índice lo mantiene la propia base de datos con triggers
+    creados en la migración inicial:
+
+    * PostgreSQL: ``vector`` (``tsvector`` con la configuración ``spanish``;
+      el título con peso A y el cuerpo con peso B) con un índice GIN.
+    * SQLite (desarrollo y pruebas): la tabla FTS5 ``search_searchdocument_fts``;
+      ``vector`` queda vacío.
+    """
+    KIND_CHOICES = [
+        ('client', 'Cliente'),
+        ('service', 'Servicio'),
+        ('report', 'Reporte Técnico'),
+        ('quote', 'Cotización'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name="Tipo")
+    object_id = models.BigIntegerField(verbose_name="ID del Objeto")
+    title = models.CharField(max_length=255, verbose_name="Título")
+    body = models.TextField(blank=True, verbose_name="Contenido")
+    vector = SearchVectorField(null=True, editable=False)
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
+
+    class Meta:
+        verbose_name = "Documento de Búsqueda"
+        verbose_name_plural = "Documentos de Búsqueda"
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='search_document_unique'),
+        ]
+
+    def __str__(self):
+        return f'{self.get_kind_display()}: {self.title}'
@@ -0,0 +1,37 @@
+from rest_framework import serializers
+from .models import SearchDocument
+
+
+class SearchQuerySerializer(serializers.Serializer):
+    """Parámetros de ``GET /search/api/``."""
+    q = serializers.CharField(
+        max_length=200, help_text='Texto a buscar. Admite frases entre comillas y, con PostgreSQL, OR y -palabra.',
+    )
+    kind = serializers.CharField(
+        required=False, allow_blank=True,
+        help_text='Tipos separados por comas: client, service, report, quote (por defecto, todos).',
+    )
+    limit = serializers.IntegerField(required=False, default=20, min_value=1, max_value=50)
+    offset = serializers.IntegerField(required=False, default=0, min_value=0)
+
+    def validate_kind(self, value):
+        kinds = [kind.strip() for kind in value.split(',') if kind.strip()]
+        valid = dict(SearchDocument.KIND_CHOICES)
+        unknown = [kind for kind in kinds if kind not in valid]
+        if unknown:
+            raise serializers.ValidationError(f'Tipos desconocidos: {", ".join(unknown)}.')
+        return kinds
+
+
+class SearchResultSerializer(serializers.Serializer):
+    """Un resultado de búsqueda, del más al menos relevante."""
+    kind = serializers.ChoiceField(choices=SearchDocument.KIND_CHOICES)
+    label = serializers.CharField(help_text='Nombre del tipo de documento.')
+    id = serializers.IntegerField(source='object_id')
+    title = serializers.CharField(help_text='HTML escapado; los términos encontrados van entre <mark>.')
+    snippet = serializers.CharField(help_text='Fragmento del contenido, con el mismo formato que title.')
+    rank = serializers.FloatField(help_text='Relevancia (mayor es mejor); solo sirve para comparar resultados.')
+    url = serializers.SerializerMethodField()
+
+    def get_url(self, result) -> str:
+        return self.context['request'].build_absolute_uri(result.url)
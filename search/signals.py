@@ -0,0 +1,33 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from personal_tech.signals import rows_written
+from quotes.models import Quote
+from services.models import Client, Service, TechnicalReport
+from .indexing import index_objects, remove_objects
+
+
+@receiver(post_save, sender=Client)
+@receiver(post_save, sender=Service)
+@receiver(post_save, sender=TechnicalReport)
+@receiver(post_save, sender=Quote)
+def index_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        index_objects(sender, [instance.pk])
+
+
+@receiver(post_delete, sender=Client)
+@receiver(post_delete, sender=Service)
+@receiver(post_delete, sender=TechnicalReport)
+@receiver(post_delete, sender=Quote)
+def remove_deleted(sender, instance, **kwargs):
+    remove_objects(sender, [instance.pk])
+
+
+# update(), bulk_create() y bulk_update() (incluida la API masiva) a través
+# de VersionedManager.
+@receiver(rows_written, sender=Client)
+@receiver(rows_written, sender=Service)
+@receiver(rows_written, sender=TechnicalReport)
+@receiver(rows_written, sender=Quote)
+def index_rows_written(sender, pks, **kwargs):
+    index_objects(sender, pks)
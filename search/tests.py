@@ -0,0 +1,130 @@
+from accounts.roles import set_role
+from django.contrib.auth.models import User
+from django.test import TestCase
+from django.urls import reverse
+
+from quotes.models import Quote
+from services.models import Client, Service, TechnicalReport
+from . import backends
+from .models import SearchDocument
+
+
+def found(text, kind=None):
+    return [(result.kind, result.object_id) for result in backends.search(text, [kind] if kind else None)]
+
+
+class SearchIndexTests(TestCase):
+    """El índice (FTS5 en el perfil de pruebas) se mantiene al escribir."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.technician = User.objects.create_user('tecnico', first_name='Ana', last_name='Pérez')
+        cls.customer = Client.objects.create(
+            name='Ferretería Gómez', email='gomez@example.com', phone='3000000001', address='Calle 10',
+        )
+        cls.service = Service.objects.create(
+            title='Impresora atascada', description='La impresora láser no toma papel.',
+            client=cls.customer, technician=cls.technician,
+        )
+        cls.report = TechnicalReport.objects.create(
+            service=cls.service, technician=cls.technician,
+            diagnosis='Rodillo de impresora gastado.', interventions='Cambio de rodillo.',
+        )
+        cls.quote = Quote.objects.create(
+            client_name='Laura Ríos', client_email='laura@example.com', client_phone='3000000002',
+            description='Cableado de red para oficina.',
+        )
+
+    def test_documents_are_created_on_save(self):
+        self.assertEqual(SearchDocument.objects.count(), 4)
+        self.assertEqual(found('cableado'), [('quote', self.quote.pk)])
+
+    def test_title_matches_rank_first(self):
+        # "impresora" está en el título del servicio y solo en el cuerpo del reporte.
+        self.assertEqual(found('impresora'), [('service', self.service.pk), ('report', self.report.pk)])
+
+    def test_accents_are_ignored(self):
+        self.assertEqual(found('ferreteria gomez', 'client'), [('client', self.customer.pk)])
+
+    def test_highlight_escapes_html(self):
+        self.customer.name = '<b>Pedro</b> & Hijos'
+        self.customer.save()
+        result = backends.search('pedro', ['client'])[0]
+        self.assertEqual(result.title, '&lt;b&gt;<mark>Pedro</mark>&lt;/b&gt; &amp; Hijos')
+        self.assertIn('<mark>Pedro</mark>', backends.search('pedro', ['service'])[0].snippet)
+
+    def test_related_documents_follow_client_rename(self):
+        self.customer.name = 'Papelería Central'
+        self.customer.save()
+        self.assertCountEqual(found('papeleria'), [
+            ('client', self.customer.pk), ('service', self.service.pk), ('report', self.report.pk),
+        ])
+        self.assertEqual(found('ferreteria'), [])
+
+    def test_queryset_update_reindexes(self):
+        Client.objects.filter(pk=self.customer.pk).update(name='Pedro Salas')
+        self.assertCountEqual(found('pedro'), [
+            ('client', self.customer.pk), ('service', self.service.pk), ('report', self.report.pk),
+        ])
+        Quote.objects.filter(pk=self.quote.pk).update(description='Instalación de cámaras.')
+        self.assertEqual(found('camaras'), [('quote', self.quote.pk)])
+        self.assertEqual(found('cableado'), [])
+
+    def test_bulk_update_reindexes(self):
+        self.service.title = 'Monitor sin imagen'
+        Service.objects.bulk_update([self.service], ['title'])
+        # El título del reporte incluye el del servicio.
+        self.assertCountEqual(found('monitor'), [('service', self.service.pk), ('report', self.report.pk)])
+
+    def test_delete_removes_documents(self):
+        self.customer.delete()
+        self.assertEqual(found('impresora'), [])
+        self.assertEqual(list(SearchDocument.objects.values_list('kind', flat=True)), ['quote'])
+
+    def test_prefix_matching(self):
+        self.assertEqual(list(backends.matching_ids('client', 'ferre')), [])
+        self.assertEqual(list(backends.matching_ids('client', 'ferre', prefix=True)), [self.customer.pk])
+
+
+class SearchViewsTests(TestCase):
+    """Página, API y admin usan el mismo índice."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        cls.customer_user = User.objects.create_user('cliente')
+        set_role(cls.customer_user, 'client')
+        for i in range(3):
+            Client.objects.create(name=f'Gómez {i}', email=f'gomez{i}@example.com', phone=f'300000000{i}')
+        Client.objects.create(name='Otro', email='otro@example.com', phone='3000000009')
+
+    def test_api_paginates_results(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('api-search'), {'q': 'gomez', 'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(len(data['results']), 2)
+        self.assertEqual(data['results'][0]['kind'], 'client')
+        self.assertIn('<mark>Gómez</mark>', data['results'][0]['title'])
+        self.assertIn('offset=2', data['next'])
+        self.assertEqual(len(self.client.get(data['next']).json()['results']), 1)
+
+    def test_api_rejects_unknown_kinds(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('api-search'), {'q': 'gomez', 'kind': 'client,factura'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_requires_staff_role(self):
+        self.client.force_login(self.customer_user)
+        self.assertEqual(self.client.get(reverse('api-search'), {'q': 'gomez'}).status_code, 403)
+        self.assertEqual(self.client.get(reverse('search'), {'q': 'gomez'}).status_code, 403)
+
+    def test_page_highlights_results(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('search'), {'q': 'gomez'})
+        self.assertContains(response, '<mark>Gómez</mark>', count=3)
+
+    def test_admin_search_uses_prefixes(self):
+        self.client.force_login(self.admin)
+        response = self.client.get(reverse('admin:services_client_changelist'), {'q': 'góm'})
+        self.assertEqual(response.context['cl'].result_count, 3)
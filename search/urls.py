@@ -0,0 +1,7 @@
+from django.urls import path
+from . import api_views, views
+
+urlpatterns = [
+    path('', views.search_page, name='search'),
+    path('api/', api_views.SearchAPIView.as_view(), name='api-search'),
+]
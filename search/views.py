@@ -0,0 +1,45 @@
+from accounts.roles import effective_role
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.shortcuts import render
+from personal_tech.query_budget import query_budget
+from . import backends
+from .forms import SearchForm
+from .indexing import SEARCH_ROLES
+
+RESULTS_PAGE_SIZE = 20
+
+
+@login_required
+@query_budget(5)
+def search_page(request):
+    """
+    Búsqueda de texto completo en clientes, servicios, reportes técnicos y cotizaciones.
+
+    Args:
+        request: Objeto HttpRequest. Acepta ``q``, ``kind`` y ``offset``.
+
+    Returns:
+        HttpResponse: Renderiza 'search/search.html' con los resultados por relevancia.
+    """
+    if effective_role(request.user) not in SEARCH_ROLES:
+        raise PermissionDenied
+
+    form = SearchForm(request.GET or None)
+    results, offset, has_next = [], 0, False
+    if form.is_valid():
+        try:
+            offset = max(int(request.GET.get('offset', 0)), 0)
+        except ValueError:
+            offset = 0
+        kind = form.cleaned_data['kind']
+        results = backends.search(form.cleaned_data['q'], [kind] if kind else None, offset, RESULTS_PAGE_SIZE + 1)
+        has_next = len(results) > RESULTS_PAGE_SIZE
+        results = results[:RESULTS_PAGE_SIZE]
+    return render(request, 'search/search.html', {
+        'form': form,
+        'results': results,
+        'offset': offset,
+        'next_offset': offset + RESULTS_PAGE_SIZE if has_next else None,
+        'previous_offset': max(offset - RESULTS_PAGE_SIZE, 0) if offset else None,
+    })
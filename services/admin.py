@@ -1,35 +1,68 @@
 from django.contrib import admin
-from .models import Client, Service, TechnicalReport
+from search.admin import IndexedSearchAdminMixin
+from . import mailing
+from .models import Client, Service, TechnicalReport, PdfRenderJob, OutgoingEmail
 
 @admin.register(Client)
-class ClientAdmin(admin.ModelAdmin):
+class ClientAdmin(IndexedSearchAdminMixin, admin.ModelAdmin):
     """
     Configuración del admin para el modelo Client.
     """
     list_display = ('name', 'email', 'phone', 'company', 'type', 'created_at')
     list_filter = ('type', 'created_at')
     search_fields = ('name', 'email', 'phone', 'company')
+    search_kind = 'client'
     ordering = ('-created_at',)
 
 @admin.register(Service)
-class ServiceAdmin(admin.ModelAdmin):
+class ServiceAdmin(IndexedSearchAdminMixin, admin.ModelAdmin):
     """
     Configuración del admin para el modelo Service.
     """
     list_display = ('title', 'client', 'technician', 'status', 'service_date', 'created_at')
     list_filter = ('status', 'service_date', 'created_at')
     search_fields = ('title', 'description', 'client__name', 'technician__username')
+    search_kind = 'service'
     date_hierarchy = 'service_date'
     ordering = ('-created_at',)
     autocomplete_fields = ['client']
 
 @admin.register(TechnicalReport)
-class TechnicalReportAdmin(admin.ModelAdmin):
+class TechnicalReportAdmin(IndexedSearchAdminMixin, admin.ModelAdmin):
     """
     Configuración del admin para el modelo TechnicalReport.
     """
     list_display = ('service', 'technician', 'date', 'status', 'warranty_period')
     list_filter = ('status', 'date')
     search_fields = ('service__title', 'technician__username', 'diagnosis')
+    search_kind = 'report'
     date_hierarchy = 'date'
     ordering = ('-date',)
+    actions = ['send_by_email']
+
+    @admin.action(description='Enviar los reportes seleccionados por correo')
+    def send_by_email(self, request, queryset):
+        """Encola un correo por reporte; send_queued_emails los entrega por lotes."""
+        created, skipped = mailing.enqueue_report_emails(queryset.select_related('service__client'))
+        self.message_user(request, f'{len(created)} correos en cola, {len(skipped)} omitidos (ya estaban en cola).')
+
+@admin.register(PdfRenderJob)
+class PdfRenderJobAdmin(admin.ModelAdmin):
+    """
+    Configuración del admin para el modelo PdfRenderJob.
+    """
+    list_display = ('report', 'status', 'created_at', 'started_at', 'finished_at')
+    list_filter = ('status', 'created_at')
+    readonly_fields = ('cache_key', 'error', 'created_at', 'started_at', 'finished_at')
+    ordering = ('-created_at',)
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(admin.ModelAdmin):
+    """
+    Configuración del admin para el modelo OutgoingEmail.
+    """
+    list_display = ('subject', 'recipient', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status', 'created_at')
+    search_fields = ('recipient', 'subject')
+    readonly_fields = ('attempts', 'last_error', 'sent_at', 'created_at', 'updated_at')
+    ordering = ('-created_at',)
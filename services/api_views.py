@@ -1,16 +1,23 @@
 from rest_framework import generics, permissions
 from .models import Client, Service, TechnicalReport
+from .filters import ClientFilter, ServiceFilter, TechnicalReportFilter
 from .serializers import ClientSerializer, ServiceSerializer, TechnicalReportSerializer
-from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiExample
+from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiParameter, OpenApiExample
+from personal_tech.bulk import BulkAPIView, bulk_schema
+from personal_tech.conditional import ConditionalGetMixin
+from personal_tech.fieldsets import DYNAMIC_FIELDS_PARAMETERS, DynamicFieldsViewMixin
+from personal_tech.fastread import FastListMixin
+from personal_tech.response_cache import CachedResponseMixin
+from personal_tech.exports import EXPORT_PARAMETERS, EXPORT_RESPONSES, StreamingExportAPIView
 
 # Client Views
+@extend_schema_view(get=extend_schema(parameters=DYNAMIC_FIELDS_PARAMETERS))
 @extend_schema(
     tags=['Clientes'],
     summary='Listar y crear clientes',
     description='Obtiene una lista de todos los clientes registrados o crea uno nuevo. Requiere autenticación.',
-    responses={200: ClientSerializer(many=True), 201: ClientSerializer}
 )
-class ClientListCreateAPIView(generics.ListCreateAPIView):
+class ClientListCreateAPIView(CachedResponseMixin, ConditionalGetMixin, DynamicFieldsViewMixin, FastListMixin, generics.ListCreateAPIView):
     """
     Vista de API para listar y crear clientes.
     
@@ -23,14 +30,18 @@ class ClientListCreateAPIView(generics.ListCreateAPIView):
     queryset = Client.objects.all()
     serializer_class = ClientSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering = ('-created_at', '-pk')
+    filterset_class = ClientFilter
+    ordering_fields = ['name', 'created_at']
 
+@extend_schema_view(get=extend_schema(parameters=DYNAMIC_FIELDS_PARAMETERS))
 @extend_schema(
     tags=['Clientes'],
     summary='Obtener, actualizar y eliminar cliente',
     description='Operaciones CRUD sobre un cliente específico identificado por su ID.',
     responses={200: ClientSerializer, 204: None}
 )
-class ClientRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class ClientRetrieveUpdateDestroyAPIView(CachedResponseMixin, ConditionalGetMixin, DynamicFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vista de API para gestionar un cliente específico.
     
@@ -51,13 +62,13 @@ class ClientRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
 # Service Views
+@extend_schema_view(get=extend_schema(parameters=DYNAMIC_FIELDS_PARAMETERS))
 @extend_schema(
     tags=['Servicios'],
     summary='Listar y crear servicios',
     description='Obtiene una lista de todos los servicios técnicos o crea uno nuevo.',
-    responses={200: ServiceSerializer(many=True), 201: ServiceSerializer}
 )
-class ServiceListCreateAPIView(generics.ListCreateAPIView):
+class ServiceListCreateAPIView(ConditionalGetMixin, DynamicFieldsViewMixin, FastListMixin, generics.ListCreateAPIView):
     """
     Vista de API para listar y crear servicios técnicos.
     
@@ -70,14 +81,18 @@ class ServiceListCreateAPIView(generics.ListCreateAPIView):
     queryset = Service.objects.all()
     serializer_class = ServiceSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering = ('-created_at', '-pk')
+    filterset_class = ServiceFilter
+    ordering_fields = ['created_at']
 
+@extend_schema_view(get=extend_schema(parameters=DYNAMIC_FIELDS_PARAMETERS))
 @extend_schema(
     tags=['Servicios'],
     summary='Obtener, actualizar y eliminar servicio',
     description='Operaciones CRUD sobre un servicio técnico específico.',
     responses={200: ServiceSerializer, 204: None}
 )
-class ServiceRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class ServiceRetrieveUpdateDestroyAPIView(ConditionalGetMixin, DynamicFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vista de API para gestionar un servicio específico.
     
@@ -98,13 +113,13 @@ class ServiceRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView)
     permission_classes = [permissions.IsAuthenticated]
 
 # Technical Report Views
+@extend_schema_view(get=extend_schema(parameters=DYNAMIC_FIELDS_PARAMETERS))
 @extend_schema(
     tags=['Reportes Técnicos'],
     summary='Listar y crear reportes',
     description='Obtiene una lista de reportes técnicos o crea uno nuevo.',
-    responses={200: TechnicalReportSerializer(many=True), 201: TechnicalReportSerializer}
 )
-class TechnicalReportListCreateAPIView(generics.ListCreateAPIView):
+class TechnicalReportListCreateAPIView(ConditionalGetMixin, DynamicFieldsViewMixin, generics.ListCreateAPIView):
     """
     Vista de API para listar y crear reportes técnicos.
     
@@ -117,14 +132,18 @@ class TechnicalReportListCreateAPIView(generics.ListCreateAPIView):
     queryset = TechnicalReport.objects.all()
     serializer_class = TechnicalReportSerializer
     permission_classes = [permissions.IsAuthenticated]
+    ordering = ('-date', '-pk')
+    filterset_class = TechnicalReportFilter
+    ordering_fields = ['date']
 
+@extend_schema_view(get=extend_schema(parameters=DYNAMIC_FIELDS_PARAMETERS))
 @extend_schema(
     tags=['Reportes Técnicos'],
     summary='Obtener, actualizar y eliminar reporte',
     description='Operaciones CRUD sobre un reporte técnico específico.',
     responses={200: TechnicalReportSerializer, 204: None}
 )
-class TechnicalReportRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroyAPIView):
+class TechnicalReportRetrieveUpdateDestroyAPIView(ConditionalGetMixin, DynamicFieldsViewMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Vista de API para gestionar un reporte técnico específico.
     
@@ -143,3 +162,98 @@ class TechnicalReportRetrieveUpdateDestroyAPIView(generics.RetrieveUpdateDestroy
     queryset = TechnicalReport.objects.all()
     serializer_class = TechnicalReportSerializer
     permission_classes = [permissions.IsAuthenticated]
+
+# Exportaciones masivas
+@extend_schema(
+    tags=['Clientes'],
+    summary='Exportar clientes (CSV/NDJSON)',
+    description='Descarga en streaming todos los clientes que cumplen los filtros, sin paginar.',
+    parameters=EXPORT_PARAMETERS + [OpenApiParameter('type', str, enum=[value for value, _ in Client.TYPE_CHOICES])],
+    responses=EXPORT_RESPONSES,
+)
+class ClientExportAPIView(StreamingExportAPIView):
+    """
+    Exporta los clientes en CSV o NDJSON.
+    
+    get:
+    Transmite una fila por cliente; admite ``columns``, ``type``, ``since`` y ``until``.
+    """
+    queryset = Client.objects.all()
+    export_fields = {
+        'id': 'id',
+        'name': 'name',
+        'email': 'email',
+        'phone': 'phone',
+        'company': 'company',
+        'address': 'address',
+        'type': 'type',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    filter_fields = {'type': 'type'}
+    date_field = 'created_at'
+    filename = 'clientes'
+
+@extend_schema(
+    tags=['Servicios'],
+    summary='Exportar servicios (CSV/NDJSON)',
+    description='Descarga en streaming todos los servicios que cumplen los filtros, sin paginar.',
+    parameters=EXPORT_PARAMETERS + [
+        OpenApiParameter('status', str, enum=[value for value, _ in Service.STATUS_CHOICES]),
+        OpenApiParameter('client', int),
+        OpenApiParameter('technician', int),
+        OpenApiParameter('client_type', str, enum=[value for value, _ in Client.TYPE_CHOICES]),
+    ],
+    responses=EXPORT_RESPONSES,
+)
+class ServiceExportAPIView(StreamingExportAPIView):
+    """
+    Exporta los servicios técnicos en CSV o NDJSON.
+    
+    get:
+    Transmite una fila por servicio, con el nombre del cliente y del técnico.
+    """
+    queryset = Service.objects.all()
+    export_fields = {
+        'id': 'id',
+        'title': 'title',
+        'description': 'description',
+        'client': 'client_id',
+        'client_name': 'client__name',
+        'technician': 'technician_id',
+        'technician_username': 'technician__username',
+        'status': 'status',
+        'service_date': 'service_date',
+        'created_at': 'created_at',
+        'updated_at': 'updated_at',
+    }
+    filter_fields = {
+        'status': 'status',
+        'client': 'client',
+        'technician': 'technician',
+        'client_type': 'client__type',
+    }
+    date_field = 'created_at'
+    filename = 'servicios'
+
+# Operaciones masivas
+@bulk_schema(ClientSerializer, 'Clientes', 'clientes')
+class ClientBulkAPIView(BulkAPIView):
+    """
+    Crea, actualiza o elimina clientes en bloque.
+    
+    El correo y el teléfono se validan como únicos dentro del lote y
+    contra la base de datos con una sola consulta.
+    """
+    queryset = Client.objects.all()
+    serializer_class = ClientSerializer
+
+@bulk_schema(ServiceSerializer, 'Servicios', 'servicios')
+class ServiceBulkAPIView(BulkAPIView):
+    """
+    Crea, actualiza o elimina servicios técnicos en bloque.
+    
+    Los clientes y técnicos referenciados se cargan con una consulta por campo.
+    """
+    queryset = Service.objects.all()
+    serializer_class = ServiceSerializer
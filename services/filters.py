@@ -0,0 +1,42 @@
+import django_filters
+from .models import Client, Service, TechnicalReport
+
+
+class ClientFilter(django_filters.FilterSet):
+    """Filtros del listado de clientes de la API."""
+    created = django_filters.DateFromToRangeFilter(field_name='created_at', label='Fecha de creación')
+
+    class Meta:
+        model = Client
+        fields = ['type']
+
+
+class ServiceFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de servicios de la API.
+
+    ``created_after``/``created_before`` y ``service_date_after``/
+    ``service_date_before`` filtran por rango de fechas (inclusive).
+    """
+    client_type = django_filters.ChoiceFilter(field_name='client__type', choices=Client.TYPE_CHOICES, label='Tipo de Cliente')
+    created = django_filters.DateFromToRangeFilter(field_name='created_at', label='Fecha de creación')
+    service_date = django_filters.DateFromToRangeFilter(label='Fecha del servicio')
+
+    class Meta:
+        model = Service
+        fields = ['status', 'technician', 'client']
+
+
+class TechnicalReportFilter(django_filters.FilterSet):
+    """
+    Filtros del listado de reportes técnicos de la API.
+
+    ``date_after``/``date_before`` filtran por la fecha del reporte.
+    """
+    client = django_filters.ModelChoiceFilter(field_name='service__client', queryset=Client.objects.all(), label='Cliente')
+    client_type = django_filters.ChoiceFilter(field_name='service__client__type', choices=Client.TYPE_CHOICES, label='Tipo de Cliente')
+    date = django_filters.DateFromToRangeFilter(label='Fecha')
+
+    class Meta:
+        model = TechnicalReport
+        fields = ['status', 'technician', 'service']
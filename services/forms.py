@@ -1,4 +1,8 @@
+from datetime import datetime, time, timedelta
+
 from django import forms
+from django.contrib.auth.models import User
+from django.utils import timezone
 from .models import Client, Service, TechnicalReport
 
 class ClientForm(forms.ModelForm):
@@ -27,4 +31,128 @@ class TechnicalReportForm(forms.ModelForm):
             'interventions': forms.Textarea(attrs={'rows': 4}),
             'parts_used': forms.Textarea(attrs={'rows': 3}),
             'recommendations': forms.Textarea(attrs={'rows': 3}),
-        }
\ No newline at end of file
+        }
+
+class ListFilterForm(forms.Form):
+    """
+    Formulario base para los filtros de los listados.
+
+    Las subclases declaran sus campos, las opciones de orden permitidas
+    (``SORT_CHOICES``, siempre sobre columnas indexadas) y el campo de fecha
+    sobre el que se aplica el rango ``date_from``/``date_to``.
+    """
+    SORT_CHOICES = []
+    DATE_FIELD = 'created_at'
+
+    date_from = forms.DateField(required=False, label="Desde", widget=forms.DateInput(attrs={'type': 'date'}))
+    date_to = forms.DateField(required=False, label="Hasta", widget=forms.DateInput(attrs={'type': 'date'}))
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['sort'] = forms.ChoiceField(choices=self.SORT_CHOICES, required=False, label="Ordenar por")
+
+    def get_ordering(self):
+        """Devuelve el orden elegido o el primero de ``SORT_CHOICES``."""
+        self.is_valid()
+        return self.cleaned_data.get('sort') or self.SORT_CHOICES[0][0]
+
+    def get_lookups(self):
+        """Traduce los filtros válidos a argumentos de ``QuerySet.filter``."""
+        return {}
+
+    def filter(self, queryset):
+        """Aplica los filtros válidos al queryset; los inválidos se ignoran."""
+        self.is_valid()
+        lookups = self.get_lookups()
+        # El rango se compara contra instantes (no contra ``__date``) para que
+        # la base de datos pueda usar los índices sobre la columna de fecha.
+        date_from = self.cleaned_data.get('date_from')
+        date_to = self.cleaned_data.get('date_to')
+        if date_from:
+            lookups[f'{self.DATE_FIELD}__gte'] = _start_of_day(date_from)
+        if date_to:
+            lookups[f'{self.DATE_FIELD}__lt'] = _start_of_day(date_to + timedelta(days=1))
+        return queryset.filter(**lookups)
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+class ClientFilterForm(ListFilterForm):
+    SORT_CHOICES = [
+        ('name', 'Nombre (A-Z)'),
+        ('-name', 'Nombre (Z-A)'),
+        ('-created_at', 'Más recientes'),
+        ('created_at', 'Más antiguos'),
+    ]
+
+    type = forms.ChoiceField(choices=[('', 'Todos')] + Client.TYPE_CHOICES, required=False, label="Tipo de Cliente")
+
+    def get_lookups(self):
+        lookups = {}
+        if self.cleaned_data.get('type'):
+            lookups['type'] = self.cleaned_data['type']
+        return lookups
+
+
+class ServiceFilterForm(ListFilterForm):
+    SORT_CHOICES = [
+        ('-created_at', 'Más recientes'),
+        ('created_at', 'Más antiguos'),
+    ]
+
+    status = forms.ChoiceField(choices=[('', 'Todos')] + Service.STATUS_CHOICES, required=False, label="Estado")
+    technician = forms.ModelChoiceField(
+        queryset=User.objects.filter(profile__role='technician').order_by('username'),
+        required=False,
+        label="Técnico",
+    )
+    client_type = forms.ChoiceField(choices=[('', 'Todos')] + Client.TYPE_CHOICES, required=False, label="Tipo de Cliente")
+
+    def get_lookups(self):
+        lookups = {}
+        if self.cleaned_data.get('status'):
+            lookups['status'] = self.cleaned_data['status']
+        if self.cleaned_data.get('technician'):
+            lookups['technician'] = self.cleaned_data['technician']
+        if self.cleaned_data.get('client_type'):
+            lookups['client__type'] = self.cleaned_data['client_type']
+        return lookups
+
+
+class TechnicalReportFilterForm(ListFilterForm):
+    SORT_CHOICES = [
+        ('-date', 'Más recientes'),
+        ('date', 'Más antiguos'),
+    ]
+    DATE_FIELD = 'date'
+
+    status = forms.ChoiceField(choices=[('', 'Todos')] + TechnicalReport.STATUS_CHOICES, required=False, label="Estado")
+    technician = forms.ModelChoiceField(
+        queryset=User.objects.filter(profile__role='technician').order_by('username'),
+        required=False,
+        label="Técnico",
+    )
+    client_type = forms.ChoiceField(choices=[('', 'Todos')] + Client.TYPE_CHOICES, required=False, label="Tipo de Cliente")
+
+    def get_lookups(self):
+        lookups = {}
+        if self.cleaned_data.get('status'):
+            lookups['status'] = self.cleaned_data['status']
+        if self.cleaned_data.get('technician'):
+            lookups['technician'] = self.cleaned_data['technician']
+        if self.cleaned_data.get('client_type'):
+            lookups['service__client__type'] = self.cleaned_data['client_type']
+        return lookups
+
+
+class ReportExportForm(TechnicalReportFilterForm):
+    """Filtros de la exportación en ZIP: los del listado más uno o varios clientes."""
+    client = forms.ModelMultipleChoiceField(queryset=Client.objects.all(), required=False, label="Clientes")
+
+    def get_lookups(self):
+        lookups = super().get_lookups()
+        if self.cleaned_data.get('client'):
+            lookups['service__client__in'] = self.cleaned_data['client']
+        return lookups
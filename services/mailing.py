@@ -0,0 +1,215 @@
+"""
+Bandeja de salida de correos de reportes técnicos.
+
+``enqueue_report_email`` registra el correo sin tocar el servidor SMTP.
+``deliver_pending`` (usado por el comando ``send_queued_emails``) toma los
+correos vencidos por lotes, los envía por una única conexión SMTP y
+reprograma los fallidos con espera exponencial hasta agotar los intentos.
+
+Mientras un lote se envía, ``deliver`` renueva cada ``HEARTBEAT_SECONDS``
+el ``updated_at`` de los correos que le faltan: ``requeue_stale`` solo
+devuelve a la cola los de un envío que de verdad se detuvo, no los de un
+envío masivo largo y limitado con ``rate``.
+"""
+import logging
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from . import pdf
+from .models import OutgoingEmail
+
+logger = logging.getLogger(__name__)
+
+# Cada cuánto renueva ``deliver`` los correos que le faltan por enviar; muy
+# por debajo de los 15 minutos de ``requeue_stale``.
+HEARTBEAT_SECONDS = 60
+
+
+def report_email(report, status='pending'):
+    """Construye (sin guardar) el correo de la bandeja para el PDF de un reporte."""
+    return OutgoingEmail(
+        report=report,
+        recipient=report.service.client.email,
+        subject=f'Reporte Técnico - Servicio #{report.service.id}',
+        body=f'Adjunto encontrará el reporte técnico del servicio realizado para {report.service.client.name}.',
+        status=status,
+    )
+
+
+def enqueue_report_email(report):
+    """
+    Registra en la bandeja de salida el envío del PDF de un reporte a su cliente.
+
+    Args:
+        report (TechnicalReport): Reporte con ``service__client`` cargado.
+
+    Returns:
+        OutgoingEmail: El correo encolado.
+    """
+    outgoing = report_email(report)
+    outgoing.save()
+    return outgoing
+
+
+def enqueue_report_emails(reports, status='pending'):
+    """
+    Encola en una sola inserción los correos de varios reportes.
+
+    Omite los reportes que ya tienen un correo pendiente o en envío, para no
+    duplicar envíos si la acción se repite.
+
+    Args:
+        reports: Iterable de reportes con ``service__client`` cargado.
+        status (str): 'pending' para el worker, o 'sending' si quien encola
+            los va a entregar de inmediato con ``deliver``.
+
+    Returns:
+        tuple: (correos creados, reportes omitidos).
+    """
+    reports = list(reports)
+    queued = set(
+        OutgoingEmail.objects.filter(report__in=reports, status__in=['pending', 'sending'])
+        .values_list('report_id', flat=True)
+    )
+    skipped = [report for report in reports if report.pk in queued]
+    created = OutgoingEmail.objects.bulk_create(
+        [report_email(report, status) for report in reports if report.pk not in queued]
+    )
+    return created, skipped
+
+
+def build_message(outgoing, connection=None):
+    """Construye el EmailMessage de un correo de la bandeja, con su PDF adjunto."""
+    message = EmailMessage(
+        outgoing.subject, outgoing.body, settings.DEFAULT_FROM_EMAIL, [outgoing.recipient], connection=connection,
+    )
+    if outgoing.report is not None:
+        path = pdf.get_report_pdf(outgoing.report)
+        message.attach(f'reporte_{outgoing.report.id}.pdf', path.read_bytes(), 'application/pdf')
+    return message
+
+
+def retry_delay(attempts):
+    """Espera antes del siguiente intento: base * 2^(intentos - 1)."""
+    return timedelta(seconds=settings.EMAIL_OUTBOX_RETRY_BASE_SECONDS * 2 ** (attempts - 1))
+
+
+def _claim(batch_size):
+    """Marca como 'sending' hasta ``batch_size`` correos vencidos y los devuelve."""
+    now = timezone.now()
+    with transaction.atomic():
+        ids = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=now)
+            .order_by('next_attempt_at')
+            .values_list('pk', flat=True)[:batch_size]
+        )
+        OutgoingEmail.objects.filter(pk__in=ids).update(status='sending', updated_at=now)
+    return list(OutgoingEmail.objects.filter(pk__in=ids).select_related('report__service__client', 'report__technician'))
+
+
+def touch_sending(batch):
+    """Renueva ``updated_at`` de los correos de ``batch`` que siguen en 'sending'."""
+    OutgoingEmail.objects.filter(pk__in=[outgoing.pk for outgoing in batch], status='sending').update(
+        updated_at=timezone.now(),
+    )
+
+
+def mark_failed(outgoing, error):
+    """Marca un correo como fallido sin más reintentos (p. ej., su PDF no se pudo generar)."""
+    _record_failure(outgoing, error, max_attempts=1)
+
+
+def _record_failure(outgoing, error, max_attempts):
+    outgoing.attempts += 1
+    outgoing.last_error = str(error)
+    if outgoing.attempts >= max_attempts:
+        outgoing.status = 'failed'
+    else:
+        outgoing.status = 'pending'
+        outgoing.next_attempt_at = timezone.now() + retry_delay(outgoing.attempts)
+    outgoing.save(update_fields=['attempts', 'last_error', 'status', 'next_attempt_at', 'updated_at'])
+
+
+def requeue_stale(minutes=15):
+    """Devuelve a 'pending' los correos que quedaron en 'sending' tras una caída."""
+    limit = timezone.now() - timedelta(minutes=minutes)
+    return OutgoingEmail.objects.filter(status='sending', updated_at__lt=limit).update(status='pending')
+
+
+def deliver_pending(batch_size=None, max_attempts=None, connection=None):
+    """
+    Envía un lote de correos pendientes usando una sola conexión SMTP.
+
+    Args:
+        batch_size (int): Máximo de correos del lote.
+        max_attempts (int): Intentos antes de marcar un correo como fallido.
+        connection: Backend de correo a reutilizar; por defecto ``get_connection()``.
+
+    Returns:
+        dict: Conteo de correos ``sent`` y ``failed`` (fallos de este intento).
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    batch = _claim(batch_size)
+    if not batch:
+        return {'sent': 0, 'failed': 0}
+    return deliver(batch, max_attempts=max_attempts, connection=connection)
+
+
+def deliver(batch, max_attempts=None, connection=None, rate=None):
+    """
+    Envía correos ya reclamados (estado 'sending') por una sola conexión SMTP.
+
+    Args:
+        batch (list[OutgoingEmail]): Correos a enviar.
+        max_attempts (int): Intentos antes de marcar un correo como fallido.
+        connection: Backend de correo a reutilizar; por defecto ``get_connection()``.
+        rate (float): Máximo de correos por segundo (None = sin límite).
+
+    Returns:
+        dict: Conteo de correos ``sent`` y ``failed``.
+    """
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    counts = {'sent': 0, 'failed': 0}
+    connection = connection or get_connection()
+    try:
+        connection.open()
+    except Exception as exc:
+        logger.warning('No se pudo abrir la conexión SMTP: %s', exc)
+        for outgoing in batch:
+            _record_failure(outgoing, exc, max_attempts)
+        counts['failed'] = len(batch)
+        return counts
+
+    interval = 1.0 / rate if rate else 0
+    last_sent = None
+    last_touch = time.monotonic()
+    try:
+        for index, outgoing in enumerate(batch):
+            if time.monotonic() - last_touch >= HEARTBEAT_SECONDS:
+                touch_sending(batch[index:])
+                last_touch = time.monotonic()
+            if interval and last_sent is not None:
+                time.sleep(max(0, last_sent + interval - time.monotonic()))
+            last_sent = time.monotonic()
+            try:
+                connection.send_messages([build_message(outgoing, connection)])
+            except Exception as exc:
+                logger.warning('Error al enviar el correo %s: %s', outgoing.pk, exc)
+                _record_failure(outgoing, exc, max_attempts)
+                counts['failed'] += 1
+                continue
+            outgoing.status = 'sent'
+            outgoing.sent_at = timezone.now()
+            outgoing.attempts += 1
+            outgoing.last_error = ''
+            outgoing.save(update_fields=['status', 'sent_at', 'attempts', 'last_error', 'updated_at'])
+            counts['sent'] += 1
+    finally:
+        connection.close()
+    return counts
@@ -0,0 +1,70 @@
+import os
+import sys
+import tempfile
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from services import pdf_export
+from services.models import TechnicalReport
+
+
+class Command(BaseCommand):
+    help = 'Exporta a un ZIP (con manifest.csv) los PDF de los reportes técnicos seleccionados por cliente, fecha o estado'
+
+    def add_arguments(self, parser):
+        parser.add_argument('output', help="Ruta del archivo ZIP a crear, o '-' para la salida estándar.")
+        parser.add_argument('--status', choices=[value for value, _ in TechnicalReport.STATUS_CHOICES],
+                            help='Estado de los reportes (por defecto: todos).')
+        parser.add_argument('--client', type=int, action='append', dest='clients',
+                            help='ID de cliente; se puede repetir.')
+        parser.add_argument('--since', type=_date, help='Fecha inicial del reporte (AAAA-MM-DD).')
+        parser.add_argument('--until', type=_date, help='Fecha final del reporte, inclusive (AAAA-MM-DD).')
+        parser.add_argument('--processes', type=int, default=settings.PDF_WORKER_PROCESSES,
+                            help='Procesos para generar los PDF en paralelo.')
+
+    def handle(self, *args, **options):
+        reports = TechnicalReport.objects.all()
+        if options['status']:
+            reports = reports.filter(status=options['status'])
+        if options['clients']:
+            reports = reports.filter(service__client__in=options['clients'])
+        if options['since']:
+            reports = reports.filter(date__gte=_start_of_day(options['since']))
+        if options['until']:
+            reports = reports.filter(date__lt=_start_of_day(options['until'] + timedelta(days=1)))
+        report_ids = list(reports.order_by('date', 'pk').values_list('pk', flat=True))
+        if not report_ids:
+            raise CommandError('Ningún reporte cumple los filtros.')
+
+        chunks = pdf_export.stream_reports_zip(report_ids, processes=options['processes'])
+        if options['output'] == '-':
+            for chunk in chunks:
+                sys.stdout.buffer.write(chunk)
+            return
+
+        self.stdout.write(f'Exportando {len(report_ids)} reportes con {options["processes"]} procesos...')
+        output = os.path.abspath(options['output'])
+        # Se escribe en un temporal para no dejar un ZIP truncado si se interrumpe.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(output), suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                for chunk in chunks:
+                    tmp.write(chunk)
+            os.replace(tmp_path, output)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.stdout.write(self.style.SUCCESS(
+            f'ZIP creado en {output}. Revise {pdf_export.MANIFEST_NAME} para los reportes que no se pudieron generar.'
+        ))
+
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from services import pdf_jobs
+
+
+class Command(BaseCommand):
+    help = 'Procesa la cola de generación de PDF de reportes técnicos en un grupo de procesos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=settings.PDF_WORKER_PROCESSES,
+                            help='Número máximo de procesos de generación simultáneos.')
+        parser.add_argument('--timeout', type=int, default=settings.PDF_JOB_TIMEOUT,
+                            help='Segundos máximos por trabajo antes de cancelarlo.')
+        parser.add_argument('--memory-limit', type=int, default=settings.PDF_JOB_MEMORY_LIMIT_MB,
+                            help='Memoria máxima por proceso en MB (0 = sin límite).')
+        parser.add_argument('--once', action='store_true',
+                            help='Terminar cuando la cola quede vacía.')
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"Procesando trabajos de PDF con {options['processes']} procesos...")
+        processed = pdf_jobs.run_workers(
+            processes=options['processes'],
+            timeout=options['timeout'],
+            memory_limit_mb=options['memory_limit'],
+            once=options['once'],
+        )
+        self.stdout.write(self.style.SUCCESS(f'{processed} trabajos procesados.'))
@@ -0,0 +1,34 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from services import mailing
+
+
+class Command(BaseCommand):
+    help = 'Envía los correos pendientes de la bandeja de salida por una conexión SMTP reutilizada'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=settings.EMAIL_OUTBOX_BATCH_SIZE,
+                            help='Máximo de correos por lote.')
+        parser.add_argument('--max-attempts', type=int, default=settings.EMAIL_OUTBOX_MAX_ATTEMPTS,
+                            help='Intentos antes de marcar un correo como fallido.')
+        parser.add_argument('--loop', action='store_true',
+                            help='Seguir procesando la cola indefinidamente.')
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help='Segundos de espera entre lotes cuando la cola está vacía (con --loop).')
+
+    def handle(self, *args, **options):
+        mailing.requeue_stale()
+        total = {'sent': 0, 'failed': 0}
+        while True:
+            counts = mailing.deliver_pending(options['batch_size'], options['max_attempts'])
+            for key in total:
+                total[key] += counts[key]
+            if counts['sent'] or counts['failed']:
+                self.stdout.write(f"Lote: {counts['sent']} enviados, {counts['failed']} con error.")
+                continue
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
+        self.stdout.write(self.style.SUCCESS(f"{total['sent']} correos enviados, {total['failed']} con error."))
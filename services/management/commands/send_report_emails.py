@@ -0,0 +1,76 @@
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from services import mailing, pdf_jobs
+from services.models import TechnicalReport
+
+
+class Command(BaseCommand):
+    help = 'Envía por correo, en lote, los reportes técnicos seleccionados por estado, fecha o cliente'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--status', default='final', choices=[value for value, _ in TechnicalReport.STATUS_CHOICES],
+                            help='Estado de los reportes a enviar (por defecto: final).')
+        parser.add_argument('--client', type=int, action='append', dest='clients',
+                            help='ID de cliente; se puede repetir.')
+        parser.add_argument('--since', type=_date, help='Fecha inicial del reporte (AAAA-MM-DD).')
+        parser.add_argument('--until', type=_date, help='Fecha final del reporte, inclusive (AAAA-MM-DD).')
+        parser.add_argument('--rate', type=float, default=settings.EMAIL_BULK_RATE,
+                            help='Máximo de correos por segundo.')
+        parser.add_argument('--processes', type=int, default=settings.PDF_WORKER_PROCESSES,
+                            help='Procesos para generar los PDF en paralelo.')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Solo mostrar qué reportes se enviarían.')
+
+    def handle(self, *args, **options):
+        reports = TechnicalReport.objects.select_related('service__client', 'technician').filter(status=options['status'])
+        if options['clients']:
+            reports = reports.filter(service__client__in=options['clients'])
+        if options['since']:
+            reports = reports.filter(date__gte=_start_of_day(options['since']))
+        if options['until']:
+            reports = reports.filter(date__lt=_start_of_day(options['until'] + timedelta(days=1)))
+        reports = list(reports.order_by('date', 'pk'))
+
+        if options['dry_run']:
+            for report in reports:
+                self.stdout.write(f'#{report.pk} {report.service.title} → {report.service.client.email}')
+            self.stdout.write(f'{len(reports)} reportes seleccionados.')
+            return
+
+        # Los correos se crean ya reclamados ('sending') para que el worker de
+        # la bandeja no los tome mientras este comando los envía.
+        batch, skipped = mailing.enqueue_report_emails(reports, status='sending')
+        self.stdout.write(f'Generando {len(batch)} PDF con {options["processes"]} procesos...')
+        render_failures = pdf_jobs.render_many(
+            [outgoing.report for outgoing in batch], options['processes'], settings.PDF_JOB_MEMORY_LIMIT_MB,
+        )
+        # Sin su PDF no se envían: build_message lo generaría aquí mismo, sin
+        # el tiempo ni la memoria máximos de los procesos de generación.
+        for outgoing in batch:
+            error = render_failures.get(outgoing.report_id)
+            if error:
+                self.stderr.write(f'Reporte #{outgoing.report_id}: {error}')
+                mailing.mark_failed(outgoing, f'No se pudo generar el PDF: {error}')
+        batch = [outgoing for outgoing in batch if outgoing.report_id not in render_failures]
+        # La generación pudo tardar: se renuevan antes de que requeue_stale los tome.
+        mailing.touch_sending(batch)
+
+        self.stdout.write(f'Enviando {len(batch)} correos (máx. {options["rate"]}/s)...')
+        counts = mailing.deliver(batch, rate=options['rate'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Enviados: {counts['sent']}, fallidos: {counts['failed']}, "
+            f"sin PDF: {len(render_failures)}, omitidos (ya en cola): {len(skipped)}."
+        ))
+        if counts['failed']:
+            self.stdout.write('Los correos fallidos quedan en la bandeja de salida para reintentarse con send_queued_emails.')
+
+
+def _date(value):
+    return datetime.strptime(value, '%Y-%m-%d').date()
+
+
+def _start_of_day(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
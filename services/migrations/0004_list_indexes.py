@@ -0,0 +1,51 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0003_service_service_date'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['name', 'id'], name='client_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['type', 'name', 'id'], name='client_type_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['-created_at', '-id'], name='client_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['-created_at', '-id'], name='service_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['status', '-created_at', '-id'], name='service_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['technician', '-created_at', '-id'], name='service_tech_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technicalreport',
+            index=models.Index(fields=['-date', '-id'], name='report_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technicalreport',
+            index=models.Index(fields=['status', '-date', '-id'], name='report_status_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technicalreport',
+            index=models.Index(fields=['technician', '-date', '-id'], name='report_tech_date_idx'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0004_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PdfRenderJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cache_key', models.CharField(max_length=64, verbose_name='Clave de Caché')),
+                ('status', models.CharField(choices=[('queued', 'En cola'), ('running', 'Generando'), ('done', 'Listo'), ('failed', 'Fallido')], default='queued', max_length=20, verbose_name='Estado')),
+                ('error', models.TextField(blank=True, verbose_name='Error')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Fecha de Creación')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Inicio')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Fin')),
+                ('report', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='pdf_jobs', to='services.technicalreport', verbose_name='Reporte')),
+            ],
+            options={
+                'verbose_name': 'Trabajo de PDF',
+                'verbose_name_plural': 'Trabajos de PDF',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='pdfjob_status_created_idx'), models.Index(fields=['report', 'cache_key'], name='pdfjob_report_key_idx')],
+            },
+        ),
+    ]
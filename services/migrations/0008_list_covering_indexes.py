@@ -0,0 +1,55 @@
+# Generated by Django 5.2.8 on 2026-10-18 07:44
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0007_api_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='client',
+            name='client_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='client',
+            name='client_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='service',
+            name='service_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='service',
+            name='service_status_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='technicalreport',
+            name='report_date_idx',
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['name', 'id'], include=('email', 'phone', 'company', 'type', 'created_at', 'updated_at'), name='client_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(fields=['-created_at', '-id'], include=('name', 'email', 'phone', 'company', 'type', 'updated_at'), name='client_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['-created_at', '-id'], include=('title', 'client', 'technician', 'status', 'service_date', 'updated_at'), name='service_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['status', '-created_at', '-id'], include=('title', 'client', 'technician', 'service_date', 'updated_at'), name='service_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='technicalreport',
+            index=models.Index(fields=['-date', '-id'], include=('service', 'technician', 'status', 'signature', 'signature_image', 'warranty_period', 'created_at', 'updated_at'), name='report_date_idx'),
+        ),
+    ]
@@ -1,5 +1,18 @@
 from django.db import models
 from django.contrib.auth.models import User
+from django.utils import timezone
+from personal_tech.response_cache import VersionedManager
+
+# Columnas que leen los listados (las páginas, y la API cuando se piden
+# con ``?fields=``), sin los TextField. Los
+# índices del orden por defecto de cada listado las incluyen (INCLUDE) para
+# que PostgreSQL pueda responder la página con un index-only scan.
+CLIENT_LIST_FIELDS = ('name', 'email', 'phone', 'company', 'type', 'created_at', 'updated_at')
+SERVICE_LIST_FIELDS = ('title', 'client', 'technician', 'status', 'service_date', 'created_at', 'updated_at')
+REPORT_LIST_FIELDS = (
+    'service', 'technician', 'date', 'status', 'signature', 'signature_image', 'warranty_period',
+    'created_at', 'updated_at',
+)
 
 class Client(models.Model):
     """
@@ -21,10 +34,24 @@ class Client(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Fecha de Actualización")
 
+    # Invalida la caché de respuestas de la API (personal_tech.response_cache).
+    objects = VersionedManager()
 
     class Meta:
         verbose_name = "Cliente"
         verbose_name_plural = "Clientes"
+        indexes = [
+            models.Index(
+                fields=['name', 'id'], name='client_name_idx',
+                include=['email', 'phone', 'company', 'type', 'created_at', 'updated_at'],
+            ),
+            models.Index(fields=['type', 'name', 'id'], name='client_type_name_idx'),
+            models.Index(
+                fields=['-created_at', '-id'], name='client_created_idx',
+                include=['name', 'email', 'phone', 'company', 'type', 'updated_at'],
+            ),
+            models.Index(fields=['type', '-created_at', '-id'], name='client_type_created_idx'),
+        ]
 
     def __str__(self):
         """Devuelve el nombre del cliente."""
@@ -52,9 +79,25 @@ class Service(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
 
+    # Avisa de las escrituras masivas (índice de búsqueda, caché de la API).
+    objects = VersionedManager()
+
     class Meta:
         verbose_name = "Servicio"
         verbose_name_plural = "Servicios"
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'], name='service_created_idx',
+                include=['title', 'client', 'technician', 'status', 'service_date', 'updated_at'],
+            ),
+            models.Index(
+                fields=['status', '-created_at', '-id'], name='service_status_created_idx',
+                include=['title', 'client', 'technician', 'service_date', 'updated_at'],
+            ),
+            models.Index(fields=['technician', '-created_at', '-id'], name='service_tech_created_idx'),
+            models.Index(fields=['technician', 'status', '-created_at', '-id'], name='service_tech_status_idx'),
+            models.Index(fields=['client', '-created_at', '-id'], name='service_client_created_idx'),
+        ]
 
     def __str__(self):
         """Devuelve el título del servicio."""
@@ -67,6 +110,10 @@ class TechnicalReport(models.Model):
     Incluye el diagnóstico, las intervenciones realizadas, repuestos utilizados,
     recomendaciones y la firma del cliente.
     """
+    STATUS_CHOICES = [
+        ('draft', 'Borrador'),
+        ('final', 'Final'),
+    ]
     service = models.OneToOneField(Service, on_delete=models.CASCADE, verbose_name="Servicio")
     technician = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, verbose_name="Técnico")
     date = models.DateTimeField(auto_now_add=True, verbose_name="Fecha")
@@ -74,17 +121,102 @@ class TechnicalReport(models.Model):
     interventions = models.TextField(verbose_name="Intervenciones")
     parts_used = models.TextField(blank=True, verbose_name="Repuestos Utilizados")
     recommendations = models.TextField(blank=True, verbose_name="Recomendaciones")
-    status = models.CharField(max_length=20, choices=[('draft', 'Borrador'), ('final', 'Final')], default='draft', verbose_name="Estado")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='draft', verbose_name="Estado")
     signature = models.CharField(max_length=100, blank=True, verbose_name="Firma (Nombre)")
     signature_image = models.ImageField(upload_to='signatures/', null=True, blank=True, verbose_name="Imagen de Firma")
     warranty_period = models.CharField(max_length=100, blank=True, help_text="Ej: 3 meses, 1 año", verbose_name="Garantía")
     created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
     updated_at = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
 
+    # Avisa de las escrituras masivas (índice de búsqueda, caché de la API).
+    objects = VersionedManager()
+
     class Meta:
         verbose_name = "Reporte Técnico"
         verbose_name_plural = "Reportes Técnicos"
+        indexes = [
+            models.Index(
+                fields=['-date', '-id'], name='report_date_idx',
+                include=[
+                    'service', 'technician', 'status', 'signature', 'signature_image', 'warranty_period',
+                    'created_at', 'updated_at',
+                ],
+            ),
+            models.Index(fields=['status', '-date', '-id'], name='report_status_date_idx'),
+            models.Index(fields=['technician', '-date', '-id'], name='report_tech_date_idx'),
+        ]
 
     def __str__(self):
         """Devuelve una representación legible del reporte."""
         return f'Reporte para {self.service}'
+
+class PdfRenderJob(models.Model):
+    """
+    Trabajo de generación del PDF de un reporte técnico.
+
+    Las vistas crean el trabajo y el comando ``run_pdf_workers`` lo procesa
+    en un grupo acotado de procesos, fuera del ciclo de la petición web.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'En cola'),
+        ('running', 'Generando'),
+        ('done', 'Listo'),
+        ('failed', 'Fallido'),
+    ]
+    report = models.ForeignKey(TechnicalReport, on_delete=models.CASCADE, related_name='pdf_jobs', verbose_name="Reporte")
+    cache_key = models.CharField(max_length=64, verbose_name="Clave de Caché")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued', verbose_name="Estado")
+    error = models.TextField(blank=True, verbose_name="Error")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
+    started_at = models.DateTimeField(null=True, blank=True, verbose_name="Inicio")
+    finished_at = models.DateTimeField(null=True, blank=True, verbose_name="Fin")
+
+    class Meta:
+        verbose_name = "Trabajo de PDF"
+        verbose_name_plural = "Trabajos de PDF"
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='pdfjob_status_created_idx'),
+            models.Index(fields=['report', 'cache_key'], name='pdfjob_report_key_idx'),
+        ]
+
+    def __str__(self):
+        """Devuelve una representación legible del trabajo."""
+        return f'PDF del reporte {self.report_id} ({self.get_status_display()})'
+
+class OutgoingEmail(models.Model):
+    """
+    Correo pendiente de envío (bandeja de salida transaccional).
+
+    Las vistas solo registran el correo; el comando ``send_queued_emails``
+    lo entrega en segundo plano, reintentando con espera exponencial.
+    Si está asociado a un reporte, su PDF se adjunta al momento del envío.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pendiente'),
+        ('sending', 'Enviando'),
+        ('sent', 'Enviado'),
+        ('failed', 'Fallido'),
+    ]
+    report = models.ForeignKey(TechnicalReport, on_delete=models.CASCADE, null=True, blank=True, related_name='emails', verbose_name="Reporte")
+    recipient = models.EmailField(verbose_name="Destinatario")
+    subject = models.CharField(max_length=255, verbose_name="Asunto")
+    body = models.TextField(verbose_name="Mensaje")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name="Estado")
+    attempts = models.PositiveIntegerField(default=0, verbose_name="Intentos")
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name="Próximo Intento")
+    last_error = models.TextField(blank=True, verbose_name="Último Error")
+    sent_at = models.DateTimeField(null=True, blank=True, verbose_name="Fecha de Envío")
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name="Fecha de Creación")
+    updated_at = models.DateTimeField(auto_now=True, verbose_name="Última Actualización")
+
+    class Meta:
+        verbose_name = "Correo Saliente"
+        verbose_name_plural = "Correos Salientes"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='email_status_next_idx'),
+            models.Index(fields=['report', '-created_at'], name='email_report_created_idx'),
+        ]
+
+    def __str__(self):
+        """Devuelve una representación legible del correo."""
+        return f'{self.subject} → {self.recipient}'
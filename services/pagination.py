@@ -0,0 +1,123 @@
+"""
+Paginación por cursor (keyset) para los listados HTML.
+
+En lugar de ``OFFSET`` cada página se pide a partir de la última fila vista
+(valor del campo de orden + ``id`` como desempate), de modo que el costo de
+una página no crece con su posición y las inserciones concurrentes no
+desplazan ni duplican filas entre páginas.
+"""
+import base64
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+
+
+class InvalidCursor(Exception):
+    """El cursor recibido no se puede decodificar."""
+
+
+class KeysetPage:
+    """Una página de resultados y los cursores para navegar desde ella."""
+
+    def __init__(self, object_list, next_cursor=None, previous_cursor=None):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    @property
+    def has_next(self):
+        return self.next_cursor is not None
+
+    @property
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    @property
+    def has_other_pages(self):
+        return self.has_next or self.has_previous
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+class KeysetPaginator:
+    """
+    Pagina un queryset ordenado por un campo y por ``id``.
+
+    Args:
+        queryset: Queryset ya filtrado.
+        ordering (str): Campo de orden, con ``-`` para orden descendente.
+            Debe ser un campo no nulo del modelo.
+        per_page (int): Número de filas por página.
+    """
+
+    def __init__(self, queryset, ordering, per_page=25):
+        self.queryset = queryset
+        self.descending = ordering.startswith('-')
+        self.field_name = ordering.lstrip('-')
+        self.field = queryset.model._meta.get_field(self.field_name)
+        self.per_page = per_page
+
+    def page(self, cursor=None):
+        """
+        Devuelve la página que sigue (o precede) al cursor indicado.
+
+        Args:
+            cursor (str): Cursor opaco recibido en la URL, o None para la
+                primera página.
+
+        Returns:
+            KeysetPage: Filas de la página y cursores de navegación.
+
+        Raises:
+            InvalidCursor: Si el cursor está corrupto.
+        """
+        if cursor:
+            value, pk, backwards = self._decode(cursor)
+        else:
+            value = pk = None
+            backwards = False
+
+        # Al retroceder se recorre el orden inverso y luego se invierte la página.
+        descending = self.descending != backwards
+        prefix = '-' if descending else ''
+        queryset = self.queryset.order_by(prefix + self.field_name, prefix + 'pk')
+        if cursor:
+            lookup = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{self.field_name}__{lookup}': value})
+                | Q(**{self.field_name: value, f'pk__{lookup}': pk})
+            )
+
+        rows = list(queryset[:self.per_page + 1])
+        has_more = len(rows) > self.per_page
+        rows = rows[:self.per_page]
+        if backwards:
+            rows.reverse()
+
+        if not rows:
+            return KeysetPage(rows)
+        next_cursor = previous_cursor = None
+        if has_more or backwards:
+            next_cursor = self._encode(rows[-1], backwards=False)
+        if cursor and (has_more or not backwards):
+            previous_cursor = self._encode(rows[0], backwards=True)
+        return KeysetPage(rows, next_cursor, previous_cursor)
+
+    def _encode(self, obj, backwards):
+        value = self.field.value_from_object(obj)
+        value = value.isoformat() if hasattr(value, 'isoformat') else value
+        payload = json.dumps([value, obj.pk, int(backwards)], separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def _decode(self, cursor):
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            value, pk, backwards = json.loads(base64.urlsafe_b64decode(padded))
+            return self.field.to_python(value), int(pk), bool(backwards)
+        except (ValueError, TypeError, ValidationError) as exc:
+            raise InvalidCursor(cursor) from exc
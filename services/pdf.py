@@ -0,0 +1,132 @@
+"""
+Generación y caché en disco de los PDF de reportes técnicos.
+
+Cada PDF se guarda con un nombre derivado de su contenido: el id del reporte,
+las fechas de actualización del reporte, su servicio y su cliente, el técnico
+(id, usuario y nombre; ``User`` no tiene fecha de actualización) y las
+versiones de la plantilla y de los recursos (``pdf_assets``). Si cualquiera
+de ellos cambia la clave cambia, así que nunca se sirve un PDF
+desactualizado; las señales de ``services.signals`` borran además los
+archivos viejos al guardar.
+"""
+import functools
+import hashlib
+import os
+import shutil
+import tempfile
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import get_template
+from xhtml2pdf import pisa
+
+from . import pdf_assets
+from .pdf_assets import link_callback
+
+PDF_TEMPLATE = 'services/technical_report_pdf.html'
+
+
+class PdfRenderError(Exception):
+    """xhtml2pdf no pudo generar el PDF."""
+
+
+@functools.lru_cache(maxsize=None)
+def template_version():
+    """Hash del código fuente de la plantilla del PDF (una vez por proceso)."""
+    source = get_template(PDF_TEMPLATE).template.source
+    return hashlib.sha256(source.encode()).hexdigest()[:12]
+
+
+def cache_key(report):
+    """
+    Calcula la clave de caché del PDF de un reporte.
+
+    Args:
+        report (TechnicalReport): Reporte con ``service__client`` y
+            ``technician`` cargados.
+
+    Returns:
+        str: Hash hexadecimal que identifica el contenido del PDF.
+    """
+    technician = report.technician
+    parts = [
+        str(report.pk),
+        report.updated_at.isoformat(),
+        report.service.updated_at.isoformat(),
+        report.service.client.updated_at.isoformat(),
+        str(report.technician_id),
+        technician.username if technician else '',
+        technician.get_full_name() if technician else '',
+        template_version(),
+        pdf_assets.version(PDF_TEMPLATE),
+    ]
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()
+
+
+def report_cache_dir(report_id):
+    """Directorio que agrupa las versiones en caché del PDF de un reporte."""
+    return Path(settings.REPORT_PDF_CACHE_DIR) / f'reporte_{report_id}'
+
+
+def cache_path(report):
+    """Ruta del archivo en caché correspondiente al estado actual del reporte."""
+    return report_cache_dir(report.pk) / f'{cache_key(report)}.pdf'
+
+
+def render_html(report):
+    """Renderiza la plantilla HTML del PDF para un reporte."""
+    return get_template(PDF_TEMPLATE).render({'report': report})
+
+
+def render_pdf(report):
+    """
+    Genera el PDF de un reporte sin pasar por la caché.
+
+    Raises:
+        PdfRenderError: Si xhtml2pdf reporta errores.
+
+    Returns:
+        bytes: Contenido del PDF.
+    """
+    output = BytesIO()
+    pisa_status = pisa.CreatePDF(render_html(report), dest=output, link_callback=link_callback)
+    if pisa_status.err:
+        raise PdfRenderError(f'Error al generar el PDF del reporte {report.pk}')
+    return output.getvalue()
+
+
+def write_cache_file(path, content):
+    """Escribe el PDF de forma atómica para que nunca se lea a medio escribir."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp:
+            tmp.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+        raise
+
+
+def get_report_pdf(report):
+    """
+    Devuelve la ruta del PDF de un reporte, generándolo si no está en caché.
+
+    Args:
+        report (TechnicalReport): Reporte con ``service__client`` y
+            ``technician`` cargados.
+
+    Returns:
+        Path: Ruta del archivo PDF en la caché.
+    """
+    path = cache_path(report)
+    if not path.exists():
+        write_cache_file(path, render_pdf(report))
+    return path
+
+
+def invalidate(report_id):
+    """Elimina todas las versiones en caché del PDF de un reporte."""
+    shutil.rmtree(report_cache_dir(report_id), ignore_errors=True)
@@ -0,0 +1,176 @@
+"""
+Recursos (imágenes y archivos estáticos) del generador de PDF.
+
+``link_callback`` resuelve las URIs del HTML una sola vez por proceso y
+sustituye las imágenes grandes por versiones reducidas al tamaño de
+impresión, guardadas junto a la caché de PDF. El logo original (1024x1024
+RGBA) hacía que reportlab dedicara casi todo el tiempo de cada render a
+volver a comprimirlo y codificarlo.
+"""
+import functools
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.template.loader import get_template
+from PIL import Image
+from reportlab import rl_config
+
+# ASCII85 agranda los flujos un 25 % y su codificación en Python puro era el
+# paso más lento de reportlab con imágenes; los flujos binarios son válidos.
+rl_config.useA85 = 0
+
+RASTER_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.gif', '.bmp', '.webp'}
+STATIC_TAG_RE = re.compile(r"""{%\s*static\s+['"]([^'"]+)['"]\s*%}""")
+
+# Cambiar este valor invalida los PDF en caché generados con la capa anterior.
+ASSETS_VERSION = '1'
+
+
+def version(template_name):
+    """
+    Identifica los recursos de una plantilla para la clave de caché del PDF.
+
+    Incluye la fecha de modificación y el tamaño de cada archivo estático
+    que usa la plantilla: reemplazar el logo invalida los PDF en caché.
+    """
+    parts = [ASSETS_VERSION, str(settings.PDF_IMAGE_MAX_PX)]
+    for path in template_assets(template_name):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        parts.append(f'{path}:{stat.st_mtime_ns}:{stat.st_size}')
+    return hashlib.sha256('|'.join(parts).encode()).hexdigest()[:12]
+
+
+@functools.lru_cache(maxsize=None)
+def template_assets(template_name):
+    """Rutas de los archivos estáticos (``{% static %}``) de una plantilla, una vez por proceso."""
+    source = get_template(template_name).template.source
+    return tuple(filter(None, (find_static(static_path) for static_path in STATIC_TAG_RE.findall(source))))
+
+
+@functools.lru_cache(maxsize=256)
+def find_static(path):
+    """
+    Versión memorizada de ``staticfiles.finders.find``.
+
+    Con el almacenamiento con hash de producción, ``{% static %}`` genera
+    nombres como ``icno_tras.3f2a1c.png`` que solo existen en
+    ``STATIC_ROOT``; si los buscadores no encuentran el archivo se busca ahí.
+    """
+    found = finders.find(path)
+    if found is None:
+        try:
+            candidate = staticfiles_storage.path(path)
+        except (NotImplementedError, SuspiciousFileOperation):
+            return None
+        found = candidate if os.path.isfile(candidate) else None
+    return found
+
+
+def prepared_image(path):
+    """
+    Devuelve la versión lista para imprimir de una imagen.
+
+    Args:
+        path (str): Ruta absoluta de la imagen original.
+
+    Returns:
+        str: Ruta de la imagen reducida, o la original si no hace falta
+        reducirla o no es una imagen.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path
+    return _prepare(path, stat.st_mtime_ns, stat.st_size, settings.REPORT_PDF_CACHE_DIR)
+
+
+@functools.lru_cache(maxsize=128)
+def _prepare(path, mtime_ns, size, cache_dir):
+    if Path(path).suffix.lower() not in RASTER_EXTENSIONS:
+        return path
+    max_px = settings.PDF_IMAGE_MAX_PX
+    digest = hashlib.sha256(f'{path}|{mtime_ns}|{size}|{max_px}'.encode()).hexdigest()
+    target = Path(cache_dir) / 'assets' / f'{digest}.png'
+    if target.exists():
+        return str(target)
+
+    try:
+        with Image.open(path) as image:
+            if max(image.size) <= max_px:
+                return path
+            image.thumbnail((max_px, max_px), Image.LANCZOS)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=target.parent, suffix='.tmp')
+            with os.fdopen(fd, 'wb') as tmp:
+                image.save(tmp, format='PNG', optimize=True)
+            os.replace(tmp_path, target)
+    except (OSError, Image.DecompressionBombError):
+        return path
+    return str(target)
+
+
+def link_callback(uri, rel):
+    """
+    Convierte URIs HTML a rutas absolutas del sistema para xhtml2pdf.
+
+    Permite que el generador de PDF acceda a recursos estáticos y multimedia.
+
+    Args:
+        uri (str): La URI del recurso.
+        rel (str): La relación del recurso.
+
+    Returns:
+        str: La ruta absoluta al archivo o la URI original si no se encuentra.
+    """
+    original = uri
+    # Remove leading slash if present to avoid absolute path issues
+    if uri.startswith('/'):
+        uri = uri[1:]
+
+    # Handle static files
+    if uri.startswith('static/'):
+        # Remove 'static/' prefix
+        static_path = uri[7:]  # len('static/') = 7
+        result = find_static(static_path)
+        if result:
+            return prepared_image(result)
+
+    # Try to find the file directly
+    result = find_static(uri)
+    if result:
+        return prepared_image(result)
+
+    # Handle media files
+    if uri.startswith(settings.MEDIA_URL.lstrip('/')):
+        media_path = uri.replace(settings.MEDIA_URL.lstrip('/'), '')
+        full_path = os.path.join(settings.MEDIA_ROOT, media_path)
+        if os.path.isfile(full_path):
+            return prepared_image(full_path)
+
+    # Absolute filesystem paths (e.g. signature_image.path)
+    if os.path.isabs(original) and os.path.isfile(original):
+        return prepared_image(original)
+
+    # If nothing works, return the original URI
+    return uri
+
+
+def warm_up(template_name):
+    """
+    Resuelve y prepara los recursos estáticos que usa una plantilla.
+
+    Los procesos de generación lo llaman al arrancar para que los hijos
+    creados con ``fork`` hereden los recursos ya resueltos.
+    """
+    for path in template_assets(template_name):
+        prepared_image(path)
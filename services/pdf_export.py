@@ -0,0 +1,180 @@
+"""
+Exportación en ZIP de los PDF de varios reportes técnicos.
+
+``stream_reports_zip`` produce el archivo por fragmentos: ``zipfile`` escribe
+sobre un flujo no posicionable (``ZipStream``) que se vacía después de cada
+bloque, así que la memoria usada no depende del número de reportes. Con
+``render`` (el comando ``export_reports``) los PDF que no están en caché se
+generan por lotes en un grupo de procesos, y el lote siguiente se genera
+mientras se transmite el actual; sin él (la vista web) solo se incluyen los
+que ya están en caché, y la vista encola los demás en ``PdfRenderJob``. Al
+final se agrega ``manifest.csv`` con una fila por reporte, incluidos los que
+fallaron.
+"""
+import csv
+import hashlib
+import io
+import zipfile
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.utils import timezone
+
+from . import pdf, pdf_assets, pdf_jobs
+from .models import TechnicalReport
+
+MANIFEST_NAME = 'manifest.csv'
+MANIFEST_FIELDS = ['archivo', 'reporte', 'servicio', 'cliente', 'fecha', 'estado', 'tecnico', 'bytes', 'sha256', 'error']
+READ_SIZE = 64 * 1024
+NOT_CACHED = 'El PDF no está generado.'
+
+
+class ZipStream:
+    """Destino de ``zipfile`` que guarda lo escrito hasta que se lee con ``drain``."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def pdf_filename(report):
+    """Nombre del PDF de un reporte dentro del ZIP (el mismo de ``generate_pdf``)."""
+    return f'reporte_{report.pk}.pdf'
+
+
+def _batches(report_ids, size):
+    """Carga los reportes por lotes, conservando el orden de ``report_ids``."""
+    queryset = TechnicalReport.objects.select_related('service__client', 'technician')
+    for start in range(0, len(report_ids), size):
+        ids = report_ids[start:start + size]
+        by_id = queryset.in_bulk(ids)
+        yield [by_id[pk] for pk in ids if pk in by_id]
+
+
+def _manifest_row(report, error=''):
+    return {
+        'archivo': '' if error else pdf_filename(report),
+        'reporte': report.pk,
+        'servicio': report.service.title,
+        'cliente': report.service.client.name,
+        'fecha': timezone.localtime(report.date).strftime('%Y-%m-%d %H:%M'),
+        'estado': report.get_status_display(),
+        'tecnico': report.technician.get_username() if report.technician else '',
+        'bytes': '',
+        'sha256': '',
+        'error': error,
+    }
+
+
+def _write_pdf(archive, stream, report, row):
+    """Copia el PDF en caché al ZIP por bloques, completando su fila del manifiesto."""
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        source = open(pdf.cache_path(report), 'rb')
+    except OSError as exc:
+        # El reporte pudo modificarse (y su caché borrarse) durante la exportación.
+        row.update(archivo='', error=str(exc))
+        return
+    info = zipfile.ZipInfo(row['archivo'], date_time=timezone.localtime(report.updated_at).timetuple()[:6])
+    info.compress_type = zipfile.ZIP_DEFLATED
+    with source, archive.open(info, 'w') as target:
+        while chunk := source.read(READ_SIZE):
+            target.write(chunk)
+            digest.update(chunk)
+            size += len(chunk)
+            yield stream.drain()
+    row.update(bytes=size, sha256=digest.hexdigest())
+
+
+def missing_pdfs(report_ids, batch_size=500):
+    """
+    Reportes de ``report_ids`` cuyo PDF no está en caché.
+
+    Returns:
+        list: Reportes con ``service__client`` y ``technician`` cargados.
+    """
+    return [
+        report
+        for reports in _batches(list(report_ids), batch_size)
+        for report in reports
+        if not pdf.cache_path(report).exists()
+    ]
+
+
+def _cached(report_ids, batch_size):
+    """Lotes de reportes con el error de los que no están en caché."""
+    for reports in _batches(report_ids, batch_size):
+        yield reports, {report.pk: NOT_CACHED for report in reports if not pdf.cache_path(report).exists()}
+
+
+def _rendered(executor, report_ids, memory_limit_mb, batch_size):
+    """Lotes de reportes con el error de los que no se pudieron generar."""
+    batches = _batches(report_ids, batch_size)
+    reports = next(batches, [])
+    futures = pdf_jobs.submit_renders(executor, reports, memory_limit_mb)
+    while reports:
+        # El lote siguiente se genera mientras se escribe el actual.
+        following = next(batches, [])
+        following_futures = pdf_jobs.submit_renders(executor, following, memory_limit_mb)
+        yield reports, pdf_jobs.collect_renders(executor, futures)
+        reports, futures = following, following_futures
+
+
+def _generate(report_ids, processes, memory_limit_mb, batch_size, render):
+    stream = ZipStream()
+    manifest = io.StringIO()
+    writer = csv.DictWriter(manifest, MANIFEST_FIELDS)
+    writer.writeheader()
+
+    with ExitStack() as stack:
+        if render:
+            pdf_assets.warm_up(pdf.PDF_TEMPLATE)
+            executor = stack.enter_context(pdf_jobs.render_pool(processes))
+            batches = _rendered(executor, report_ids, memory_limit_mb, batch_size)
+        else:
+            batches = _cached(report_ids, batch_size)
+        archive = stack.enter_context(zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED))
+        for reports, failures in batches:
+            for report in reports:
+                row = _manifest_row(report, failures.get(report.pk, ''))
+                if not row['error']:
+                    yield from _write_pdf(archive, stream, report, row)
+                writer.writerow(row)
+        # utf-8-sig para que Excel reconozca los acentos.
+        archive.writestr(MANIFEST_NAME, manifest.getvalue().encode('utf-8-sig'))
+    yield stream.drain()
+
+
+def stream_reports_zip(report_ids, processes=None, memory_limit_mb=None, batch_size=None, render=True):
+    """
+    Genera el ZIP con los PDF de los reportes indicados, fragmento a fragmento.
+
+    Args:
+        report_ids (list[int]): Reportes, en el orden en que van en el archivo.
+        processes (int): Procesos de generación de PDF.
+        memory_limit_mb (int): Memoria máxima por proceso (0 = sin límite).
+        batch_size (int): Reportes cargados y enviados a generar por lote.
+        render (bool): Generar los PDF que no están en caché; si es False
+            se omiten y el manifiesto lo indica.
+
+    Returns:
+        Iterator[bytes]: Fragmentos consecutivos del archivo ZIP.
+    """
+    processes = processes or settings.PDF_WORKER_PROCESSES
+    if memory_limit_mb is None:
+        memory_limit_mb = settings.PDF_JOB_MEMORY_LIMIT_MB
+    batch_size = batch_size or processes * 4
+    chunks = _generate(list(report_ids), processes, memory_limit_mb, batch_size, render)
+    return (chunk for chunk in chunks if chunk)
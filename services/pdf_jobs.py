@@ -0,0 +1,381 @@
+"""
+Generación de PDF fuera de la petición web.
+
+Las vistas llaman a ``request_render`` para encolar un ``PdfRenderJob``; el
+comando ``run_pdf_workers`` ejecuta ``run_workers``, que reclama trabajos de
+la cola y los reparte en un grupo acotado de procesos hijos. Cada hijo solo
+ejecuta xhtml2pdf sobre el HTML ya renderizado (no usa la base de datos),
+con un límite de memoria propio y un tiempo máximo que vigila el proceso
+supervisor.
+
+Los procesos por lotes (``render_many``, la exportación ZIP) usan en cambio
+un ``ProcessPoolExecutor``; ``collect_renders`` aplica ahí el mismo tiempo
+máximo y detiene el grupo si una generación se cuelga.
+"""
+import logging
+import multiprocessing
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextlib import contextmanager
+from datetime import timedelta
+from io import BytesIO
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils import timezone
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Códigos de salida de los procesos hijos.
+EXIT_PDF_ERROR = 2
+EXIT_MEMORY = 3
+
+EXIT_MESSAGES = {
+    EXIT_PDF_ERROR: 'xhtml2pdf reportó errores al generar el PDF.',
+    EXIT_MEMORY: 'Se excedió el límite de memoria del proceso.',
+}
+TIMEOUT_MESSAGE = 'Se excedió el tiempo máximo de {timeout} s.'
+CANCELLED_MESSAGE = 'No se generó: el grupo de procesos se detuvo por un tiempo excedido.'
+
+
+def request_render(report):
+    """
+    Encola la generación del PDF de un reporte, reutilizando un trabajo pendiente.
+
+    Args:
+        report (TechnicalReport): Reporte con ``service__client`` y ``technician``
+            cargados.
+
+    Returns:
+        PdfRenderJob: Trabajo en cola, en curso o ya terminado.
+    """
+    from . import pdf
+    from .models import PdfRenderJob
+
+    key = pdf.cache_key(report)
+    job = (
+        PdfRenderJob.objects.filter(report=report, cache_key=key, status__in=['queued', 'running'])
+        .order_by('-created_at')
+        .first()
+    )
+    if job is None:
+        job = PdfRenderJob.objects.create(report=report, cache_key=key)
+    return job
+
+
+def request_renders(reports):
+    """
+    Encola de una vez la generación de varios PDF (exportación web).
+
+    Args:
+        reports: Reportes con ``service__client`` y ``technician`` cargados.
+
+    Returns:
+        int: Trabajos nuevos; los reportes con un trabajo pendiente no se repiten.
+    """
+    from . import pdf
+    from .models import PdfRenderJob
+
+    keys = {report.pk: pdf.cache_key(report) for report in reports}
+    pending = set(
+        PdfRenderJob.objects.filter(report__in=keys, status__in=['queued', 'running'])
+        .values_list('report_id', 'cache_key')
+    )
+    jobs = [PdfRenderJob(report_id=pk, cache_key=key) for pk, key in keys.items() if (pk, key) not in pending]
+    PdfRenderJob.objects.bulk_create(jobs)
+    return len(jobs)
+
+
+def render_to_file(html, path, memory_limit):
+    """
+    Punto de entrada de los procesos hijos: genera el PDF y lo escribe en caché.
+
+    Args:
+        html (str): Plantilla ya renderizada.
+        path (str): Ruta destino en la caché de PDF.
+        memory_limit (int): Límite de memoria virtual en bytes (0 = sin límite).
+    """
+    if memory_limit and resource is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+
+    import django
+    from django.apps import apps
+    if not apps.ready:  # método de arranque 'spawn'
+        django.setup()
+    from xhtml2pdf import pisa
+    from . import pdf
+
+    try:
+        output = BytesIO()
+        pisa_status = pisa.CreatePDF(html, dest=output, link_callback=pdf.link_callback)
+        if pisa_status.err:
+            sys.exit(EXIT_PDF_ERROR)
+        pdf.write_cache_file(Path(path), output.getvalue())
+    except MemoryError:
+        sys.exit(EXIT_MEMORY)
+
+
+def _mp_context():
+    # 'fork' evita volver a importar Django y xhtml2pdf en cada trabajo.
+    method = 'fork' if 'fork' in multiprocessing.get_all_start_methods() else 'spawn'
+    return multiprocessing.get_context(method)
+
+
+def _claim(limit):
+    """Marca como 'running' hasta ``limit`` trabajos en cola y devuelve sus ids."""
+    from .models import PdfRenderJob
+
+    with transaction.atomic():
+        ids = list(
+            PdfRenderJob.objects.select_for_update(skip_locked=True)
+            .filter(status='queued')
+            .order_by('created_at')
+            .values_list('pk', flat=True)[:limit]
+        )
+        PdfRenderJob.objects.filter(pk__in=ids).update(status='running', started_at=timezone.now())
+    return ids
+
+
+def _finish(job_id, status, error=''):
+    from .models import PdfRenderJob
+
+    PdfRenderJob.objects.filter(pk=job_id).update(status=status, error=error, finished_at=timezone.now())
+
+
+def _requeue_stale(timeout):
+    """Devuelve a la cola los trabajos de un supervisor que terminó abruptamente."""
+    from .models import PdfRenderJob
+
+    limit = timezone.now() - timedelta(seconds=timeout * 2)
+    return PdfRenderJob.objects.filter(status='running', started_at__lt=limit).update(status='queued', started_at=None)
+
+
+def _start(job_id, context, memory_limit):
+    """Prepara el HTML de un trabajo y lanza su proceso hijo."""
+    from . import pdf
+    from .models import PdfRenderJob
+
+    job = PdfRenderJob.objects.select_related('report__service__client', 'report__technician').get(pk=job_id)
+    report = job.report
+    path = pdf.cache_path(report)
+    # El reporte pudo cambiar desde que se encoló: se genera su estado actual.
+    PdfRenderJob.objects.filter(pk=job_id).update(cache_key=pdf.cache_key(report))
+    if path.exists():
+        _finish(job_id, 'done')
+        return None
+
+    html = pdf.render_html(report)
+    # El hijo no usa la base de datos; cerrar las conexiones evita que herede
+    # el socket del padre.
+    connections.close_all()
+    process = context.Process(target=render_to_file, args=(html, str(path), memory_limit), daemon=True)
+    process.start()
+    return process
+
+
+def _reap(running, timeout):
+    """Registra los trabajos terminados y detiene los que excedieron el tiempo."""
+    for job_id, (process, started) in list(running.items()):
+        if process.is_alive():
+            if time.monotonic() - started <= timeout:
+                continue
+            process.terminate()
+            process.join(5)
+            if process.is_alive():
+                process.kill()
+                process.join()
+            _finish(job_id, 'failed', TIMEOUT_MESSAGE.format(timeout=timeout))
+            logger.warning('Trabajo de PDF %s cancelado por tiempo.', job_id)
+        elif process.exitcode == 0:
+            _finish(job_id, 'done')
+        else:
+            message = EXIT_MESSAGES.get(process.exitcode, f'El proceso terminó con código {process.exitcode}.')
+            _finish(job_id, 'failed', message)
+            logger.warning('Trabajo de PDF %s fallido: %s', job_id, message)
+        del running[job_id]
+
+
+def run_workers(processes, timeout, memory_limit_mb, poll_interval=1.0, once=False):
+    """
+    Procesa la cola de trabajos de PDF con un máximo de ``processes`` hijos.
+
+    Args:
+        processes (int): Número máximo de procesos simultáneos.
+        timeout (int): Segundos máximos por trabajo.
+        memory_limit_mb (int): Memoria máxima por proceso hijo (0 = sin límite).
+        poll_interval (float): Espera entre consultas a la cola vacía.
+        once (bool): Terminar cuando la cola quede vacía.
+
+    Returns:
+        int: Número de trabajos procesados.
+    """
+    from . import pdf, pdf_assets
+
+    context = _mp_context()
+    memory_limit = memory_limit_mb * 1024 * 1024
+    running = {}
+    pdf_assets.warm_up(pdf.PDF_TEMPLATE)
+    processed = 0
+    _requeue_stale(timeout)
+
+    while True:
+        _reap(running, timeout)
+        claimed = []
+        free = processes - len(running)
+        if free > 0:
+            claimed = _claim(free)
+            for job_id in claimed:
+                processed += 1
+                try:
+                    process = _start(job_id, context, memory_limit)
+                except Exception as exc:
+                    logger.exception('No se pudo iniciar el trabajo de PDF %s', job_id)
+                    _finish(job_id, 'failed', str(exc))
+                    continue
+                if process is not None:
+                    running[job_id] = (process, time.monotonic())
+        if once and not running and not claimed:
+            return processed
+        if not claimed:
+            time.sleep(poll_interval if not running else 0.1)
+
+
+@contextmanager
+def render_pool(processes):
+    """
+    Grupo de procesos de generación para ``submit_renders``.
+
+    Se cierran las conexiones a la base de datos antes de crear los procesos
+    y, con ``fork``, se lanzan todos de inmediato para que ninguno herede una
+    conexión abierta más tarde por el proceso padre.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=processes, mp_context=_mp_context()) as executor:
+        executor.submit(int).result()
+        yield executor
+
+
+def stop_pool(executor):
+    """Cancela las generaciones que no empezaron y termina los procesos del grupo."""
+    processes = list((executor._processes or {}).values())
+    executor.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        process.join(5)
+        if process.is_alive():
+            process.kill()
+            process.join()
+
+
+def submit_renders(executor, reports, memory_limit_mb=0):
+    """
+    Envía al grupo la generación de los PDF que aún no están en caché.
+
+    El HTML se renderiza aquí, en el proceso padre: es la única parte que
+    necesita la base de datos.
+
+    Returns:
+        dict: Futuro de cada generación enviada, con el id de su reporte.
+    """
+    from . import pdf
+
+    memory_limit = memory_limit_mb * 1024 * 1024
+    futures = {}
+    for report in reports:
+        path = pdf.cache_path(report)
+        if not path.exists():
+            html = pdf.render_html(report)
+            try:
+                future = executor.submit(render_to_file, html, str(path), memory_limit)
+            except RuntimeError:
+                # ``stop_pool`` ya detuvo el grupo.
+                future = Future()
+                future.cancel()
+            futures[future] = report.pk
+    return futures
+
+
+def _render_error(future):
+    if future.cancelled():
+        return CANCELLED_MESSAGE
+    try:
+        future.result()
+    except SystemExit as exc:
+        return EXIT_MESSAGES.get(exc.code, f'El proceso terminó con código {exc.code}.')
+    except Exception as exc:
+        return str(exc) or exc.__class__.__name__
+    return None
+
+
+def collect_renders(executor, futures, timeout=None):
+    """
+    Espera las generaciones de ``submit_renders``.
+
+    Si ninguna termina en ``timeout`` segundos, las que están en curso
+    llevan al menos ese tiempo: se dan por colgadas, se detiene el grupo
+    (``stop_pool``) y todas las pendientes cuentan como fallidas.
+
+    Args:
+        executor: Grupo de ``render_pool`` que ejecuta las generaciones.
+        futures (dict): Resultado de ``submit_renders``.
+        timeout (int): Segundos máximos por generación; por defecto
+            ``PDF_JOB_TIMEOUT``.
+
+    Returns:
+        dict: Mensaje de error por id de reporte, solo para los que fallaron.
+    """
+    timeout = settings.PDF_JOB_TIMEOUT if timeout is None else timeout
+    failures = {}
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        if not done:
+            logger.warning('Generación de PDF sin terminar tras %s s; se detiene el grupo de procesos.', timeout)
+            stop_pool(executor)
+            for future in pending:
+                failures[futures[future]] = (
+                    CANCELLED_MESSAGE if future.cancelled() else TIMEOUT_MESSAGE.format(timeout=timeout)
+                )
+            break
+        for future in done:
+            error = _render_error(future)
+            if error:
+                failures[futures[future]] = error
+    return failures
+
+
+def render_many(reports, processes, memory_limit_mb=0, timeout=None):
+    """
+    Genera en paralelo los PDF de varios reportes que aún no están en caché.
+
+    Lo usan los procesos por lotes (envío masivo, exportaciones), que no pasan
+    por la cola de ``PdfRenderJob``.
+
+    Args:
+        reports: Reportes con ``service__client`` y ``technician`` cargados.
+        processes (int): Número de procesos de generación.
+        memory_limit_mb (int): Memoria máxima por proceso (0 = sin límite).
+        timeout (int): Segundos máximos por generación; por defecto
+            ``PDF_JOB_TIMEOUT``.
+
+    Returns:
+        dict: Mensaje de error por id de reporte, solo para los que fallaron.
+    """
+    from . import pdf, pdf_assets
+
+    reports = [report for report in reports if not pdf.cache_path(report).exists()]
+    if not reports:
+        return {}
+    pdf_assets.warm_up(pdf.PDF_TEMPLATE)
+    with render_pool(processes) as executor:
+        return collect_renders(executor, submit_renders(executor, reports, memory_limit_mb), timeout)
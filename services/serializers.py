@@ -1,7 +1,31 @@
+from django.contrib.auth.models import User
 from rest_framework import serializers
+from personal_tech.fieldsets import DynamicFieldsSerializerMixin
 from .models import Client, Service, TechnicalReport
 
-class ClientSerializer(serializers.ModelSerializer):
+
+class ClientSummarySerializer(serializers.ModelSerializer):
+    """Datos básicos del cliente para ``?expand=client``."""
+    class Meta:
+        model = Client
+        fields = ['id', 'name', 'email', 'phone', 'company', 'type']
+
+
+class TechnicianSummarySerializer(serializers.ModelSerializer):
+    """Datos básicos del técnico para ``?expand=technician``."""
+    class Meta:
+        model = User
+        fields = ['id', 'username', 'first_name', 'last_name', 'email']
+
+
+class ServiceSummarySerializer(serializers.ModelSerializer):
+    """Datos básicos del servicio para ``?expand=service``."""
+    class Meta:
+        model = Service
+        fields = ['id', 'title', 'status', 'service_date', 'client', 'technician']
+
+
+class ClientSerializer(DynamicFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Client.
     
@@ -12,24 +36,38 @@ class ClientSerializer(serializers.ModelSerializer):
         model = Client
         fields = '__all__'
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(DynamicFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo Service.
     
     Maneja la conversión de datos de servicios técnicos a JSON y viceversa.
-    Permite la creación y actualización de servicios.
+    Permite la creación y actualización de servicios. En lectura admite
+    ``?fields=`` y ``?expand=client,technician``.
     """
+    expandable_fields = {
+        'client': (ClientSummarySerializer, 'client'),
+        'technician': (TechnicianSummarySerializer, 'technician'),
+    }
+
     class Meta:
         model = Service
         fields = '__all__'
 
-class TechnicalReportSerializer(serializers.ModelSerializer):
+class TechnicalReportSerializer(DynamicFieldsSerializerMixin, serializers.ModelSerializer):
     """
     Serializador para el modelo TechnicalReport.
     
     Maneja la conversión de datos de reportes técnicos a JSON y viceversa.
     Se utiliza para generar y consultar los reportes finales de los servicios.
+    En lectura admite ``?fields=`` y ``?expand=service,client,technician``
+    (``client`` es el cliente del servicio).
     """
+    expandable_fields = {
+        'service': (ServiceSummarySerializer, 'service'),
+        'client': (ClientSummarySerializer, 'service.client'),
+        'technician': (TechnicianSummarySerializer, 'technician'),
+    }
+
     class Meta:
         model = TechnicalReport
         fields = '__all__'
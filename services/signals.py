@@ -0,0 +1,34 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from personal_tech.signals import bulk_saved
+from .models import Client, Service, TechnicalReport
+from . import pdf
+
+
+@receiver(post_save, sender=TechnicalReport)
+@receiver(post_delete, sender=TechnicalReport)
+def invalidate_report_pdf(sender, instance, **kwargs):
+    pdf.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=Service)
+def invalidate_service_pdfs(sender, instance, **kwargs):
+    for report_id in TechnicalReport.objects.filter(service=instance).values_list('pk', flat=True):
+        pdf.invalidate(report_id)
+
+
+@receiver(post_save, sender=Client)
+def invalidate_client_pdfs(sender, instance, **kwargs):
+    for report_id in TechnicalReport.objects.filter(service__client=instance).values_list('pk', flat=True):
+        pdf.invalidate(report_id)
+
+
+@receiver(bulk_saved, sender=Service)
+@receiver(bulk_saved, sender=Client)
+def invalidate_bulk_updated_pdfs(sender, updated, **kwargs):
+    if not updated:
+        return
+    lookup = 'service__in' if sender is Service else 'service__client__in'
+    ids = [after.pk for _, after in updated]
+    for report_id in TechnicalReport.objects.filter(**{lookup: ids}).values_list('pk', flat=True):
+        pdf.invalidate(report_id)
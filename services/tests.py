@@ -1,3 +1,850 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import smtplib
+import multiprocessing
+import os
+import shutil
+import tempfile
+import time
+import zipfile
+from datetime import timedelta
+from types import SimpleNamespace
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from accounts.roles import set_role
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import mail
+from django.core.cache import caches
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.mail.backends.locmem import EmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.http import http_date
+
+from personal_tech.signals import bulk_saved
+from personal_tech.query_budget import QueryBudgetExceeded, query_budget
+from quotes.models import Quote, QUOTE_LIST_FIELDS
+from reports.models import Report
+from . import mailing, pdf, pdf_assets, pdf_jobs
+from .forms import ClientFilterForm, ReportExportForm, ServiceFilterForm, TechnicalReportFilterForm
+from .models import (
+    Client, Service, TechnicalReport, OutgoingEmail, PdfRenderJob,
+    CLIENT_LIST_FIELDS, SERVICE_LIST_FIELDS, REPORT_LIST_FIELDS,
+)
+from .pagination import InvalidCursor, KeysetPaginator
+from .views import LIST_PAGE_SIZE, client_list, report_list, service_list
+
+# TextField que los listados no deben leer (en la API, al pedir solo las columnas del listado).
+LARGE_TEXT_COLUMNS = {
+    Client: ['address'],
+    Service: ['description'],
+    TechnicalReport: ['diagnosis', 'interventions', 'parts_used', 'recommendations'],
+    Quote: ['description'],
+    Report: ['content'],
+}
+
+
+class ListQueryColumnsTests(TestCase):
+    """Los listados solo leen las columnas que muestran (en la API, las pedidas con ``fields``)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        technician = User.objects.create_user('tecnico', first_name='Ana', last_name='Pérez')
+        for i in range(3):
+            client = Client.objects.create(
+                name=f'Cliente {i}', email=f'cliente{i}@example.com', phone=f'300000000{i}',
+                company='Empresa', address='Calle larga ' * 50,
+            )
+            service = Service.objects.create(
+                title=f'Servicio {i}', description='Descripción larga ' * 50, client=client, technician=technician,
+            )
+            TechnicalReport.objects.create(
+                service=service, technician=technician, diagnosis='Diagnóstico ' * 50,
+                interventions='Intervenciones ' * 50, parts_used='Repuestos', recommendations='Recomendaciones',
+            )
+            Quote.objects.create(
+                client_name=f'Cliente {i}', client_email=f'cliente{i}@example.com', client_phone='3000000000',
+                description='Descripción larga ' * 50,
+            )
+            Report.objects.create(title=f'Reporte {i}', content='Contenido ' * 50)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def assertNoLargeTextColumns(self, url, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params, HTTP_ACCEPT='application/json')
+        self.assertEqual(response.status_code, 200, url)
+        columns = [f'"{column}"' for names in LARGE_TEXT_COLUMNS.values() for column in names]
+        for query in queries:
+            for column in columns:
+                self.assertNotIn(column, query['sql'], f'{url} lee {column}')
+        return response
+
+    def test_pages_do_not_read_large_text_columns(self):
+        for name in ('client_list', 'service_list', 'report_list'):
+            with self.subTest(page=name):
+                self.assertNoLargeTextColumns(reverse(name))
+
+    def test_api_lists_keep_full_representation_by_default(self):
+        for name, columns in (('api-client-list', ['address']), ('api-service-list', ['description']),
+                              ('api-report-list', ['diagnosis', 'interventions']),
+                              ('api-quote-list', ['description']), ('api-general-report-list', ['content'])):
+            with self.subTest(endpoint=name):
+                result = self.client.get(reverse(name)).json()['results'][0]
+                for column in columns:
+                    self.assertIn(column, result)
+
+    def test_api_lists_with_fields_do_not_read_large_text_columns(self):
+        for name, fields in (('api-client-list', CLIENT_LIST_FIELDS), ('api-service-list', SERVICE_LIST_FIELDS),
+                             ('api-report-list', REPORT_LIST_FIELDS), ('api-quote-list', QUOTE_LIST_FIELDS),
+                             ('api-general-report-list', ('title', 'generated_at', 'file'))):
+            with self.subTest(endpoint=name):
+                response = self.assertNoLargeTextColumns(reverse(name), fields=','.join(['id', *fields]))
+                self.assertEqual(len(response.json()['results']), 3)
+
+    def test_api_lists_with_expand_do_not_read_large_text_columns(self):
+        self.assertNoLargeTextColumns(
+            reverse('api-service-list'), fields=','.join(['id', *SERVICE_LIST_FIELDS]), expand='client,technician',
+        )
+        self.assertNoLargeTextColumns(
+            reverse('api-report-list'), fields=','.join(['id', *REPORT_LIST_FIELDS]), expand='service,client',
+        )
+
+    def test_large_text_columns_can_be_requested(self):
+        response = self.client.get(reverse('api-service-list'), {'fields': 'id,description'})
+        self.assertEqual(response.json()['results'][0]['description'], 'Descripción larga ' * 50)
+        response = self.client.get(reverse('api-client-detail', args=[Client.objects.first().pk]))
+        self.assertIn('address', response.json())
+
+
+class KeysetPaginatorTests(TestCase):
+    """La paginación por cursor recorre todas las filas una sola vez, en ambos sentidos."""
+
+    @classmethod
+    def setUpTestData(cls):
+        # Tres nombres repetidos: el orden depende del desempate por id.
+        Client.objects.bulk_create([
+            Client(name=f'Cliente {i % 3}', email=f'cliente{i}@example.com', phone=f'30000000{i:02}')
+            for i in range(31)
+        ])
+        Client.objects.filter(pk__in=list(Client.objects.values_list('pk', flat=True)[:10])).update(
+            created_at=timezone.now() - timedelta(days=1),
+        )
+
+    def walk(self, paginator):
+        pages = [paginator.page()]
+        while pages[-1].has_next:
+            self.assertLess(len(pages), 10, 'La paginación no termina')
+            pages.append(paginator.page(pages[-1].next_cursor))
+        return pages
+
+    def test_forward_and_backward_cover_every_row_once(self):
+        for ordering in ('name', '-name', 'created_at', '-created_at'):
+            with self.subTest(ordering=ordering):
+                prefix = '-' if ordering.startswith('-') else ''
+                expected = list(Client.objects.order_by(ordering, prefix + 'pk').values_list('pk', flat=True))
+                paginator = KeysetPaginator(Client.objects.all(), ordering, per_page=7)
+                pages = self.walk(paginator)
+                self.assertEqual([len(page) for page in pages], [7, 7, 7, 7, 3])
+                self.assertEqual([client.pk for page in pages for client in page], expected)
+                self.assertFalse(pages[0].has_previous)
+
+                backwards = [pages[-1]]
+                while backwards[-1].has_previous:
+                    self.assertLess(len(backwards), 10, 'La paginación no termina')
+                    backwards.append(paginator.page(backwards[-1].previous_cursor))
+                self.assertEqual(
+                    [[client.pk for client in page] for page in reversed(backwards)],
+                    [[client.pk for client in page] for page in pages],
+                )
+
+    def test_rows_inserted_between_pages_are_not_repeated(self):
+        paginator = KeysetPaginator(Client.objects.all(), 'name', per_page=10)
+        first = paginator.page()
+        Client.objects.create(name='Cliente 0', email='nuevo@example.com', phone='3009999999')
+        second = paginator.page(first.next_cursor)
+        self.assertFalse({client.pk for client in first} & {client.pk for client in second})
+
+    def test_empty_queryset(self):
+        page = KeysetPaginator(Client.objects.none(), 'name').page()
+        self.assertEqual(list(page), [])
+        self.assertFalse(page.has_other_pages)
+
+    def test_invalid_cursors(self):
+        paginator = KeysetPaginator(Client.objects.all(), '-created_at')
+        valid = paginator.page().next_cursor
+
+        def encode(payload):
+            return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+
+        for cursor in ('no-es-un-cursor!', valid[:-3], encode({'a': 1}), encode(None),
+                       encode(['no-es-fecha', 1, 0]), encode(['2024-01-01T00:00:00', 'x', 0])):
+            with self.subTest(cursor=cursor), self.assertRaises(InvalidCursor):
+                paginator.page(cursor)
+
+    def test_service_list_pages(self):
+        user = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        self.client.force_login(user)
+        client = Client.objects.first()
+        Service.objects.bulk_create([
+            Service(title=f'Servicio {i}', description='Revisión.', client=client) for i in range(LIST_PAGE_SIZE + 5)
+        ])
+        seen = []
+        cursor = ''
+        while True:
+            page = self.client.get(reverse('service_list'), {'cursor': cursor} if cursor else {}).context['page']
+            seen += [service.pk for service in page]
+            if not page.has_next:
+                break
+            self.assertLess(len(seen), 100, 'La paginación no termina')
+            cursor = page.next_cursor
+        self.assertEqual(seen, list(Service.objects.order_by('-created_at', '-pk').values_list('pk', flat=True)))
+
+        # Un cursor inválido muestra la primera página.
+        page = self.client.get(reverse('service_list'), {'cursor': 'roto'}).context['page']
+        self.assertEqual([service.pk for service in page], seen[:LIST_PAGE_SIZE])
+
+
+class FilterFormTests(TestCase):
+    """Cada campo de los formularios de filtro limita el queryset."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.technician = User.objects.create_user('tecnico')
+        set_role(cls.technician, 'technician')
+        other = User.objects.create_user('otro')
+        set_role(other, 'technician')
+        cls.contract = Client.objects.create(name='Beta', email='beta@example.com', phone='1', type='contract')
+        cls.punctual = Client.objects.create(name='Alfa', email='alfa@example.com', phone='2', type='punctual')
+        cls.services = [
+            Service.objects.create(title='Contrato', description='-', client=cls.contract,
+                                   technician=cls.technician, status='completed'),
+            Service.objects.create(title='Puntual', description='-', client=cls.punctual,
+                                   technician=other, status='pending'),
+        ]
+        cls.reports = [
+            TechnicalReport.objects.create(service=service, technician=service.technician, diagnosis='-',
+                                           interventions='-', status=status)
+            for service, status in zip(cls.services, ('final', 'draft'))
+        ]
+        old = timezone.now() - timedelta(days=10)
+        Client.objects.filter(pk=cls.punctual.pk).update(created_at=old)
+        Service.objects.filter(pk=cls.services[1].pk).update(created_at=old)
+        TechnicalReport.objects.filter(pk=cls.reports[1].pk).update(date=old)
+        cls.old_day = timezone.localdate(old)
+
+    def filtered(self, form_class, model, **data):
+        form = form_class(data)
+        return list(form.filter(model.objects.all()).order_by('pk'))
+
+    def test_client_filters(self):
+        self.assertEqual(self.filtered(ClientFilterForm, Client, type='contract'), [self.contract])
+        self.assertEqual(self.filtered(ClientFilterForm, Client, date_to=self.old_day), [self.punctual])
+        self.assertEqual(self.filtered(ClientFilterForm, Client, date_from=self.old_day + timedelta(days=1)),
+                         [self.contract])
+        self.assertEqual(self.filtered(ClientFilterForm, Client, date_from=self.old_day, date_to=self.old_day),
+                         [self.punctual])
+
+    def test_service_filters(self):
+        contract, punctual = self.services
+        self.assertEqual(self.filtered(ServiceFilterForm, Service, status='completed'), [contract])
+        self.assertEqual(self.filtered(ServiceFilterForm, Service, technician=self.technician.pk), [contract])
+        self.assertEqual(self.filtered(ServiceFilterForm, Service, client_type='punctual'), [punctual])
+        self.assertEqual(self.filtered(ServiceFilterForm, Service, date_to=self.old_day), [punctual])
+        self.assertEqual(self.filtered(ServiceFilterForm, Service, status='completed', client_type='punctual'), [])
+
+    def test_report_filters(self):
+        final, draft = self.reports
+        self.assertEqual(self.filtered(TechnicalReportFilterForm, TechnicalReport, status='final'), [final])
+        self.assertEqual(self.filtered(TechnicalReportFilterForm, TechnicalReport, technician=self.technician.pk),
+                         [final])
+        self.assertEqual(self.filtered(TechnicalReportFilterForm, TechnicalReport, client_type='punctual'), [draft])
+        self.assertEqual(self.filtered(TechnicalReportFilterForm, TechnicalReport, date_to=self.old_day), [draft])
+        self.assertEqual(self.filtered(ReportExportForm, TechnicalReport, client=[self.contract.pk]), [final])
+
+    def test_invalid_values_are_ignored(self):
+        everything = list(Service.objects.order_by('pk'))
+        self.assertEqual(self.filtered(ServiceFilterForm, Service, status='otro', date_from='ayer'), everything)
+        # Solo se ofrecen técnicos.
+        admin = User.objects.create_user('admin')
+        self.assertEqual(self.filtered(ServiceFilterForm, Service, technician=admin.pk), everything)
+
+    def test_ordering(self):
+        self.assertEqual(ClientFilterForm({}).get_ordering(), 'name')
+        self.assertEqual(ClientFilterForm({'sort': '-created_at'}).get_ordering(), '-created_at')
+        self.assertEqual(ClientFilterForm({'sort': 'address'}).get_ordering(), 'name')
+        self.assertEqual(TechnicalReportFilterForm({}).get_ordering(), '-date')
+
+
+def _two_queries_view(request):
+    User.objects.count()
+    Client.objects.count()
+    return HttpResponse('ok')
+
+
+class QueryBudgetTests(TestCase):
+    """Los listados no superan su presupuesto de consultas, sin importar el número de filas."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        cls.technician = User.objects.create_user('tecnico')
+
+    def create_rows(self, count):
+        start = Client.objects.count()
+        for i in range(start, start + count):
+            client = Client.objects.create(name=f'Cliente {i}', email=f'c{i}@example.com', phone=f'31{i:08d}')
+            service = Service.objects.create(
+                title=f'Servicio {i}', description='Descripción', client=client, technician=self.technician,
+            )
+            TechnicalReport.objects.create(service=service, technician=self.technician, diagnosis='Diagnóstico')
+
+    def count_queries(self, name):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse(name))
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_list_pages_stay_within_budget(self):
+        self.client.force_login(self.user)
+        self.create_rows(1)
+        views = {'client_list': client_list, 'service_list': service_list, 'report_list': report_list}
+        few = {name: self.count_queries(name) for name in views}
+        self.create_rows(30)
+        for name, view in views.items():
+            with self.subTest(page=name):
+                many = self.count_queries(name)
+                self.assertEqual(many, few[name])
+                self.assertLessEqual(many, view.query_budget)
+
+    def test_exceeding_the_budget_fails_in_strict_mode(self):
+        request = RequestFactory().get('/')
+        view = query_budget(1)(_two_queries_view)
+        with override_settings(QUERY_BUDGET_STRICT=True):
+            with self.assertRaises(QueryBudgetExceeded):
+                view(request)
+        with override_settings(QUERY_BUDGET_STRICT=False):
+            with self.assertLogs('query_budget', 'WARNING'):
+                self.assertEqual(view(request).status_code, 200)
+
+
+@override_settings(PDF_RENDER_INLINE=False)
+class ExportReportsZipTests(TestCase):
+    """La exportación web exige un rol y nunca genera PDF en la petición."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.technician = User.objects.create_user('tecnico')
+        set_role(cls.technician, 'technician')
+        cls.client_user = User.objects.create_user('cliente')
+        set_role(cls.client_user, 'client')
+        client = Client.objects.create(name='Cliente', email='cliente@example.com', phone='3000000000')
+        service = Service.objects.create(title='Servicio', description='Descripción', client=client)
+        cls.report = TechnicalReport.objects.create(service=service, technician=cls.technician, diagnosis='Diagnóstico')
+
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        override = override_settings(REPORT_PDF_CACHE_DIR=cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.url = reverse('export_reports_zip')
+
+    def test_requires_login_and_role(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 302)
+        self.assertIn(reverse('login'), response['Location'])
+        self.client.force_login(self.client_user)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_missing_pdfs_are_queued(self):
+        self.client.force_login(self.technician)
+        response = self.client.get(self.url)
+        self.assertRedirects(response, reverse('report_list') + '?', fetch_redirect_response=False)
+        self.assertEqual(PdfRenderJob.objects.filter(report=self.report, status='queued').count(), 1)
+        self.client.get(self.url)
+        self.assertEqual(PdfRenderJob.objects.filter(report=self.report).count(), 1)
+
+    def test_cached_pdfs_are_streamed(self):
+        report = TechnicalReport.objects.select_related('service__client', 'technician').get(pk=self.report.pk)
+        pdf.write_cache_file(pdf.cache_path(report), b'%PDF-1.4 prueba')
+        self.client.force_login(self.technician)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(archive.read(f'reporte_{report.pk}.pdf'), b'%PDF-1.4 prueba')
+        self.assertFalse(PdfRenderJob.objects.exists())
+
+
+def _hang(*args):
+    time.sleep(60)
+
+
+def _allocate(*args, **kwargs):
+    return bytearray(512 * 1024 * 1024)
+
+
+def _virtual_memory():
+    with open('/proc/self/status') as status:
+        for line in status:
+            if line.startswith('VmSize:'):
+                return int(line.split()[1]) * 1024
+
+
+@skipUnless('fork' in multiprocessing.get_all_start_methods(), 'Los procesos hijos heredan los mocks con fork.')
+@override_settings(PDF_RENDER_INLINE=False)
+class PdfJobTests(TestCase):
+    """Cola de trabajos de PDF, procesos de generación y vistas de espera."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.technician = User.objects.create_user('tecnico')
+        client = Client.objects.create(name='Cliente', email='cliente@example.com', phone='3000000000')
+        service = Service.objects.create(title='Servicio', description='Descripción', client=client)
+        cls.report = TechnicalReport.objects.create(service=service, technician=cls.technician, diagnosis='Diagnóstico')
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        override = override_settings(REPORT_PDF_CACHE_DIR=self.cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+    def load_report(self):
+        return TechnicalReport.objects.select_related('service__client', 'technician').get(pk=self.report.pk)
+
+    def run_child(self, memory_limit=0):
+        path = os.path.join(self.cache_dir, 'reporte.pdf')
+        process = pdf_jobs._mp_context().Process(
+            target=pdf_jobs.render_to_file, args=(pdf.render_html(self.load_report()), path, memory_limit),
+        )
+        process.start()
+        process.join(30)
+        return process.exitcode, os.path.exists(path)
+
+    def run_workers(self, timeout=30):
+        return pdf_jobs.run_workers(1, timeout, 0, poll_interval=0.01, once=True)
+
+    def test_request_render_reuses_pending_job(self):
+        job = pdf_jobs.request_render(self.load_report())
+        self.assertEqual(pdf_jobs.request_render(self.load_report()), job)
+        self.assertEqual(pdf_jobs.request_renders([self.load_report()]), 0)
+        PdfRenderJob.objects.filter(pk=job.pk).update(status='failed')
+        self.assertNotEqual(pdf_jobs.request_render(self.load_report()), job)
+
+    def test_claim_takes_oldest_queued_jobs(self):
+        jobs = [PdfRenderJob.objects.create(report=self.report, cache_key=str(i)) for i in range(3)]
+        PdfRenderJob.objects.filter(pk=jobs[0].pk).update(status='done')
+        self.assertEqual(pdf_jobs._claim(1), [jobs[1].pk])
+        self.assertEqual(pdf_jobs._claim(5), [jobs[2].pk])
+        self.assertEqual(pdf_jobs._claim(5), [])
+        self.assertEqual(
+            list(PdfRenderJob.objects.order_by('pk').values_list('status', flat=True)), ['done', 'running', 'running'],
+        )
+
+    def test_render_to_file_writes_pdf(self):
+        self.assertEqual(self.run_child(), (0, True))
+
+    def test_render_to_file_exit_codes(self):
+        with mock.patch('xhtml2pdf.pisa.CreatePDF', return_value=SimpleNamespace(err=1)):
+            self.assertEqual(self.run_child(), (pdf_jobs.EXIT_PDF_ERROR, False))
+        if pdf_jobs.resource is None or not os.path.exists('/proc/self/status'):
+            self.skipTest('Sin límites de memoria en esta plataforma.')
+        with mock.patch('xhtml2pdf.pisa.CreatePDF', _allocate):
+            limit = _virtual_memory() + 64 * 1024 * 1024
+            self.assertEqual(self.run_child(limit), (pdf_jobs.EXIT_MEMORY, False))
+
+    def test_status_and_download_when_ready(self):
+        response = self.client.get(reverse('generate_pdf', args=[self.report.pk]))
+        job = PdfRenderJob.objects.get()
+        self.assertRedirects(response, reverse('pdf_job_detail', args=[job.pk]), fetch_redirect_response=False)
+        status_url = reverse('pdf_job_status', args=[job.pk])
+        response = self.client.get(status_url)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['status'], 'queued')
+        self.assertEqual(self.client.get(reverse('pdf_job_detail', args=[job.pk])).status_code, 200)
+
+        self.assertEqual(self.run_workers(), 1)
+        response = self.client.get(status_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['download_url'], reverse('generate_pdf', args=[self.report.pk]))
+        self.assertRedirects(
+            self.client.get(reverse('pdf_job_detail', args=[job.pk])), response.json()['download_url'],
+            fetch_redirect_response=False,
+        )
+        response = self.client.get(response.json()['download_url'])
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+
+    def test_reap_stops_jobs_over_timeout(self):
+        job = pdf_jobs.request_render(self.load_report())
+        with mock.patch.object(pdf_jobs, 'render_to_file', _hang), self.assertLogs(pdf_jobs.logger, 'WARNING'):
+            started = time.monotonic()
+            self.run_workers(timeout=1)
+        self.assertLess(time.monotonic() - started, 20)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('failed', 'Se excedió el tiempo máximo de 1 s.'))
+
+    def test_failed_child_marks_job_failed(self):
+        job = pdf_jobs.request_render(self.load_report())
+        with mock.patch('xhtml2pdf.pisa.CreatePDF', return_value=SimpleNamespace(err=1)), \
+                self.assertLogs(pdf_jobs.logger, 'WARNING'):
+            self.run_workers()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.error), ('failed', pdf_jobs.EXIT_MESSAGES[pdf_jobs.EXIT_PDF_ERROR]))
+
+    def test_stale_running_jobs_are_requeued(self):
+        job = pdf_jobs.request_render(self.load_report())
+        PdfRenderJob.objects.filter(pk=job.pk).update(status='running', started_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.run_workers(), 1)
+        job.refresh_from_db()
+        self.assertEqual(job.status, 'done')
+
+    def test_render_many_times_out_hung_renders(self):
+        with mock.patch.object(pdf_jobs, 'render_to_file', _hang), self.assertLogs(pdf_jobs.logger, 'WARNING'):
+            started = time.monotonic()
+            failures = pdf_jobs.render_many([self.load_report()], 1, timeout=1)
+        self.assertLess(time.monotonic() - started, 20)
+        self.assertEqual(failures, {self.report.pk: 'Se excedió el tiempo máximo de 1 s.'})
+
+
+class FailingBackend(BaseEmailBackend):
+    """Servidor SMTP que rechaza todos los envíos."""
+
+    def send_messages(self, messages):
+        raise smtplib.SMTPServerDisconnected('Conexión cerrada por el servidor')
+
+
+class UnreachableBackend(BaseEmailBackend):
+    """Servidor SMTP al que no se puede conectar."""
+
+    def open(self):
+        raise ConnectionRefusedError('Conexión rechazada')
+
+
+@override_settings(EMAIL_OUTBOX_RETRY_BASE_SECONDS=60, EMAIL_OUTBOX_MAX_ATTEMPTS=3)
+class OutboxTests(TestCase):
+    """Bandeja de salida: encolado, envío por lotes, reintentos y recuperación."""
+
+    @classmethod
+    def setUpTestData(cls):
+        client = Client.objects.create(name='Cliente', email='cliente@example.com', phone='3000000000')
+        service = Service.objects.create(title='Servicio', description='Descripción', client=client)
+        cls.report = TechnicalReport.objects.create(service=service, diagnosis='Diagnóstico')
+
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        override = override_settings(REPORT_PDF_CACHE_DIR=cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        report = TechnicalReport.objects.select_related('service__client', 'technician').get(pk=self.report.pk)
+        pdf.write_cache_file(pdf.cache_path(report), b'%PDF-1.4 prueba')
+
+    def enqueue(self):
+        return mailing.enqueue_report_email(
+            TechnicalReport.objects.select_related('service__client').get(pk=self.report.pk)
+        )
+
+    def test_view_only_enqueues(self):
+        response = self.client.get(reverse('send_report_email', args=[self.report.pk]))
+        self.assertRedirects(response, reverse('report_list'), fetch_redirect_response=False)
+        self.assertEqual(mail.outbox, [])
+        outgoing = OutgoingEmail.objects.get()
+        self.assertEqual((outgoing.status, outgoing.recipient), ('pending', 'cliente@example.com'))
+
+    def test_pending_emails_are_sent_with_pdf(self):
+        outgoing = self.enqueue()
+        self.assertEqual(mailing.deliver_pending(), {'sent': 1, 'failed': 0})
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['cliente@example.com'])
+        self.assertEqual(mail.outbox[0].attachments[0][1], b'%PDF-1.4 prueba')
+        outgoing.refresh_from_db()
+        self.assertEqual((outgoing.status, outgoing.attempts), ('sent', 1))
+        self.assertEqual(mailing.deliver_pending(), {'sent': 0, 'failed': 0})
+
+    def test_claim_takes_only_due_emails(self):
+        due, later = self.enqueue(), self.enqueue()
+        OutgoingEmail.objects.filter(pk=later.pk).update(next_attempt_at=timezone.now() + timedelta(minutes=5))
+        self.assertEqual([outgoing.pk for outgoing in mailing._claim(10)], [due.pk])
+        self.assertEqual(mailing._claim(10), [])
+        self.assertEqual(OutgoingEmail.objects.get(pk=due.pk).status, 'sending')
+
+    def test_retry_delay_doubles(self):
+        self.assertEqual(
+            [mailing.retry_delay(attempts).total_seconds() for attempts in (1, 2, 3, 4)], [60, 120, 240, 480],
+        )
+
+    def test_failures_back_off_until_failed(self):
+        outgoing = self.enqueue()
+        for attempts, delay in ((1, 60), (2, 120)):
+            with self.assertLogs(mailing.logger, 'WARNING'):
+                self.assertEqual(mailing.deliver_pending(connection=FailingBackend()), {'sent': 0, 'failed': 1})
+            outgoing.refresh_from_db()
+            self.assertEqual((outgoing.status, outgoing.attempts), ('pending', attempts))
+            self.assertIn('Conexión cerrada', outgoing.last_error)
+            wait = (outgoing.next_attempt_at - outgoing.updated_at).total_seconds()
+            self.assertAlmostEqual(wait, delay, delta=1)
+            # No se reintenta antes de tiempo.
+            self.assertEqual(mailing.deliver_pending(connection=FailingBackend()), {'sent': 0, 'failed': 0})
+            OutgoingEmail.objects.filter(pk=outgoing.pk).update(next_attempt_at=timezone.now())
+        with self.assertLogs(mailing.logger, 'WARNING'):
+            mailing.deliver_pending(connection=FailingBackend())
+        outgoing.refresh_from_db()
+        self.assertEqual((outgoing.status, outgoing.attempts), ('failed', 3))
+        self.assertEqual(mailing.deliver_pending(), {'sent': 0, 'failed': 0})
+
+    def test_unreachable_server_fails_the_whole_batch(self):
+        self.enqueue()
+        self.enqueue()
+        with self.assertLogs(mailing.logger, 'WARNING'):
+            self.assertEqual(mailing.deliver_pending(connection=UnreachableBackend()), {'sent': 0, 'failed': 2})
+        self.assertEqual(list(OutgoingEmail.objects.values_list('status', 'attempts')), [('pending', 1)] * 2)
+
+    def test_stale_sending_emails_are_requeued(self):
+        stale, recent = self.enqueue(), self.enqueue()
+        OutgoingEmail.objects.update(status='sending')
+        OutgoingEmail.objects.filter(pk=stale.pk).update(updated_at=timezone.now() - timedelta(minutes=20))
+        out = io.StringIO()
+        call_command('send_queued_emails', stdout=out)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(OutgoingEmail.objects.get(pk=stale.pk).status, 'sent')
+        self.assertEqual(OutgoingEmail.objects.get(pk=recent.pk).status, 'sending')
+        self.assertIn('1 correos enviados, 0 con error.', out.getvalue())
+
+
+class RequeueingBackend(EmailBackend):
+    """Simula un ``send_queued_emails`` que arranca a mitad de un envío masivo."""
+
+    def send_messages(self, messages):
+        self.requeued = getattr(self, 'requeued', 0) + mailing.requeue_stale()
+        return super().send_messages(messages)
+
+
+class SendReportEmailsTests(TestCase):
+    """El envío masivo no duplica correos ni genera PDF fuera de los procesos de generación."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.reports = []
+        for i in range(3):
+            client = Client.objects.create(name=f'Cliente {i}', email=f'cliente{i}@example.com', phone=f'300000000{i}')
+            service = Service.objects.create(title=f'Servicio {i}', description='Descripción', client=client)
+            cls.reports.append(TechnicalReport.objects.create(service=service, diagnosis='Diagnóstico', status='final'))
+
+    def setUp(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        override = override_settings(REPORT_PDF_CACHE_DIR=cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        for report in TechnicalReport.objects.select_related('service__client', 'technician'):
+            pdf.write_cache_file(pdf.cache_path(report), b'%PDF-1.4 prueba')
+
+    def test_render_failures_are_not_sent(self):
+        failed = self.reports[0]
+        pdf.invalidate(failed.pk)
+        out = io.StringIO()
+        with mock.patch.object(pdf_jobs, 'render_many', return_value={failed.pk: 'Se excedió el tiempo máximo de 60 s.'}), \
+                mock.patch.object(pdf, 'get_report_pdf', wraps=pdf.get_report_pdf) as get_report_pdf:
+            call_command('send_report_emails', '--rate', '0', stdout=out, stderr=io.StringIO())
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertNotIn(failed.pk, [call.args[0].pk for call in get_report_pdf.call_args_list])
+        outgoing = failed.emails.get()
+        self.assertEqual(outgoing.status, 'failed')
+        self.assertIn('Se excedió el tiempo máximo', outgoing.last_error)
+        self.assertIn('Enviados: 2, fallidos: 0, sin PDF: 1, omitidos (ya en cola): 0.', out.getvalue())
+
+    @mock.patch.object(mailing, 'HEARTBEAT_SECONDS', 0)
+    def test_long_runs_keep_their_rows(self):
+        reports = TechnicalReport.objects.select_related('service__client', 'technician')
+        batch, _ = mailing.enqueue_report_emails(reports, status='sending')
+        # El envío lleva más de 15 minutos.
+        OutgoingEmail.objects.update(updated_at=timezone.now() - timedelta(hours=1))
+        connection = RequeueingBackend()
+        counts = mailing.deliver(batch, connection=connection)
+        self.assertEqual(counts, {'sent': 3, 'failed': 0})
+        self.assertEqual(connection.requeued, 0)
+        self.assertEqual(len(mail.outbox), 3)
+
+
+class PdfCacheKeyTests(TestCase):
+    """La clave del PDF en caché cambia con todo lo que cambia su contenido."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.technician = User.objects.create_user('tecnico', first_name='Ana', last_name='Pérez')
+        client = Client.objects.create(name='Cliente', email='cliente@example.com', phone='3000000000')
+        service = Service.objects.create(title='Servicio', description='Descripción', client=client)
+        cls.report = TechnicalReport.objects.create(service=service, technician=cls.technician, diagnosis='Diagnóstico')
+
+    def key(self):
+        return pdf.cache_key(
+            TechnicalReport.objects.select_related('service__client', 'technician').get(pk=self.report.pk)
+        )
+
+    def test_technician_changes_the_key(self):
+        original = self.key()
+        User.objects.filter(pk=self.technician.pk).update(last_name='Gómez')
+        renamed = self.key()
+        self.assertNotEqual(renamed, original)
+        other = User.objects.create_user('otro', first_name='Ana', last_name='Gómez')
+        TechnicalReport._base_manager.filter(pk=self.report.pk).update(technician=other)
+        self.assertNotEqual(self.key(), renamed)
+
+    def test_static_assets_change_the_key(self):
+        fd, logo = tempfile.mkstemp(suffix='.png')
+        os.close(fd)
+        self.addCleanup(os.unlink, logo)
+        with mock.patch.object(pdf_assets, 'template_assets', return_value=(logo,)):
+            original = self.key()
+            self.assertEqual(self.key(), original)
+            stat = os.stat(logo)
+            os.utime(logo, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+            self.assertNotEqual(self.key(), original)
+
+    def test_conditional_download_follows_the_technician(self):
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        override = override_settings(REPORT_PDF_CACHE_DIR=cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'clave'))
+        url = reverse('generate_pdf', args=[self.report.pk])
+        report = TechnicalReport.objects.select_related('service__client', 'technician').get(pk=self.report.pk)
+        pdf.write_cache_file(pdf.cache_path(report), b'%PDF-1.4 prueba')
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+        User.objects.filter(pk=self.technician.pk).update(last_name='Gómez')
+        report = TechnicalReport.objects.select_related('service__client', 'technician').get(pk=self.report.pk)
+        pdf.write_cache_file(pdf.cache_path(report), b'%PDF-1.4 prueba')
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+        # Sin ETag no hay validador con el que responder 304.
+        since = http_date(time.time() + 60)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+    def test_template_assets_are_found(self):
+        self.assertEqual(
+            [os.path.basename(path) for path in pdf_assets.template_assets(pdf.PDF_TEMPLATE)], ['icno_tras.png'],
+        )
+
+
+class ConditionalGetTests(TestCase):
+    """El ETag cambia con cualquier escritura, también con update() y bulk_update()."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        client = Client.objects.create(name='Cliente', email='cliente@example.com', phone='3000000000')
+        cls.service = Service.objects.create(title='Servicio', description='Descripción', client=client)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+        self.url = reverse('api-service-detail', args=[self.service.pk])
+
+    def assertChangesETag(self, write):
+        etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        write()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_queryset_update(self):
+        self.assertChangesETag(lambda: Service.objects.filter(pk=self.service.pk).update(status='completed'))
+
+    def test_bulk_update(self):
+        def write():
+            self.service.status = 'cancelled'
+            Service.objects.bulk_update([self.service], ['status'])
+        self.assertChangesETag(write)
+
+
+class ResponseCacheTests(TestCase):
+    """La caché de respuestas de la API nunca sirve datos de antes de una escritura confirmada."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'clave')
+        cls.technician = User.objects.create_user('tecnico')
+        set_role(cls.technician, 'technician')
+        cls.customer = Client.objects.create(name='Original', email='original@example.com', phone='3000000000')
+
+    def setUp(self):
+        caches[settings.API_CACHE_ALIAS].clear()
+        self.client.force_login(self.admin)
+        self.list_url = reverse('api-client-list')
+        self.detail_url = reverse('api-client-detail', args=[self.customer.pk])
+
+    def names(self):
+        return [row['name'] for row in self.client.get(self.list_url, HTTP_ACCEPT='application/json').json()['results']]
+
+    def assertInvalidates(self, write, expected):
+        self.assertEqual(self.names(), ['Original'])
+        # Sin cambiar nada, la respuesta sale de la caché.
+        Client._base_manager.filter(pk=self.customer.pk).update(name='Sin señal')
+        self.assertEqual(self.names(), ['Original'])
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        self.assertEqual(self.names(), expected)
+
+    def test_post_save(self):
+        def write():
+            self.customer.name = 'Guardado'
+            self.customer.save()
+        self.assertInvalidates(write, ['Guardado'])
+
+    def test_post_delete(self):
+        self.assertInvalidates(self.customer.delete, [])
+
+    def test_queryset_update(self):
+        self.assertInvalidates(lambda: Client.objects.filter(pk=self.customer.pk).update(name='Actualizado'), ['Actualizado'])
+
+    def test_bulk_create(self):
+        def write():
+            Client.objects.bulk_create([Client(name='Nuevo', email='nuevo@example.com', phone='3000000001')])
+        self.assertInvalidates(write, ['Nuevo', 'Sin señal'])
+
+    def test_bulk_update(self):
+        def write():
+            self.customer.name = 'Masivo'
+            Client.objects.bulk_update([self.customer], ['name'])
+        self.assertInvalidates(write, ['Masivo'])
+
+    def test_bulk_saved_signal(self):
+        self.assertInvalidates(lambda: bulk_saved.send(sender=Client, created=[], updated=[]), ['Sin señal'])
+
+    def test_generation_changes_only_on_commit(self):
+        self.assertEqual(self.names(), ['Original'])
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.customer.name = 'Pendiente'
+            self.customer.save()
+            # Antes de confirmar se sigue sirviendo la versión anterior.
+            self.assertEqual(self.names(), ['Original'])
+        self.assertTrue(callbacks)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.names(), ['Pendiente'])
+
+    def test_cache_key_depends_on_role(self):
+        self.assertEqual(self.client.get(self.detail_url).json()['name'], 'Original')
+        Client._base_manager.filter(pk=self.customer.pk).update(name='Sin señal')
+        self.client.force_login(self.technician)
+        self.assertEqual(self.client.get(self.detail_url).json()['name'], 'Sin señal')
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get(self.detail_url).json()['name'], 'Original')
@@ -17,14 +17,21 @@ urlpatterns = [
     path('reports/create/', views.report_create, name='report_create'),
     path('reports/<int:pk>/update/', views.report_update, name='report_update'),
     path('reports/<int:pk>/delete/', views.report_delete, name='report_delete'),
+    path('reports/export/', views.export_reports_zip, name='export_reports_zip'),
     path('reports/<int:pk>/pdf/', views.generate_pdf, name='generate_pdf'),
     path('reports/<int:pk>/email/', views.send_report_email, name='send_report_email'),
+    path('reports/pdf-jobs/<int:pk>/', views.pdf_job_detail, name='pdf_job_detail'),
+    path('reports/pdf-jobs/<int:pk>/status/', views.pdf_job_status, name='pdf_job_status'),
 
     # API Endpoints
     path('api/clients/', api_views.ClientListCreateAPIView.as_view(), name='api-client-list'),
     path('api/clients/<int:pk>/', api_views.ClientRetrieveUpdateDestroyAPIView.as_view(), name='api-client-detail'),
+    path('api/clients/export/', api_views.ClientExportAPIView.as_view(), name='api-client-export'),
+    path('api/clients/bulk/', api_views.ClientBulkAPIView.as_view(), name='api-client-bulk'),
     path('api/services/', api_views.ServiceListCreateAPIView.as_view(), name='api-service-list'),
     path('api/services/<int:pk>/', api_views.ServiceRetrieveUpdateDestroyAPIView.as_view(), name='api-service-detail'),
+    path('api/services/export/', api_views.ServiceExportAPIView.as_view(), name='api-service-export'),
+    path('api/services/bulk/', api_views.ServiceBulkAPIView.as_view(), name='api-service-bulk'),
     path('api/reports/', api_views.TechnicalReportListCreateAPIView.as_view(), name='api-report-list'),
     path('api/reports/<int:pk>/', api_views.TechnicalReportRetrieveUpdateDestroyAPIView.as_view(), name='api-report-detail'),
 ]
\ No newline at end of file
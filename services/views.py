@@ -1,20 +1,68 @@
+from accounts.roles import effective_role
+from django.contrib.auth.decorators import login_required
+from django.core.exceptions import PermissionDenied
+from django.db.models import OuterRef, Subquery
 from django.shortcuts import render, get_object_or_404, redirect
-from .models import Client, Service, TechnicalReport
-from .forms import ClientForm, ServiceForm, TechnicalReportForm
+from personal_tech.query_budget import query_budget
+from .models import (
+    Client, Service, TechnicalReport, OutgoingEmail,
+    CLIENT_LIST_FIELDS, SERVICE_LIST_FIELDS, REPORT_LIST_FIELDS,
+)
+from .forms import (
+    ClientForm, ServiceForm, TechnicalReportForm,
+    ClientFilterForm, ServiceFilterForm, TechnicalReportFilterForm, ReportExportForm,
+)
+from .pagination import KeysetPaginator, InvalidCursor
+
+# Relaciones que cada listado muestra por fila. Se cargan con JOIN para que el
+# número de consultas no dependa del número de filas.
+SERVICE_LIST_RELATIONS = ('client', 'technician')
+REPORT_LIST_RELATIONS = ('service__client', 'technician')
+
+# Columnas de las relaciones que muestra cada listado. Los listados no leen
+# los TextField (descripción, diagnóstico, dirección...), que solo usan los
+# formularios y el PDF.
+TECHNICIAN_LIST_FIELDS = ('username', 'first_name', 'last_name')
+SERVICE_LIST_ONLY = (
+    *SERVICE_LIST_FIELDS, 'client__name', *(f'technician__{name}' for name in TECHNICIAN_LIST_FIELDS),
+)
+REPORT_LIST_ONLY = (
+    *REPORT_LIST_FIELDS, 'service__title', 'service__service_date', 'service__client', 'service__client__company',
+    *(f'technician__{name}' for name in TECHNICIAN_LIST_FIELDS),
+)
+
+LIST_PAGE_SIZE = 25
+
+
+def _filtered_page(request, queryset, filter_form):
+    """
+    Aplica los filtros del formulario y devuelve la página pedida por el cursor.
+
+    Un cursor inválido (por ejemplo, de otro criterio de orden) lleva a la
+    primera página en lugar de producir un error.
+    """
+    paginator = KeysetPaginator(filter_form.filter(queryset), filter_form.get_ordering(), LIST_PAGE_SIZE)
+    try:
+        return paginator.page(request.GET.get('cursor'))
+    except InvalidCursor:
+        return paginator.page()
 
 # CRUD for Clients
+@query_budget(3)
 def client_list(request):
     """
-    Muestra la lista de todos los clientes.
+    Muestra la lista de clientes, filtrada y paginada por cursor.
     
     Args:
-        request: Objeto HttpRequest.
+        request: Objeto HttpRequest. Acepta los filtros de ClientFilterForm
+            y el parámetro ``cursor``.
         
     Returns:
         HttpResponse: Renderiza la plantilla 'services/client_list.html'.
     """
-    clients = Client.objects.all()
-    return render(request, 'services/client_list.html', {'clients': clients})
+    filter_form = ClientFilterForm(request.GET)
+    page = _filtered_page(request, Client.objects.only(*CLIENT_LIST_FIELDS), filter_form)
+    return render(request, 'services/client_list.html', {'clients': page, 'page': page, 'filter_form': filter_form})
 
 def client_create(request):
     """
@@ -79,12 +127,17 @@ def client_delete(request, pk):
     return render(request, 'services/client_confirm_delete.html', {'client': client})
 
 # CRUD for Services
+@query_budget(5)
 def service_list(request):
     """
-    Muestra la lista de todos los servicios.
+    Muestra la lista de servicios, filtrada y paginada por cursor.
+
+    El cliente y el técnico de cada servicio se cargan en la misma consulta.
     """
-    services = Service.objects.all()
-    return render(request, 'services/service_list.html', {'services': services})
+    filter_form = ServiceFilterForm(request.GET)
+    services = Service.objects.select_related(*SERVICE_LIST_RELATIONS).only(*SERVICE_LIST_ONLY)
+    page = _filtered_page(request, services, filter_form)
+    return render(request, 'services/service_list.html', {'services': page, 'page': page, 'filter_form': filter_form})
 
 def service_create(request):
     """
@@ -124,12 +177,22 @@ def service_delete(request, pk):
     return render(request, 'services/service_confirm_delete.html', {'service': service})
 
 # CRUD for Technical Reports
+@query_budget(5)
 def report_list(request):
     """
-    Muestra la lista de reportes técnicos.
+    Muestra la lista de reportes técnicos, filtrada y paginada por cursor.
+
+    El servicio, su cliente, el técnico y el estado del último correo
+    enviado se cargan en la misma consulta.
     """
-    reports = TechnicalReport.objects.all()
-    return render(request, 'services/report_list.html', {'reports': reports})
+    filter_form = TechnicalReportFilterForm(request.GET)
+    latest_email = OutgoingEmail.objects.filter(report=OuterRef('pk')).order_by('-created_at')
+    reports = TechnicalReport.objects.select_related(*REPORT_LIST_RELATIONS).only(*REPORT_LIST_ONLY).annotate(
+        email_status=Subquery(latest_email.values('status')[:1]),
+        email_sent_at=Subquery(latest_email.values('sent_at')[:1]),
+    )
+    page = _filtered_page(request, reports, filter_form)
+    return render(request, 'services/report_list.html', {'reports': page, 'page': page, 'filter_form': filter_form})
 
 def report_create(request):
     """
@@ -169,128 +232,169 @@ def report_delete(request, pk):
     return render(request, 'services/report_confirm_delete.html', {'report': report})
 
 # PDF and Email Generation
-from django.http import HttpResponse
-from django.template.loader import get_template
-from xhtml2pdf import pisa
-from django.core.mail import EmailMessage
+from django.http import HttpResponse, FileResponse, JsonResponse, StreamingHttpResponse
+from django.urls import reverse
 from django.conf import settings
 from django.contrib import messages
-from io import BytesIO
 
-import os
-from django.conf import settings
-from django.contrib.staticfiles import finders
+from django.utils import timezone
+from personal_tech.conditional import not_modified, validator_headers
+
+from . import mailing, pdf, pdf_export, pdf_jobs
+from .models import PdfRenderJob
+
 
-def link_callback(uri, rel):
+def _report_for_pdf(pk):
+    """Obtiene el reporte con el servicio y el cliente que usa el PDF."""
+    return get_object_or_404(TechnicalReport.objects.select_related('service__client', 'technician'), pk=pk)
+
+
+def generate_pdf(request, pk):
     """
-    Convierte URIs HTML a rutas absolutas del sistema para xhtml2pdf.
+    Genera un archivo PDF para un reporte técnico específico.
     
-    Permite que el generador de PDF acceda a recursos estáticos y multimedia.
+    El PDF se sirve desde la caché en disco; solo se genera de nuevo cuando
+    cambió algo de lo que muestra (reporte, servicio, cliente, técnico,
+    plantilla o imágenes). La respuesta lleva ``ETag`` (la clave de caché) y
+    las peticiones con ``If-None-Match`` que coinciden reciben 304. No se
+    envía ``Last-Modified``: el técnico y las imágenes no tienen una fecha de
+    modificación comparable, y un ``If-Modified-Since`` recibiría 304 con un
+    PDF obsoleto. Si no está en caché se
+    encola un trabajo para ``run_pdf_workers`` y se redirige a la página de
+    espera (salvo con ``PDF_RENDER_INLINE``, donde se genera aquí mismo).
     
     Args:
-        uri (str): La URI del recurso.
-        rel (str): La relación del recurso.
+        request: Objeto HttpRequest.
+        pk (int): ID del reporte técnico.
         
     Returns:
-        str: La ruta absoluta al archivo o la URI original si no se encuentra.
+        HttpResponse: El archivo PDF, la redirección al trabajo, 304 si el
+            cliente ya tiene esta versión o un mensaje de error.
     """
-    # Remove leading slash if present to avoid absolute path issues
-    if uri.startswith('/'):
-        uri = uri[1:]
-    
-    # Handle static files
-    if uri.startswith('static/'):
-        # Remove 'static/' prefix
-        static_path = uri[7:]  # len('static/') = 7
-        result = finders.find(static_path)
-        if result:
-            return result
-    
-    # Try to find the file directly
-    result = finders.find(uri)
-    if result:
-        return result
-    
-    # Handle media files
-    if uri.startswith(settings.MEDIA_URL.lstrip('/')):
-        media_path = uri.replace(settings.MEDIA_URL.lstrip('/'), '')
-        full_path = os.path.join(settings.MEDIA_ROOT, media_path)
-        if os.path.isfile(full_path):
-            return full_path
-    
-    # If nothing works, return the original URI
-    return uri
+    report = _report_for_pdf(pk)
+    # La clave de caché identifica el contenido del PDF: sirve como ETag.
+    etag = f'"{pdf.cache_key(report)}"'
+    response = not_modified(request, etag)
+    if response is not None:
+        return response
+    path = pdf.cache_path(report)
+    if not path.exists():
+        if not settings.PDF_RENDER_INLINE:
+            job = pdf_jobs.request_render(report)
+            return redirect('pdf_job_detail', pk=job.pk)
+        try:
+            path = pdf.get_report_pdf(report)
+        except pdf.PdfRenderError:
+            return HttpResponse('Hubo un error al generar el PDF', status=500)
+    response = FileResponse(open(path, 'rb'), content_type='application/pdf', filename=f'reporte_{report.id}.pdf')
+    return validator_headers(response, etag)
 
-def generate_pdf(request, pk):
+def pdf_job_status(request, pk):
     """
-    Genera un archivo PDF para un reporte técnico específico.
+    Devuelve en JSON el estado de un trabajo de generación de PDF.
     
     Args:
         request: Objeto HttpRequest.
-        pk (int): ID del reporte técnico.
+        pk (int): ID del trabajo.
         
     Returns:
-        HttpResponse: El archivo PDF generado o un mensaje de error.
+        JsonResponse: Estado, error y, si está listo, la URL de descarga;
+            202 mientras el trabajo está en cola o en curso.
     """
-    report = get_object_or_404(TechnicalReport, pk=pk)
-    template_path = 'services/technical_report_pdf.html'
-    context = {'report': report}
-    
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'inline; filename="reporte_{report.id}.pdf"'
-    
-    template = get_template(template_path)
-    html = template.render(context)
-    
-    pisa_status = pisa.CreatePDF(
-       html, dest=response, link_callback=link_callback)
+    job = get_object_or_404(PdfRenderJob, pk=pk)
+    data = {'id': job.pk, 'report': job.report_id, 'status': job.status, 'error': job.error or None}
+    if job.status == 'done':
+        data['download_url'] = reverse('generate_pdf', args=[job.report_id])
+    return JsonResponse(data, status=202 if job.status in ('queued', 'running') else 200)
+
+def pdf_job_detail(request, pk):
+    """
+    Página de espera de un trabajo de PDF; redirige a la descarga cuando termina.
     
-    if pisa_status.err:
-        return HttpResponse('Hubo un error al generar el PDF', status=500)
-    return response
+    Args:
+        request: Objeto HttpRequest.
+        pk (int): ID del trabajo.
+        
+    Returns:
+        HttpResponse: La página de espera o la redirección al PDF.
+    """
+    job = get_object_or_404(PdfRenderJob, pk=pk)
+    if job.status == 'done':
+        return redirect('generate_pdf', pk=job.report_id)
+    return render(request, 'services/pdf_job_detail.html', {'job': job})
 
 def send_report_email(request, pk):
     """
-    Envía el reporte técnico por correo electrónico al cliente.
+    Encola el envío del reporte técnico por correo electrónico al cliente.
     
-    Genera el PDF en memoria y lo adjunta al correo.
+    El correo queda en la bandeja de salida y el comando ``send_queued_emails``
+    lo entrega en segundo plano con el PDF adjunto; su estado se muestra en la
+    lista de reportes.
     
     Args:
         request: Objeto HttpRequest.
         pk (int): ID del reporte técnico.
         
     Returns:
-        HttpResponse: Redirecciona a la lista de reportes con un mensaje de éxito o error.
+        HttpResponse: Redirecciona a la lista de reportes con un mensaje.
     """
-    report = get_object_or_404(TechnicalReport, pk=pk)
-    
-    # Generate PDF
-    template_path = 'services/technical_report_pdf.html'
-    context = {'report': report}
-    template = get_template(template_path)
-    html = template.render(context)
-    
-    pdf_file = BytesIO()
-    pisa_status = pisa.CreatePDF(
-       html, dest=pdf_file, link_callback=link_callback)
-    
-    if pisa_status.err:
-        messages.error(request, 'Error al generar el PDF para el correo.')
-        return redirect('report_list')
-    
-    # Create Email
-    subject = f'Reporte Técnico - Servicio #{report.service.id}'
-    message = f'Adjunto encontrará el reporte técnico del servicio realizado para {report.service.client.name}.'
-    email_from = settings.DEFAULT_FROM_EMAIL
-    recipient_list = [report.service.client.email]
+    report = _report_for_pdf(pk)
+    mailing.enqueue_report_email(report)
+    messages.success(request, f'El reporte quedó en cola para enviarse a {report.service.client.email}.')
+    return redirect('report_list')
+
+# Roles que pueden exportar reportes (el ZIP incluye datos de todos los clientes).
+EXPORT_ROLES = ('admin', 'technician')
+
+
+@login_required
+def export_reports_zip(request):
+    """
+    Descarga en un ZIP los PDF de los reportes que cumplen los filtros.
     
-    email = EmailMessage(subject, message, email_from, recipient_list)
-    email.attach(f'reporte_{report.id}.pdf', pdf_file.getvalue(), 'application/pdf')
+    Acepta los filtros del listado de reportes y ``client`` (repetible). El
+    archivo se transmite mientras se genera e incluye ``manifest.csv`` con
+    una fila por reporte. La vista no genera PDF: si falta alguno en la
+    caché se encola en ``PdfRenderJob`` (los workers aplican el tiempo y la
+    memoria máximos) y se vuelve al listado con un aviso; con
+    ``PDF_RENDER_INLINE`` (desarrollo) se generan aquí.
     
-    try:
-        email.send()
-        messages.success(request, 'Reporte enviado exitosamente por correo.')
-    except Exception as e:
-        messages.error(request, f'Error al enviar el correo: {str(e)}')
+    Args:
+        request: Objeto HttpRequest.
         
-    return redirect('report_list')
+    Returns:
+        HttpResponse: El ZIP en streaming, la redirección al listado si hay
+        PDF en cola, o un error 400 si los filtros son inválidos o
+        seleccionan demasiados reportes.
+    """
+    if effective_role(request.user) not in EXPORT_ROLES:
+        raise PermissionDenied
+    form = ReportExportForm(request.GET)
+    if not form.is_valid():
+        return HttpResponse('Filtros inválidos para la exportación', status=400)
+    limit = settings.REPORT_EXPORT_MAX_REPORTS
+    report_ids = list(
+        form.filter(TechnicalReport.objects.all())
+        .order_by(form.get_ordering(), 'pk')
+        .values_list('pk', flat=True)[:limit + 1]
+    )
+    if len(report_ids) > limit:
+        return HttpResponse(
+            f'La exportación supera el máximo de {limit} reportes; use filtros más específicos '
+            'o el comando export_reports.',
+            status=400,
+        )
+    if not settings.PDF_RENDER_INLINE:
+        missing = pdf_export.missing_pdfs(report_ids)
+        if missing:
+            pdf_jobs.request_renders(missing)
+            messages.info(
+                request,
+                f'{len(missing)} de los {len(report_ids)} PDF aún no están generados y quedaron en cola. '
+                'Vuelva a exportar en unos minutos.',
+            )
+            return redirect(f"{reverse('report_list')}?{request.GET.urlencode()}")
+    chunks = pdf_export.stream_reports_zip(report_ids, render=settings.PDF_RENDER_INLINE)
+    response = StreamingHttpResponse(chunks, content_type='application/zip')
+    response['Content-Disposition'] = f'attachment; filename="reportes_{timezone.localdate():%Y%m%d}.zip"'
+    return response